@@ -75,3 +75,14 @@ TREASURY_POSITIONS: list[TreasuryPosition] = [
         as_of=now(),
     ),
 ]
+
+
+# USD value of one unit of each currency, for rollups in a reporting
+# currency. Override with a JSON file via FX_RATES_PATH.
+FX_USD_RATES: dict[str, float] = {
+    "USD": 1.0,
+    "EUR": 1.0989,
+    "GBP": 1.2778,
+    "INR": 0.012012,
+    "JPY": 0.006711,
+}
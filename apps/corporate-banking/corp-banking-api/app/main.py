@@ -1,19 +1,235 @@
 from __future__ import annotations
 
+import asyncio
+import itertools
+import os
+from collections import Counter
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 from typing import Annotated
 
-from fastapi import FastAPI, Header, HTTPException
+import httpx
+from banking_common.metrics import DOWNSTREAM_LATENCY, instrument, timed, track_store_size
+from banking_common.profiling import install_profiling
+from banking_common.readiness import Readiness, warm_connections
+from fastapi import FastAPI, Header, HTTPException, Response
+from pydantic import TypeAdapter
 
-from .data import ACCOUNTS, APPROVALS, TREASURY_POSITIONS
-from .models import Account, Approval, HealthResponse, TreasuryPosition
+from .data import ACCOUNTS, APPROVALS, FX_USD_RATES, TREASURY_POSITIONS
+from .models import (
+    Account,
+    Approval,
+    BalanceRollup,
+    BalanceRollupEntry,
+    BulkDecideRequest,
+    BulkDecideResponse,
+    BulkDecisionResult,
+    CompliancePolicy,
+    CorporateDashboard,
+    CreateApprovalRequest,
+    Currency,
+    FxRate,
+    HealthResponse,
+    PendingApprovalsSummary,
+    PendingCurrencyTotal,
+    ReadinessResponse,
+    TreasuryPosition,
+    TreasuryRollup,
+    TreasuryRollupEntry,
+    UpdateBalanceRequest,
+    UpdatePositionRequest,
+)
+from .rollups import Rollup, load_fx_table
+from .source_cache import CachedSource
 
 
 def utc_now() -> datetime:
     return datetime.now(tz=UTC)
 
 
-app = FastAPI(title="Corporate Banking API", version="1.0.0")
+# External services URLs
+TREASURY_SERVICE_URL = os.getenv("TREASURY_SERVICE_URL", "http://treasury-service:8081")
+COMPLIANCE_SERVICE_URL = os.getenv("COMPLIANCE_SERVICE_URL", "http://compliance-service:8082")
+
+# Shared connection pool for calls to treasury-service and compliance-service
+http_client = httpx.AsyncClient(timeout=5.0)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    readiness.start()
+    yield
+    await readiness.stop()
+    await http_client.aclose()
+
+
+app = FastAPI(title="Corporate Banking API", version="1.0.0", lifespan=lifespan)
+
+# Add Prometheus metrics instrumentation
+instrument(app)
+install_profiling(app)
+track_store_size("accounts", lambda: len(ACCOUNTS))
+track_store_size("approvals", lambda: len(APPROVALS))
+track_store_size("treasury_positions", lambda: len(TREASURY_POSITIONS))
+
+# Approvals by ID, and running totals of the pending ones by type and by
+# currency. Kept in step with APPROVALS by add_approval() and
+# set_approval_status(); change approvals only through those.
+approvals_by_id: dict[str, Approval] = {}
+pending_by_type: Counter[str] = Counter()
+pending_by_currency: Counter[str] = Counter()
+pending_amount_by_currency: dict[str, float] = {}
+approval_ids = itertools.count(90001 + len(APPROVALS))
+
+# Upper bound on a single bulk decision request
+MAX_BULK_DECISIONS = 1000
+
+DECISION_STATUS = {"APPROVE": "APPROVED", "REJECT": "REJECTED"}
+
+
+def _count_pending(approval: Approval, sign: int) -> None:
+    pending_by_type[approval.type] += sign
+    if approval.currency is not None and approval.amount is not None:
+        pending_by_currency[approval.currency] += sign
+        pending_amount_by_currency[approval.currency] = (
+            pending_amount_by_currency.get(approval.currency, 0.0) + sign * approval.amount
+        )
+
+
+def _index_approval(approval: Approval) -> None:
+    approvals_by_id[approval.approval_id] = approval
+    if approval.status == "PENDING":
+        _count_pending(approval, 1)
+
+
+def add_approval(approval: Approval) -> None:
+    APPROVALS.append(approval)
+    _index_approval(approval)
+
+
+def set_approval_status(approval: Approval, status: str) -> None:
+    if approval.status == "PENDING":
+        _count_pending(approval, -1)
+    approval.status = status
+    if status == "PENDING":
+        _count_pending(approval, 1)
+
+
+for _approval in APPROVALS:
+    _index_approval(_approval)
+
+# Treasury and balance rollups, kept in native currency and converted to the
+# requested reporting currency on read. Kept in step with TREASURY_POSITIONS
+# and ACCOUNTS by set_position() and set_account_balance().
+fx_table = load_fx_table(FX_USD_RATES, os.getenv("FX_RATES_PATH", ""))
+REPORTING_CURRENCY = os.getenv("REPORTING_CURRENCY", "USD")
+positions_by_book: dict[str, TreasuryPosition] = {p.book: p for p in TREASURY_POSITIONS}
+accounts_by_id: dict[str, Account] = {a.account_id: a for a in ACCOUNTS}
+treasury_totals = Rollup(("notional", "pnl"))
+balance_totals = Rollup(("balance",))
+
+
+def _roll_position(position: TreasuryPosition, sign: int) -> None:
+    treasury_totals.add(position.book, position.currency, (position.notional, position.pnl), sign)
+
+
+def _roll_account(account: Account, sign: int) -> None:
+    balance_totals.add(account.corporate_id, account.currency, (account.balance,), sign)
+
+
+def set_position(position: TreasuryPosition) -> None:
+    previous = positions_by_book.get(position.book)
+    if previous is None:
+        TREASURY_POSITIONS.append(position)
+    else:
+        _roll_position(previous, -1)
+        TREASURY_POSITIONS[TREASURY_POSITIONS.index(previous)] = position
+    positions_by_book[position.book] = position
+    _roll_position(position, 1)
+
+
+def set_account_balance(account: Account, balance: float) -> None:
+    _roll_account(account, -1)
+    account.balance = balance
+    _roll_account(account, 1)
+
+
+for _position in TREASURY_POSITIONS:
+    _roll_position(_position, 1)
+for _account in ACCOUNTS:
+    _roll_account(_account, 1)
+
+TREASURY_POSITIONS_LATENCY = DOWNSTREAM_LATENCY.labels("treasury-service", "positions")
+TREASURY_RATES_LATENCY = DOWNSTREAM_LATENCY.labels("treasury-service", "rates")
+COMPLIANCE_POLICIES_LATENCY = DOWNSTREAM_LATENCY.labels("compliance-service", "policies")
+
+TREASURY_POSITION_LIST = TypeAdapter(list[TreasuryPosition])
+FX_RATE_LIST = TypeAdapter(list[FxRate])
+COMPLIANCE_POLICY_LIST = TypeAdapter(list[CompliancePolicy])
+
+
+async def fetch_treasury_positions() -> list[TreasuryPosition]:
+    with timed(TREASURY_POSITIONS_LATENCY):
+        resp = await http_client.get(f"{TREASURY_SERVICE_URL}/api/v1/treasury/positions")
+    resp.raise_for_status()
+    return TREASURY_POSITION_LIST.validate_json(resp.content)
+
+
+async def fetch_fx_rates() -> list[FxRate]:
+    with timed(TREASURY_RATES_LATENCY):
+        resp = await http_client.get(f"{TREASURY_SERVICE_URL}/api/v1/treasury/rates")
+    resp.raise_for_status()
+    return FX_RATE_LIST.validate_json(resp.content)
+
+
+async def fetch_compliance_policies() -> list[CompliancePolicy]:
+    with timed(COMPLIANCE_POLICIES_LATENCY):
+        resp = await http_client.get(f"{COMPLIANCE_SERVICE_URL}/api/v1/policies")
+    resp.raise_for_status()
+    return COMPLIANCE_POLICY_LIST.validate_python(resp.json()["policies"])
+
+
+# Remote dashboard sections. They are the same for every corporate, so each
+# is cached once and refreshed in the background while a recent copy is
+# served; a request only waits on a source (up to its timeout) when it has
+# nothing recent enough.
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "5"))
+DASHBOARD_CACHE_STALE_SECONDS = float(os.getenv("DASHBOARD_CACHE_STALE_SECONDS", "60"))
+TREASURY_TIMEOUT_SECONDS = float(os.getenv("DASHBOARD_TREASURY_TIMEOUT_SECONDS", "1.0"))
+COMPLIANCE_TIMEOUT_SECONDS = float(os.getenv("DASHBOARD_COMPLIANCE_TIMEOUT_SECONDS", "1.0"))
+
+treasury_positions_source = CachedSource(
+    fetch_treasury_positions, DASHBOARD_CACHE_TTL_SECONDS, DASHBOARD_CACHE_STALE_SECONDS, TREASURY_TIMEOUT_SECONDS,
+)
+fx_rates_source = CachedSource(
+    fetch_fx_rates, DASHBOARD_CACHE_TTL_SECONDS, DASHBOARD_CACHE_STALE_SECONDS, TREASURY_TIMEOUT_SECONDS,
+)
+compliance_policies_source = CachedSource(
+    fetch_compliance_policies, DASHBOARD_CACHE_TTL_SECONDS, DASHBOARD_CACHE_STALE_SECONDS, COMPLIANCE_TIMEOUT_SECONDS,
+)
+
+# Warm-up before /ready reports ready: pooled connections to both
+# downstreams and the dashboard sources fetched once. Optional, so an
+# outage downstream does not keep this service out of rotation past
+# READINESS_TIMEOUT_SECONDS (the dashboard returns partial results).
+readiness = Readiness(timeout_seconds=float(os.getenv("READINESS_TIMEOUT_SECONDS", "60")))
+WARM_CONNECTIONS = int(os.getenv("READINESS_WARM_CONNECTIONS", "4"))
+
+
+@readiness.check("treasury-service", required=False)
+async def warm_treasury_service() -> None:
+    await warm_connections(http_client, TREASURY_SERVICE_URL, WARM_CONNECTIONS)
+    await asyncio.gather(treasury_positions_source.refresh(), fx_rates_source.refresh())
+    if treasury_positions_source.error or fx_rates_source.error:
+        raise RuntimeError(treasury_positions_source.error or fx_rates_source.error)
+
+
+@readiness.check("compliance-service", required=False)
+async def warm_compliance_service() -> None:
+    await warm_connections(http_client, COMPLIANCE_SERVICE_URL, WARM_CONNECTIONS)
+    await compliance_policies_source.refresh()
+    if compliance_policies_source.error:
+        raise RuntimeError(compliance_policies_source.error)
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -26,13 +242,18 @@ def health() -> HealthResponse:
     )
 
 
-@app.get("/ready", response_model=HealthResponse)
-def ready() -> HealthResponse:
-    return HealthResponse(
-        status="ok",
+@app.get("/ready", response_model=ReadinessResponse)
+async def ready(response: Response) -> ReadinessResponse:
+    """503 until every warm-up check has finished; lists each check's progress"""
+    status = readiness.status
+    if status != "ok":
+        response.status_code = 503
+    return ReadinessResponse(
+        status=status,
         service="corp-banking-api",
         environment="local",
         time=utc_now(),
+        checks=readiness.report(),
     )
 
 
@@ -58,26 +279,192 @@ def list_pending_approvals() -> list[Approval]:
     return [a for a in APPROVALS if a.status == "PENDING"]
 
 
+@app.get("/api/v1/approvals/pending/summary", response_model=PendingApprovalsSummary)
+async def pending_approvals_summary() -> PendingApprovalsSummary:
+    """Counts of pending approvals by type, and counts and amounts by currency"""
+    return PendingApprovalsSummary(
+        total=sum(pending_by_type.values()),
+        by_type={t: n for t, n in pending_by_type.items() if n},
+        by_currency={
+            c: PendingCurrencyTotal(count=n, amount=round(pending_amount_by_currency[c], 2))
+            for c, n in pending_by_currency.items()
+            if n
+        },
+    )
+
+
+@app.post("/api/v1/approvals", response_model=Approval, status_code=201)
+async def create_approval(req: CreateApprovalRequest) -> Approval:
+    approval = Approval(
+        approval_id=f"APR-{next(approval_ids)}",
+        requested_at=utc_now(),
+        status="PENDING",
+        **req.model_dump(),
+    )
+    add_approval(approval)
+    return approval
+
+
+@app.post("/api/v1/approvals:bulkDecide", response_model=BulkDecideResponse)
+async def bulk_decide(req: BulkDecideRequest, response: Response) -> BulkDecideResponse:
+    """Approve or reject many pending approvals, all or nothing.
+
+    If any decision cannot be applied (unknown ID, not pending, listed twice)
+    none are, the response is 409, and `results` says which items failed.
+    """
+    if len(req.decisions) > MAX_BULK_DECISIONS:
+        raise HTTPException(status_code=400, detail=f"Batch size exceeds {MAX_BULK_DECISIONS}")
+
+    results: list[BulkDecisionResult] = []
+    targets: list[tuple[Approval, str]] = []
+    seen: set[str] = set()
+    for index, item in enumerate(req.decisions):
+        approval = approvals_by_id.get(item.approval_id)
+        error = None
+        if approval is None:
+            error = "Approval not found"
+        elif item.approval_id in seen:
+            error = "Duplicate approval_id in batch"
+        elif approval.status != "PENDING":
+            error = f"Approval is already {approval.status}"
+        seen.add(item.approval_id)
+        results.append(BulkDecisionResult(
+            index=index,
+            approval_id=item.approval_id,
+            status=approval.status if approval is not None else None,
+            error=error,
+        ))
+        if error is None:
+            targets.append((approval, DECISION_STATUS[item.decision]))
+
+    if len(targets) < len(req.decisions):
+        response.status_code = 409
+        return BulkDecideResponse(applied=False, results=results)
+
+    # Validated up front and applied without yielding to the event loop, so
+    # no other request sees a partly applied batch
+    for result, (approval, status) in zip(results, targets):
+        set_approval_status(approval, status)
+        result.status = status
+    return BulkDecideResponse(applied=True, results=results)
+
+
 @app.post("/api/v1/approvals/{approval_id}/approve", response_model=Approval)
-def approve(approval_id: str) -> Approval:
-    for idx, a in enumerate(APPROVALS):
-        if a.approval_id == approval_id:
-            updated = a.model_copy(update={"status": "APPROVED"})
-            APPROVALS[idx] = updated
-            return updated
-    raise HTTPException(status_code=404, detail="Approval not found")
+async def approve(approval_id: str) -> Approval:
+    approval = approvals_by_id.get(approval_id)
+    if approval is None:
+        raise HTTPException(status_code=404, detail="Approval not found")
+    set_approval_status(approval, "APPROVED")
+    return approval
 
 
 @app.post("/api/v1/approvals/{approval_id}/reject", response_model=Approval)
-def reject(approval_id: str) -> Approval:
-    for idx, a in enumerate(APPROVALS):
-        if a.approval_id == approval_id:
-            updated = a.model_copy(update={"status": "REJECTED"})
-            APPROVALS[idx] = updated
-            return updated
-    raise HTTPException(status_code=404, detail="Approval not found")
+async def reject(approval_id: str) -> Approval:
+    approval = approvals_by_id.get(approval_id)
+    if approval is None:
+        raise HTTPException(status_code=404, detail="Approval not found")
+    set_approval_status(approval, "REJECTED")
+    return approval
 
 
 @app.get("/api/v1/treasury/positions", response_model=list[TreasuryPosition])
 def treasury_positions() -> list[TreasuryPosition]:
     return TREASURY_POSITIONS
+
+
+@app.put("/api/v1/treasury/positions/{book}", response_model=TreasuryPosition)
+async def update_position(book: str, req: UpdatePositionRequest) -> TreasuryPosition:
+    """Create or replace a book's position"""
+    position = TreasuryPosition(book=book, as_of=utc_now(), **req.model_dump())
+    set_position(position)
+    return position
+
+
+@app.put("/api/v1/accounts/{account_id}/balance", response_model=Account)
+async def update_balance(account_id: str, req: UpdateBalanceRequest) -> Account:
+    account = accounts_by_id.get(account_id)
+    if account is None:
+        raise HTTPException(status_code=404, detail="Account not found")
+    set_account_balance(account, req.balance)
+    return account
+
+
+def reporting_currency(currency: Currency | None) -> str:
+    currency = currency or REPORTING_CURRENCY
+    if currency not in fx_table.usd_rates:
+        raise HTTPException(status_code=400, detail=f"No FX rate for {currency}")
+    return currency
+
+
+def _treasury_entry(count: int, sums: list[float]) -> TreasuryRollupEntry:
+    return TreasuryRollupEntry(positions=count, notional=round(sums[0], 2), pnl=round(sums[1], 2))
+
+
+def _balance_entry(count: int, sums: list[float]) -> BalanceRollupEntry:
+    return BalanceRollupEntry(accounts=count, balance=round(sums[0], 2))
+
+
+@app.get("/api/v1/rollups/treasury", response_model=TreasuryRollup)
+async def treasury_rollup(currency: Currency | None = None) -> TreasuryRollup:
+    """Notional and PnL per book and per currency, in one reporting currency"""
+    currency = reporting_currency(currency)
+    by_currency = treasury_totals.by_currency(fx_table, currency)
+    return TreasuryRollup(
+        reporting_currency=currency,
+        fx_rates={c: round(r, 6) for c, r in fx_table.rates_to(currency).items()},
+        total=_treasury_entry(
+            sum(n for n, _ in by_currency.values()),
+            [sum(s[i] for _, s in by_currency.values()) for i in range(2)],
+        ),
+        by_book={k: _treasury_entry(*v) for k, v in treasury_totals.by_group(fx_table, currency).items()},
+        by_currency={k: _treasury_entry(*v) for k, v in by_currency.items()},
+    )
+
+
+@app.get("/api/v1/rollups/balances", response_model=BalanceRollup)
+async def balance_rollup(currency: Currency | None = None) -> BalanceRollup:
+    """Account balances per corporate and per currency, in one reporting currency"""
+    currency = reporting_currency(currency)
+    by_currency = balance_totals.by_currency(fx_table, currency)
+    return BalanceRollup(
+        reporting_currency=currency,
+        fx_rates={c: round(r, 6) for c, r in fx_table.rates_to(currency).items()},
+        total=_balance_entry(
+            sum(n for n, _ in by_currency.values()),
+            [sum(s[0] for _, s in by_currency.values())],
+        ),
+        by_corporate={k: _balance_entry(*v) for k, v in balance_totals.by_group(fx_table, currency).items()},
+        by_currency={k: _balance_entry(*v) for k, v in by_currency.items()},
+    )
+
+
+@app.get("/api/v1/dashboard/{corporate_id}", response_model=CorporateDashboard)
+async def corporate_dashboard(corporate_id: str) -> CorporateDashboard:
+    """Accounts, pending approvals, treasury and compliance data in one call.
+
+    The remote sources are fetched concurrently; any that is unavailable is
+    returned as null, with the reason under `sources`.
+    """
+    accounts = [a for a in ACCOUNTS if a.corporate_id == corporate_id]
+    if not accounts:
+        raise HTTPException(status_code=404, detail="Corporate not found")
+    (positions, positions_source), (rates, rates_source), (policies, policies_source) = await asyncio.gather(
+        treasury_positions_source.get(),
+        fx_rates_source.get(),
+        compliance_policies_source.get(),
+    )
+    return CorporateDashboard(
+        corporate_id=corporate_id,
+        accounts=accounts,
+        # Approvals are not attributed to a corporate yet
+        pending_approvals=[a for a in APPROVALS if a.status == "PENDING"],
+        treasury_positions=positions,
+        fx_rates=rates,
+        compliance_policies=policies,
+        sources={
+            "treasury_positions": positions_source,
+            "fx_rates": rates_source,
+            "compliance_policies": policies_source,
+        },
+        generated_at=utc_now(),
+    )
@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Literal
 
+from banking_common.readiness import ReadinessCheck
 from pydantic import BaseModel, Field
 
 
@@ -16,6 +17,14 @@ class HealthResponse(BaseModel):
     time: datetime
 
 
+class ReadinessResponse(BaseModel):
+    status: Literal["ok", "warming", "failed"]
+    service: str
+    environment: str
+    time: datetime
+    checks: list[ReadinessCheck]
+
+
 class Account(BaseModel):
     account_id: str
     corporate_id: str
@@ -36,9 +45,124 @@ class Approval(BaseModel):
     reference: str = Field(default="")
 
 
+class CreateApprovalRequest(BaseModel):
+    type: Literal["PAYMENT", "BENEFICIARY", "LIMIT_CHANGE"]
+    requested_by: str
+    amount: float | None = Field(default=None, gt=0)
+    currency: Currency | None = None
+    reference: str = Field(default="")
+
+
+class ApprovalDecision(BaseModel):
+    approval_id: str
+    decision: Literal["APPROVE", "REJECT"]
+
+
+class BulkDecideRequest(BaseModel):
+    decisions: list[ApprovalDecision]
+
+
+class BulkDecisionResult(BaseModel):
+    index: int
+    approval_id: str
+    # Status after the call; unchanged when the batch was not applied
+    status: Literal["PENDING", "APPROVED", "REJECTED"] | None = None
+    error: str | None = None
+
+
+class BulkDecideResponse(BaseModel):
+    applied: bool
+    results: list[BulkDecisionResult]
+
+
+class PendingCurrencyTotal(BaseModel):
+    count: int
+    amount: float
+
+
+class PendingApprovalsSummary(BaseModel):
+    total: int
+    by_type: dict[str, int]
+    # Only approvals with an amount and currency
+    by_currency: dict[str, PendingCurrencyTotal]
+
+
 class TreasuryPosition(BaseModel):
     book: str
     currency: Currency
     notional: float
     pnl: float
     as_of: datetime
+
+
+class FxRate(BaseModel):
+    pair: str
+    rate: float
+    provider: str
+    rate_type: str
+    as_of: datetime
+
+
+class CompliancePolicy(BaseModel):
+    # compliance-service answers in camelCase
+    policy_id: str = Field(validation_alias="policyId")
+    name: str
+    severity: str
+    description: str
+    enabled: bool
+
+
+class DashboardSource(BaseModel):
+    status: Literal["ok", "stale", "unavailable"]
+    fetched_at: datetime | None = None
+    error: str | None = None
+
+
+class CorporateDashboard(BaseModel):
+    corporate_id: str
+    accounts: list[Account]
+    pending_approvals: list[Approval]
+    # Remote sections are None when their source is unavailable
+    treasury_positions: list[TreasuryPosition] | None
+    fx_rates: list[FxRate] | None
+    compliance_policies: list[CompliancePolicy] | None
+    sources: dict[str, DashboardSource]
+    generated_at: datetime
+
+
+class UpdatePositionRequest(BaseModel):
+    currency: Currency
+    notional: float
+    pnl: float
+
+
+class UpdateBalanceRequest(BaseModel):
+    balance: float
+
+
+class TreasuryRollupEntry(BaseModel):
+    positions: int
+    notional: float
+    pnl: float
+
+
+class TreasuryRollup(BaseModel):
+    reporting_currency: Currency
+    # Reporting-currency value of one unit of each currency
+    fx_rates: dict[str, float]
+    total: TreasuryRollupEntry
+    by_book: dict[str, TreasuryRollupEntry]
+    by_currency: dict[str, TreasuryRollupEntry]
+
+
+class BalanceRollupEntry(BaseModel):
+    accounts: int
+    balance: float
+
+
+class BalanceRollup(BaseModel):
+    reporting_currency: Currency
+    fx_rates: dict[str, float]
+    total: BalanceRollupEntry
+    by_corporate: dict[str, BalanceRollupEntry]
+    by_currency: dict[str, BalanceRollupEntry]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+
+
+class FxTable:
+    """Conversion rates, held as the USD value of one unit of each currency"""
+
+    def __init__(self, usd_rates: dict[str, float]) -> None:
+        self.usd_rates = dict(usd_rates)
+
+    def rate(self, from_currency: str, to_currency: str) -> float:
+        return self.usd_rates[from_currency] / self.usd_rates[to_currency]
+
+    def rates_to(self, currency: str) -> dict[str, float]:
+        return {c: self.rate(c, currency) for c in self.usd_rates}
+
+
+def load_fx_table(defaults: dict[str, float], path: str = "") -> FxTable:
+    """FX table from `defaults`, overridden by a JSON file of {currency: usd_rate} if given"""
+    rates = dict(defaults)
+    if path:
+        with open(path) as f:
+            rates.update({c: float(r) for c, r in json.load(f).items()})
+    return FxTable(rates)
+
+
+class Rollup:
+    """Running sums of a few measures per group, kept in each amount's own currency.
+
+    Callers add a record's values when it appears and subtract them (sign=-1)
+    before it changes, so sums stay current without rescanning. Conversion
+    happens on read: an FX change needs no recompute, and a read costs one
+    multiply per (group, currency) pair.
+    """
+
+    def __init__(self, measures: Sequence[str]) -> None:
+        self.measures = tuple(measures)
+        # group -> currency -> [record count, *measure sums]
+        self._sums: dict[str, dict[str, list[float]]] = {}
+
+    def add(self, group: str, currency: str, values: Sequence[float], sign: int = 1) -> None:
+        by_currency = self._sums.setdefault(group, {})
+        sums = by_currency.setdefault(currency, [0] + [0.0] * len(self.measures))
+        sums[0] += sign
+        for i, value in enumerate(values, 1):
+            sums[i] += sign * value
+        if sums[0] == 0:
+            del by_currency[currency]
+            if not by_currency:
+                del self._sums[group]
+
+    def by_group(self, fx: FxTable, currency: str) -> dict[str, tuple[int, list[float]]]:
+        """(record count, measure sums converted to `currency`) per group"""
+        return self._totals(fx, currency, by_group=True)
+
+    def by_currency(self, fx: FxTable, currency: str) -> dict[str, tuple[int, list[float]]]:
+        """Same as by_group(), but per currency the amounts were recorded in"""
+        return self._totals(fx, currency, by_group=False)
+
+    def _totals(self, fx: FxTable, currency: str, by_group: bool) -> dict[str, tuple[int, list[float]]]:
+        rates = fx.rates_to(currency)
+        out: dict[str, tuple[int, list[float]]] = {}
+        for group, by_currency in self._sums.items():
+            for from_currency, sums in by_currency.items():
+                key = group if by_group else from_currency
+                count, converted = out.get(key, (0, [0.0] * len(self.measures)))
+                rate = rates[from_currency]
+                out[key] = (count + int(sums[0]), [c + v * rate for c, v in zip(converted, sums[1:])])
+        return out
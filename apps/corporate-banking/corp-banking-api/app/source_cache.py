@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Generic, TypeVar
+
+from .models import DashboardSource
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CachedSource(Generic[T]):
+    """Latest result of one remote source, served stale-while-revalidate.
+
+    Within `ttl_seconds` of a fetch the cached value is returned as is. For
+    the following `stale_seconds` it is still returned immediately, marked
+    stale, while a single background fetch refreshes it. Past that, callers
+    wait for a fetch, but no longer than `timeout_seconds`; a fetch that
+    times out keeps running so the next caller can use its result.
+
+    Only the event loop touches it, so no locking is needed.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Awaitable[T]],
+        ttl_seconds: float,
+        stale_seconds: float,
+        timeout_seconds: float,
+    ) -> None:
+        self.fetch = fetch
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.timeout_seconds = timeout_seconds
+        self.value: T | None = None
+        self.fetched_at: datetime | None = None
+        self.error: str | None = None
+        self._fetched: float | None = None
+        self._refresh: asyncio.Task[None] | None = None
+
+    async def get(self) -> tuple[T | None, DashboardSource]:
+        age = None if self._fetched is None else time.monotonic() - self._fetched
+        if age is not None and age < self.ttl_seconds:
+            return self.value, self._source("ok")
+        if age is not None and age < self.ttl_seconds + self.stale_seconds:
+            self.refresh()
+            return self.value, self._source("stale")
+
+        task = self.refresh()
+        try:
+            await asyncio.wait_for(asyncio.shield(task), self.timeout_seconds)
+        except TimeoutError:
+            return None, DashboardSource(status="unavailable", error=f"timed out after {self.timeout_seconds}s")
+        if self.error is not None:
+            return None, DashboardSource(status="unavailable", error=self.error)
+        return self.value, self._source("ok")
+
+    def refresh(self) -> asyncio.Task[None]:
+        """Start a fetch unless one is already in flight; returns the in-flight fetch"""
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self._run_fetch())
+        return self._refresh
+
+    def _source(self, status: str) -> DashboardSource:
+        return DashboardSource(status=status, fetched_at=self.fetched_at)
+
+    async def _run_fetch(self) -> None:
+        try:
+            value = await self.fetch()
+        except Exception as exc:
+            self.error = str(exc) or type(exc).__name__
+            logger.warning("dashboard source fetch failed: %s", self.error)
+            return
+        self.value = value
+        self.fetched_at = datetime.now(tz=UTC)
+        self.error = None
+        self._fetched = time.monotonic()
@@ -1,76 +1,76 @@
 from __future__ import annotations
 
+import os
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 from typing import Annotated
 
-from fastapi import FastAPI, HTTPException
-
-from .models import CreditScoreRequest, CreditScoreResponse, HealthResponse
+from banking_common.metrics import SCORING_LATENCY, instrument, timed, track_store_size
+from banking_common.profiling import install_profiling
+from banking_common.readiness import Readiness
+from banking_common.wire import install_msgpack
+from fastapi import FastAPI, HTTPException, Response
+
+from . import rules
+from .models import (
+    CreditScoreRequest,
+    CreditScoreResponse,
+    HealthResponse,
+    ReadinessResponse,
+    ScoreCacheStats,
+    SweepAxis,
+    SweepAxisValues,
+    SweepRequest,
+    SweepResponse,
+)
+from .score_cache import LatestScores, ScoreCache, fingerprint
 
 
 def utc_now() -> datetime:
     return datetime.now(tz=UTC)
 
 
-app = FastAPI(title="Credit Scoring Service", version="1.0.0")
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    readiness.start()
+    yield
+    await readiness.stop()
 
 
-def calculate_score(req: CreditScoreRequest) -> CreditScoreResponse:
-    # Hardcoded ML logic for demo purposes
-    score = 750  # Base score
-
-    # Income factor
-    if req.income_annual < 30000:
-        score -= 150
-    elif req.income_annual < 60000:
-        score -= 50
-    elif req.income_annual > 120000:
-        score += 50
-
-    # Debt-to-income ratio
-    dti = req.debt_existing / max(req.income_annual, 1)
-    if dti > 0.5:
-        score -= 200
-    elif dti > 0.3:
-        score -= 100
-    elif dti < 0.1:
-        score += 50
-
-    # Credit history
-    if req.credit_history_length_years < 2:
-        score -= 100
-    elif req.credit_history_length_years > 10:
-        score += 50
+app = FastAPI(title="Credit Scoring Service", version="1.0.0", lifespan=lifespan)
 
-    # Delinquencies
-    score -= req.recent_delinquencies * 50
+# Add Prometheus metrics instrumentation
+instrument(app)
+install_profiling(app)
+CREDIT_SCORING_LATENCY = SCORING_LATENCY.labels("credit")
+SWEEP_SCORING_LATENCY = SCORING_LATENCY.labels("credit_sweep")
 
-    # Employment
-    if req.employment_type == "FULL_TIME":
-        score += 30
-    elif req.employment_type == "UNEMPLOYED":
-        score -= 200
+# Upper bound on cells in a single sweep grid
+MAX_SWEEP_CELLS = 2500
 
-    # Clamp to valid range
-    score = max(300, min(850, score))
+# Scores by input fingerprint, so retried identical submissions aren't
+# re-scored, and the latest evaluation per applicant for GET /score/{id}
+score_cache = ScoreCache(
+    max_size=int(os.getenv("SCORE_CACHE_SIZE", "10000")),
+    ttl_seconds=float(os.getenv("SCORE_CACHE_TTL_SECONDS", "300")),
+)
+latest_scores = LatestScores(max_size=int(os.getenv("LATEST_SCORES_SIZE", "100000")))
+track_store_size("score_cache", lambda: len(score_cache))
+track_store_size("latest_scores", lambda: len(latest_scores))
 
-    # Determine grade and decision
-    if score >= 750:
-        grade, decision = "A", "APPROVED"
-    elif score >= 700:
-        grade, decision = "B", "APPROVED"
-    elif score >= 650:
-        grade, decision = "C", "MANUAL_REVIEW"
-    elif score >= 600:
-        grade, decision = "D", "MANUAL_REVIEW"
-    elif score >= 550:
-        grade, decision = "E", "REJECTED"
-    else:
-        grade, decision = "F", "REJECTED"
 
-    # Calculate max loan amount and interest rate
-    max_loan = req.income_annual * (4 if decision == "APPROVED" else 2)
-    interest_rate = 5.0 + (850 - score) / 50  # Simple inverse relationship
+def calculate_score(req: CreditScoreRequest) -> CreditScoreResponse:
+    dti = rules.debt_to_income(req.debt_existing, req.income_annual)
+    score = rules.clamp(
+        rules.BASE_SCORE
+        + rules.income_points(req.income_annual)
+        + rules.dti_points(dti)
+        + rules.history_points(req.credit_history_length_years)
+        + rules.delinquency_points(req.recent_delinquencies)
+        + rules.employment_points(req.employment_type)
+    )
+    grade, decision = rules.grade_and_decision(score)
+    max_loan = rules.max_loan_amount(req.income_annual, decision)
 
     # Factors for explanation
     factors = []
@@ -93,12 +93,39 @@ def calculate_score(req: CreditScoreRequest) -> CreditScoreResponse:
         grade=grade,
         decision=decision,
         max_loan_amount=max_loan,
-        interest_rate_pct=round(interest_rate, 2),
+        interest_rate_pct=rules.interest_rate_pct(score),
         factors=factors,
         evaluated_at=utc_now(),
     )
 
 
+# Warm-up before /ready reports ready: a batch of synthetic applicants
+# through the scorer, response serialization and the sweep grid, so the
+# first real requests don't pay for cold code paths. Bypasses the caches.
+readiness = Readiness(timeout_seconds=float(os.getenv("READINESS_TIMEOUT_SECONDS", "60")))
+WARMUP_BATCH_SIZE = int(os.getenv("READINESS_WARMUP_BATCH", "200"))
+
+
+@readiness.check("credit scorer")
+async def warm_scorer() -> None:
+    employment_types = ("FULL_TIME", "PART_TIME", "SELF_EMPLOYED", "UNEMPLOYED")
+    for i in range(WARMUP_BATCH_SIZE):
+        req = CreditScoreRequest(
+            applicant_id=f"WARMUP-{i}",
+            income_annual=20000.0 + i * 1000,
+            debt_existing=float(i * 250),
+            credit_history_length_years=i % 15,
+            num_credit_lines=i % 8,
+            recent_delinquencies=i % 4,
+            employment_type=employment_types[i % len(employment_types)],
+            loan_amount=10000.0 + i * 500,
+            loan_purpose="PERSONAL",
+        )
+        fingerprint(req)
+        calculate_score(req).model_dump_json()
+    rules.score_grid(req.model_dump(), "income_annual", [30000.0, 60000.0], "debt_existing", [0.0, 20000.0])
+
+
 @app.get("/health", response_model=HealthResponse)
 def health() -> HealthResponse:
     return HealthResponse(
@@ -109,33 +136,94 @@ def health() -> HealthResponse:
     )
 
 
-@app.get("/ready", response_model=HealthResponse)
-def ready() -> HealthResponse:
-    return HealthResponse(
-        status="ok",
+@app.get("/ready", response_model=ReadinessResponse)
+async def ready(response: Response) -> ReadinessResponse:
+    """503 until every warm-up check has finished; lists each check's progress"""
+    status = readiness.status
+    if status != "ok":
+        response.status_code = 503
+    return ReadinessResponse(
+        status=status,
         service="credit-scoring",
         environment="local",
         time=utc_now(),
+        checks=readiness.report(),
     )
 
 
 @app.post("/api/v1/score", response_model=CreditScoreResponse)
-def score_application(req: CreditScoreRequest) -> CreditScoreResponse:
-    return calculate_score(req)
+async def score_application(req: CreditScoreRequest) -> CreditScoreResponse:
+    key = fingerprint(req)
+    score = score_cache.get(key)
+    if score is None:
+        with timed(CREDIT_SCORING_LATENCY):
+            score = calculate_score(req)
+        score_cache.put(key, score)
+    latest_scores.put(score)
+    return score
+
+
+def axis_values(axis: SweepAxis) -> list[float]:
+    if axis.steps == 1:
+        values = [axis.start]
+    else:
+        step = (axis.stop - axis.start) / (axis.steps - 1)
+        values = [axis.start + i * step for i in range(axis.steps)]
+    if axis.variable in rules.INTEGER_VARIABLES:
+        # Integer inputs: round and drop the repeats that rounding creates
+        return list(dict.fromkeys(round(v) for v in values))
+    return [round(v, 2) for v in values]
+
+
+@app.post("/api/v1/score/sweep", response_model=SweepResponse)
+def sweep_score(req: SweepRequest) -> SweepResponse:
+    """Score a grid of what-if variations of one request over one or two inputs"""
+    if req.y is not None and req.y.variable == req.x.variable:
+        raise HTTPException(status_code=400, detail="x and y must be different variables")
+    xs = axis_values(req.x)
+    ys = axis_values(req.y) if req.y is not None else []
+    cells = len(xs) * max(len(ys), 1)
+    if cells > MAX_SWEEP_CELLS:
+        raise HTTPException(status_code=400, detail=f"Sweep grid of {cells} cells exceeds {MAX_SWEEP_CELLS}")
+
+    with timed(SWEEP_SCORING_LATENCY):
+        grid = rules.score_grid(
+            req.base.model_dump(), req.x.variable, xs, req.y.variable if req.y else None, ys,
+        )
+    return SweepResponse(
+        applicant_id=req.base.applicant_id,
+        x=SweepAxisValues(variable=req.x.variable, values=xs),
+        y=SweepAxisValues(variable=req.y.variable, values=ys) if req.y else None,
+        **grid,
+    )
 
 
 @app.get("/api/v1/score/{applicant_id}", response_model=CreditScoreResponse)
-def get_score(applicant_id: str) -> CreditScoreResponse:
-    # Return a mock score for demo purposes
-    mock_req = CreditScoreRequest(
-        applicant_id=applicant_id,
-        income_annual=75000.0,
-        debt_existing=15000.0,
-        credit_history_length_years=8,
-        num_credit_lines=5,
-        recent_delinquencies=0,
-        employment_type="FULL_TIME",
-        loan_amount=25000.0,
-        loan_purpose="PERSONAL",
+async def get_score(applicant_id: str) -> CreditScoreResponse:
+    """Latest evaluation for the applicant"""
+    score = latest_scores.get(applicant_id)
+    if score is None:
+        raise HTTPException(status_code=404, detail="No score for applicant")
+    return score
+
+
+@app.get("/api/v1/cache/stats", response_model=ScoreCacheStats)
+def cache_stats() -> ScoreCacheStats:
+    lookups = score_cache.hits + score_cache.misses
+    return ScoreCacheStats(
+        size=len(score_cache),
+        max_size=score_cache.max_size,
+        ttl_seconds=score_cache.ttl_seconds,
+        hits=score_cache.hits,
+        misses=score_cache.misses,
+        hit_rate=round(score_cache.hits / lookups, 4) if lookups else 0.0,
+        evictions=score_cache.evictions,
+        expirations=score_cache.expirations,
+        latest_scores=len(latest_scores),
+        latest_scores_max_size=latest_scores.max_size,
     )
-    return calculate_score(mock_req)
+
+
+# loans-api calls this in msgpack (see banking_common.wire);
+# stays after every route so the others get the 415 wrapper too
+install_msgpack(app, ["/api/v1/score"])
@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Literal
 
+from banking_common.readiness import ReadinessCheck
 from pydantic import BaseModel, Field
 
 
@@ -13,6 +14,14 @@ class HealthResponse(BaseModel):
     time: datetime
 
 
+class ReadinessResponse(BaseModel):
+    status: Literal["ok", "warming", "failed"]
+    service: str
+    environment: str
+    time: datetime
+    checks: list[ReadinessCheck]
+
+
 class CreditScoreRequest(BaseModel):
     applicant_id: str
     income_annual: float
@@ -34,3 +43,57 @@ class CreditScoreResponse(BaseModel):
     interest_rate_pct: float
     factors: list[str]
     evaluated_at: datetime
+
+
+class ScoreCacheStats(BaseModel):
+    size: int
+    max_size: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    expirations: int
+    latest_scores: int
+    latest_scores_max_size: int
+
+
+SweepVariable = Literal[
+    "income_annual",
+    "debt_existing",
+    "credit_history_length_years",
+    "recent_delinquencies",
+    "loan_amount",
+]
+
+
+class SweepAxis(BaseModel):
+    variable: SweepVariable
+    start: float = Field(ge=0)
+    stop: float = Field(ge=0)
+    # Evenly spaced values from start to stop inclusive
+    steps: int = Field(ge=1, le=500)
+
+
+class SweepRequest(BaseModel):
+    base: CreditScoreRequest
+    x: SweepAxis
+    y: SweepAxis | None = None
+
+
+class SweepAxisValues(BaseModel):
+    variable: SweepVariable
+    values: list[float]
+
+
+class SweepResponse(BaseModel):
+    applicant_id: str
+    x: SweepAxisValues
+    y: SweepAxisValues | None = None
+    # Grids indexed [y][x]; a single row when there is no y axis
+    score: list[list[int]]
+    grade: list[list[str]]
+    decision: list[list[str]]
+    interest_rate_pct: list[list[float]]
+    max_loan_amount: list[list[float]]
+    within_max_loan: list[list[bool]]
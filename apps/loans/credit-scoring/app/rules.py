@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+# Hardcoded ML logic for demo purposes. The score is a base plus one term per
+# factor, so a what-if sweep can work each term out once per axis value and
+# only combine them per grid cell.
+
+BASE_SCORE = 750
+MIN_SCORE = 300
+MAX_SCORE = 850
+
+
+def income_points(income_annual: float) -> int:
+    if income_annual < 30000:
+        return -150
+    if income_annual < 60000:
+        return -50
+    if income_annual > 120000:
+        return 50
+    return 0
+
+
+def debt_to_income(debt_existing: float, income_annual: float) -> float:
+    return debt_existing / max(income_annual, 1)
+
+
+def dti_points(dti: float) -> int:
+    if dti > 0.5:
+        return -200
+    if dti > 0.3:
+        return -100
+    if dti < 0.1:
+        return 50
+    return 0
+
+
+def history_points(credit_history_length_years: int) -> int:
+    if credit_history_length_years < 2:
+        return -100
+    if credit_history_length_years > 10:
+        return 50
+    return 0
+
+
+def delinquency_points(recent_delinquencies: int) -> int:
+    return -50 * recent_delinquencies
+
+
+def employment_points(employment_type: str) -> int:
+    if employment_type == "FULL_TIME":
+        return 30
+    if employment_type == "UNEMPLOYED":
+        return -200
+    return 0
+
+
+def clamp(score: int) -> int:
+    return max(MIN_SCORE, min(MAX_SCORE, score))
+
+
+def grade_and_decision(score: int) -> tuple[str, str]:
+    if score >= 750:
+        return "A", "APPROVED"
+    if score >= 700:
+        return "B", "APPROVED"
+    if score >= 650:
+        return "C", "MANUAL_REVIEW"
+    if score >= 600:
+        return "D", "MANUAL_REVIEW"
+    if score >= 550:
+        return "E", "REJECTED"
+    return "F", "REJECTED"
+
+
+def max_loan_amount(income_annual: float, decision: str) -> float:
+    return income_annual * (4 if decision == "APPROVED" else 2)
+
+
+def interest_rate_pct(score: int) -> float:
+    # Simple inverse relationship
+    return round(5.0 + (MAX_SCORE - score) / 50, 2)
+
+
+# Sweepable inputs that must stay whole numbers. loan_amount does not move
+# the score, but decides whether the amount fits under max_loan_amount.
+INTEGER_VARIABLES = {"credit_history_length_years", "recent_delinquencies"}
+
+
+def score_grid(
+    base: dict,
+    x_name: str,
+    xs: Sequence[float],
+    y_name: str | None = None,
+    ys: Sequence[float] = (),
+) -> dict[str, list[list]]:
+    """Score every (y, x) combination of one or two inputs over a base request.
+
+    `base` holds the request's fields. Returns row-major [y][x] grids, with
+    a single row when there is no y variable.
+    """
+    cols = [{x_name: v} for v in xs]
+    rows = [{y_name: v} for v in ys] if y_name else [{}]
+    # Terms that depend on neither axis are computed once, the rest once per
+    # axis value; dti needs income and debt together, so it is per cell only
+    # when one of them is swept.
+    swept = {x_name, y_name}
+    fixed = BASE_SCORE + employment_points(base["employment_type"])
+    if "income_annual" not in swept:
+        fixed += income_points(base["income_annual"])
+    if "credit_history_length_years" not in swept:
+        fixed += history_points(base["credit_history_length_years"])
+    if "recent_delinquencies" not in swept:
+        fixed += delinquency_points(base["recent_delinquencies"])
+    dti_swept = "income_annual" in swept or "debt_existing" in swept
+    if not dti_swept:
+        fixed += dti_points(debt_to_income(base["debt_existing"], base["income_annual"]))
+
+    def axis_points(values: dict) -> int:
+        points = 0
+        if "income_annual" in values:
+            points += income_points(values["income_annual"])
+        if "credit_history_length_years" in values:
+            points += history_points(values["credit_history_length_years"])
+        if "recent_delinquencies" in values:
+            points += delinquency_points(values["recent_delinquencies"])
+        return points
+
+    row_points = [axis_points(r) for r in rows]
+    col_points = [axis_points(c) for c in cols]
+
+    grid: dict[str, list[list]] = {
+        "score": [], "grade": [], "decision": [], "interest_rate_pct": [],
+        "max_loan_amount": [], "within_max_loan": [],
+    }
+    for row, r_points in zip(rows, row_points):
+        out = {name: [] for name in grid}
+        for col, c_points in zip(cols, col_points):
+            inputs = {**base, **row, **col}
+            score = fixed + r_points + c_points
+            if dti_swept:
+                score += dti_points(debt_to_income(inputs["debt_existing"], inputs["income_annual"]))
+            score = clamp(score)
+            grade, decision = grade_and_decision(score)
+            max_loan = max_loan_amount(inputs["income_annual"], decision)
+            out["score"].append(score)
+            out["grade"].append(grade)
+            out["decision"].append(decision)
+            out["interest_rate_pct"].append(interest_rate_pct(score))
+            out["max_loan_amount"].append(max_loan)
+            out["within_max_loan"].append(inputs["loan_amount"] <= max_loan)
+        for name, values in out.items():
+            grid[name].append(values)
+    return grid
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import OrderedDict
+
+from .models import CreditScoreRequest, CreditScoreResponse
+
+
+def fingerprint(req: CreditScoreRequest) -> bytes:
+    """Stable digest of every scoring input, applicant_id included"""
+    return hashlib.blake2b(req.model_dump_json().encode(), digest_size=16).digest()
+
+
+class ScoreCache:
+    """Bounded LRU of input fingerprint -> score, with a TTL per entry.
+
+    Only the event loop touches it (the scoring handlers are async), so no
+    locking is needed.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[bytes, tuple[CreditScoreResponse, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> CreditScoreResponse | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: bytes, score: CreditScoreResponse) -> None:
+        self._entries[key] = (score, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+class LatestScores:
+    """Most recent evaluation per applicant, dropping the least recently scored"""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._scores: OrderedDict[str, CreditScoreResponse] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def get(self, applicant_id: str) -> CreditScoreResponse | None:
+        return self._scores.get(applicant_id)
+
+    def put(self, score: CreditScoreResponse) -> None:
+        self._scores[score.applicant_id] = score
+        self._scores.move_to_end(score.applicant_id)
+        while len(self._scores) > self.max_size:
+            self._scores.popitem(last=False)
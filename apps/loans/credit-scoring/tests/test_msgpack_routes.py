@@ -0,0 +1,41 @@
+import msgpack
+from banking_common.wire import ACCEPT, MSGPACK
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+APPLICATION = {
+    "applicant_id": "APP-1",
+    "income_annual": 85000,
+    "debt_existing": 12000,
+    "credit_history_length_years": 8,
+    "num_credit_lines": 4,
+    "recent_delinquencies": 0,
+    "employment_type": "FULL_TIME",
+    "loan_amount": 25000,
+    "loan_purpose": "AUTO_LOAN",
+}
+
+client = TestClient(app)
+
+
+def post_msgpack(path: str, payload: dict):
+    return client.post(path, content=msgpack.packb(payload), headers={"content-type": MSGPACK, "accept": ACCEPT})
+
+
+def test_score_speaks_msgpack():
+    resp = post_msgpack("/api/v1/score", APPLICATION)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith(MSGPACK)
+    assert msgpack.unpackb(resp.content)["applicant_id"] == "APP-1"
+
+
+def test_routes_declared_after_score_refuse_msgpack():
+    sweep = {"base": APPLICATION, "x": {"variable": "loan_amount", "start": 1000, "stop": 5000, "steps": 3}}
+    resp = post_msgpack("/api/v1/score/sweep", sweep)
+    assert resp.status_code == 415
+
+    # The JSON fallback still works
+    resp = client.post("/api/v1/score/sweep", json=sweep)
+    assert resp.status_code == 200
+    assert len(resp.json()["x"]["values"]) == 3
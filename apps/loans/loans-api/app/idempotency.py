@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import itertools
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+# Longest Idempotency-Key accepted
+MAX_KEY_LENGTH = 255
+
+
+class IdempotencyKeyReused(Exception):
+    """Raised when a key comes back with a different request body."""
+
+
+def request_fingerprint(req: BaseModel) -> bytes:
+    return hashlib.blake2b(req.model_dump_json().encode(), digest_size=16).digest()
+
+
+class _Entry(Generic[T]):
+    __slots__ = ("fingerprint", "future", "expires")
+
+    def __init__(self, fingerprint: bytes, future: asyncio.Future[T]) -> None:
+        self.fingerprint = fingerprint
+        self.future = future
+        # In-flight entries don't expire
+        self.expires = float("inf")
+
+
+class IdempotencyCache(Generic[T]):
+    """Outcomes of requests sent with an Idempotency-Key, replayed to retries.
+
+    The first request with a key runs; until it finishes, requests with the
+    same key wait for it instead of running again, then all get its
+    outcome. Successful outcomes are kept for `ttl_seconds`, up to
+    `max_size` keys (least recently used go first). Keys still in flight are
+    never evicted, so retries can't slip past a running original; the cache
+    may hold more than `max_size` keys until they finish. A failed original
+    is not kept, so the next retry runs afresh.
+
+    Only the event loop touches it (the create handlers are async), so no
+    locking is needed.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, _Entry[T]] = OrderedDict()
+        self.replays = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def run(self, key: str, fingerprint: bytes, call: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Outcome for `key`, and whether it was replayed rather than produced by `call`"""
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires < time.monotonic():
+            del self._entries[key]
+            entry = None
+        if entry is not None:
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyKeyReused(key)
+            self._entries.move_to_end(key)
+            self.replays += 1
+            # Shielded: a waiter going away must not cancel the original
+            return await asyncio.shield(entry.future), True
+
+        entry = _Entry(fingerprint, asyncio.get_running_loop().create_future())
+        self._entries[key] = entry
+        self._evict()
+        try:
+            outcome = await call()
+        except BaseException as exc:
+            if self._entries.get(key) is entry:
+                del self._entries[key]
+            if isinstance(exc, asyncio.CancelledError):
+                entry.future.cancel()
+            else:
+                entry.future.set_exception(exc)
+                # Waiters re-raise it; don't warn when there are none
+                entry.future.exception()
+            raise
+        entry.future.set_result(outcome)
+        entry.expires = time.monotonic() + self.ttl_seconds
+        return outcome, False
+
+    def _evict(self) -> None:
+        excess = len(self._entries) - self.max_size
+        if excess <= 0:
+            return
+        finished = (k for k, e in self._entries.items() if e.future.done())
+        for key in list(itertools.islice(finished, excess)):
+            del self._entries[key]
@@ -1,56 +1,207 @@
 from __future__ import annotations
 
+import asyncio
+import bisect
+import heapq
+import itertools
+import os
+from collections import ChainMap
+from collections.abc import Container
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
-from typing import Annotated
+from typing import Annotated, Literal
 
 import httpx
-from fastapi import FastAPI, Header, HTTPException
-from prometheus_fastapi_instrumentator import Instrumentator
+from banking_common.metrics import DOWNSTREAM_LATENCY, instrument, timed, track_store_size
+from banking_common.profiling import install_profiling, span
+from banking_common.readiness import Readiness, warm_connections
+from banking_common.sharding import owns
+from banking_common.wire import WireClient
+from fastapi import FastAPI, Header, HTTPException, Query, Response
+from pydantic import TypeAdapter, ValidationError
 
+from .idempotency import MAX_KEY_LENGTH, IdempotencyCache, IdempotencyKeyReused, request_fingerprint
 from .models import (
+    BatchCreateApplicationsRequest,
+    BatchCreateApplicationsResponse,
+    BatchItemError,
+    CreateApplicationRequest,
     CreditScoreResponse,
     HealthResponse,
     LoanApplication,
     LoanApplicationResponse,
+    ReadinessResponse,
 )
+from .outbox import BatchOutbox, OutboxFull
 
 
 def utc_now() -> datetime:
     return datetime.now(tz=UTC)
 
 
-app = FastAPI(title="Loans API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    scoring_queue.start()
+    readiness.start()
+    yield
+    await readiness.stop()
+    await scoring_queue.stop()
+    await http_client.aclose()
+
+
+app = FastAPI(title="Loans API", version="1.0.0", lifespan=lifespan)
 
 # Add Prometheus metrics instrumentation
-Instrumentator().instrument(app).expose(app)
+instrument(app)
+install_profiling(app)
+CREDIT_SCORE_LATENCY = DOWNSTREAM_LATENCY.labels("credit-scoring", "score")
 
-# In-memory store for demo
+# In-memory store for demo. In multi-worker mode (app/serve.py) each worker
+# holds only the applications it owns.
 applications: dict[str, LoanApplication] = {}
+# Credit score each application was decided on, by application_id
+credit_scores: dict[str, CreditScoreResponse] = {}
+
+# Listing order: oldest first, ties broken by ID
+OrderKey = tuple[datetime, str]
+
+# Indexes for list_applications: sorted order keys overall, per applicant and
+# per status. Kept in step with the store by store_application() and
+# set_status(); mutate applications only through those.
+application_order: list[OrderKey] = []
+applications_by_applicant: dict[str, list[OrderKey]] = {}
+applications_by_status: dict[str, list[OrderKey]] = {}
+
+
+def order_key(application: LoanApplication) -> OrderKey:
+    return (application.created_at, application.application_id)
+
+
+def _unindex(index: list[OrderKey], key: OrderKey) -> None:
+    i = bisect.bisect_left(index, key)
+    if i < len(index) and index[i] == key:
+        del index[i]
+
+
+def store_application(application: LoanApplication) -> None:
+    previous = applications.get(application.application_id)
+    if previous is not None:
+        # Re-submitting an application_id replaces the earlier application
+        key = order_key(previous)
+        _unindex(application_order, key)
+        _unindex(applications_by_applicant[previous.applicant_id], key)
+        _unindex(applications_by_status[previous.status], key)
+        credit_scores.pop(previous.application_id, None)
+    applications[application.application_id] = application
+    key = order_key(application)
+    bisect.insort(application_order, key)
+    bisect.insort(applications_by_applicant.setdefault(application.applicant_id, []), key)
+    bisect.insort(applications_by_status.setdefault(application.status, []), key)
+
+
+def set_status(application: LoanApplication, status: str) -> None:
+    key = order_key(application)
+    _unindex(applications_by_status[application.status], key)
+    bisect.insort(applications_by_status.setdefault(status, []), key)
+    application.status = status
+    application.updated_at = utc_now()
 
 # External services URLs (adjust for your environment)
-CREDIT_SCORING_URL = "http://credit-scoring:8085"
-DOCUMENT_PROCESSING_URL = "http://document-processing:8084"
+CREDIT_SCORING_URL = os.getenv("CREDIT_SCORING_URL", "http://credit-scoring:8085")
+DOCUMENT_PROCESSING_URL = os.getenv("DOCUMENT_PROCESSING_URL", "http://document-processing:8084")
 
+# Shared connection pool for calls to credit-scoring
+http_client = httpx.AsyncClient(timeout=5.0)
+# Scoring calls go out in msgpack where credit-scoring takes it (see
+# banking_common.wire), unless INTERNAL_WIRE_FORMAT is "json"
+INTERNAL_WIRE_FORMAT = os.getenv("INTERNAL_WIRE_FORMAT", "msgpack")
+credit_scoring = WireClient(http_client, enabled=INTERNAL_WIRE_FORMAT == "msgpack")
 
-async def get_credit_score(applicant_id: str) -> CreditScoreResponse:
-    """Call credit scoring service"""
-    try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(f"{CREDIT_SCORING_URL}/api/v1/score/{applicant_id}")
-            resp.raise_for_status()
-            return resp.json()
-    except Exception as e:
-        # Fallback mock score for demo
-        return CreditScoreResponse(
-            applicant_id=applicant_id,
-            score=700,
-            grade="B",
-            decision="APPROVED",
-            max_loan_amount=100000.0,
-            interest_rate_pct=7.5,
-            factors=["Mock score - service unavailable"],
-            evaluated_at=utc_now(),
-        )
+# Attempts per application before it is left for a human to decide
+SCORING_ATTEMPTS = 3
+
+
+async def score_application(application: LoanApplication) -> CreditScoreResponse:
+    """Score an application on its own figures via the credit scoring service"""
+    payload = application.model_dump(
+        include={
+            "applicant_id",
+            "income_annual",
+            "debt_existing",
+            "credit_history_length_years",
+            "num_credit_lines",
+            "recent_delinquencies",
+            "employment_type",
+            "loan_amount",
+            "loan_purpose",
+        }
+    )
+    with timed(CREDIT_SCORE_LATENCY), span("credit-scoring"):
+        result = await credit_scoring.post(f"{CREDIT_SCORING_URL}/api/v1/score", payload)
+    return CreditScoreResponse.model_validate(result)
+
+
+def decide(application: LoanApplication, score: CreditScoreResponse) -> str:
+    # Approvals above what the score supports still need a human
+    if score.decision == "APPROVED" and application.loan_amount > score.max_loan_amount:
+        return "MANUAL_REVIEW"
+    return score.decision
+
+
+async def process_applications(application_ids: list[str]) -> None:
+    """Scoring queue handler: score PENDING applications and decide them"""
+    for application_id in application_ids:
+        application = applications.get(application_id)
+        if application is None or application.status != "PENDING":
+            continue
+        score = None
+        for attempt in range(SCORING_ATTEMPTS):
+            try:
+                score = await score_application(application)
+                break
+            except Exception:
+                if attempt + 1 < SCORING_ATTEMPTS:
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+        # Manual approve/reject may have happened while we were scoring
+        if application.status != "PENDING":
+            continue
+        if score is None:
+            set_status(application, "MANUAL_REVIEW")
+        else:
+            credit_scores[application_id] = score
+            set_status(application, decide(application, score))
+
+
+# Applications awaiting scoring. The worker count bounds concurrent calls to
+# credit-scoring; when the queue is full, creates are refused with 503.
+LOAN_SCORING_WORKERS = int(os.getenv("LOAN_SCORING_WORKERS", "8"))
+scoring_queue: BatchOutbox[str] = BatchOutbox(
+    process_applications,
+    max_size=int(os.getenv("LOAN_SCORING_QUEUE_SIZE", "1000")),
+    workers=LOAN_SCORING_WORKERS,
+    batch_size=1,
+)
+
+# Warm-up before /ready reports ready: one pooled connection to
+# credit-scoring per scoring worker. Optional, so a credit-scoring outage
+# does not keep this service out of rotation past READINESS_TIMEOUT_SECONDS
+# (applications are still accepted and queued meanwhile).
+readiness = Readiness(timeout_seconds=float(os.getenv("READINESS_TIMEOUT_SECONDS", "60")))
+
+
+@readiness.check("credit-scoring connections", required=False)
+async def warm_credit_scoring() -> None:
+    await warm_connections(http_client, CREDIT_SCORING_URL, LOAN_SCORING_WORKERS)
+
+# Upper bound on a single batch intake request
+MAX_BATCH_SIZE = 1000
+MAX_PAGE_SIZE = 1000
+
+# Pre-built serializer for list pages (skips FastAPI's response validation)
+APPLICATION_LIST = TypeAdapter(list[LoanApplication])
+
+track_store_size("applications", lambda: len(applications))
+track_store_size("scoring_queue", lambda: len(scoring_queue))
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -63,24 +214,76 @@ def health() -> HealthResponse:
     )
 
 
-@app.get("/ready", response_model=HealthResponse)
-def ready() -> HealthResponse:
-    return HealthResponse(
-        status="ok",
+@app.get("/ready", response_model=ReadinessResponse)
+async def ready(response: Response) -> ReadinessResponse:
+    """503 until every warm-up check has finished; lists each check's progress"""
+    status = readiness.status
+    if status != "ok":
+        response.status_code = 503
+    return ReadinessResponse(
+        status=status,
         service="loans-api",
         environment="local",
         time=utc_now(),
+        checks=readiness.report(),
     )
 
 
+def parse_cursor(cursor: str) -> OrderKey:
+    created_at, sep, application_id = cursor.partition("|")
+    try:
+        if not sep:
+            raise ValueError
+        return (datetime.fromisoformat(created_at), application_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
 @app.get("/api/v1/applications", response_model=list[LoanApplication])
-def list_applications(
+async def list_applications(
     x_applicant_id: Annotated[str | None, Header()] = None,
-) -> list[LoanApplication]:
-    apps = list(applications.values())
+    status: Annotated[list[Literal["PENDING", "APPROVED", "REJECTED", "MANUAL_REVIEW"]] | None, Query()] = None,
+    limit: Annotated[int | None, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: str | None = None,
+) -> Response:
+    """List applications oldest first.
+
+    `status` may repeat (e.g. a PENDING + MANUAL_REVIEW work queue). With
+    `limit`, returns one page and, if more remain, sets X-Next-Cursor to pass
+    back as `cursor`.
+    """
+    # Runs on the event loop, where store_application() and set_status()
+    # update the indexes, so the walk below never sees them shift
+    statuses = set(status or ())
     if x_applicant_id:
-        apps = [a for a in apps if a.applicant_id == x_applicant_id]
-    return apps
+        sources = [applications_by_applicant.get(x_applicant_id, [])]
+    elif statuses:
+        sources = [applications_by_status.get(s, []) for s in statuses]
+    else:
+        sources = [application_order]
+
+    after = parse_cursor(cursor) if cursor else None
+    starts = [
+        itertools.islice(keys, bisect.bisect_right(keys, after), None) if after else iter(keys)
+        for keys in sources
+    ]
+    page: list[LoanApplication] = []
+    has_more = False
+    for _, application_id in heapq.merge(*starts) if len(starts) > 1 else starts[0]:
+        application = applications[application_id]
+        if statuses and application.status not in statuses:
+            continue
+        if limit is not None and len(page) == limit:
+            has_more = True
+            break
+        page.append(application)
+
+    response = Response(content=APPLICATION_LIST.dump_json(page), media_type="application/json")
+    if has_more:
+        last = page[-1]
+        created_at = last.created_at.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        response.headers["X-Next-Cursor"] = f"{created_at}|{last.application_id}"
+    return response
 
 
 @app.get("/api/v1/applications/{application_id}", response_model=LoanApplicationResponse)
@@ -88,62 +291,162 @@ def get_application(application_id: str) -> LoanApplicationResponse:
     app = applications.get(application_id)
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
-    
-    credit_score = None
-    try:
-        # In real async context, you'd await this
-        import asyncio
-        credit_score = asyncio.run(get_credit_score(app.applicant_id))
-    except Exception:
-        pass
-    
-    return LoanApplicationResponse(application=app, credit_score=credit_score)
+    return LoanApplicationResponse(application=app, credit_score=credit_scores.get(application_id))
 
 
-@app.post("/api/v1/applications", response_model=LoanApplication)
-def create_application(app_data: dict) -> LoanApplication:
-    # Generate application ID if not provided
-    application_id = app_data.get("application_id", f"APP-{datetime.now().strftime('%Y%m%d%H%M%S')}")
-    
-    now = utc_now()
-    application = LoanApplication(
+# Base and suffix of the last generated application ID, so IDs generated
+# within the same second don't rescan every earlier one
+_id_base = ""
+_id_suffix = 1
+
+
+def next_application_id(taken: Container[str]) -> str:
+    """APP-<timestamp>, then APP-<timestamp>-2, -3, ... within the same second"""
+    global _id_base, _id_suffix
+    base = f"APP-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    if base != _id_base:
+        _id_base, _id_suffix = base, 1
+    while True:
+        candidate = base if _id_suffix == 1 else f"{base}-{_id_suffix}"
+        _id_suffix += 1
+        if owns(candidate) and candidate not in taken:
+            return candidate
+
+
+def new_application(req: CreateApplicationRequest, application_id: str, now: datetime) -> LoanApplication:
+    # The request is already validated; skip validating the same values again
+    return LoanApplication.model_construct(
+        **req.model_dump(exclude={"application_id"}),
         application_id=application_id,
-        applicant_id=app_data["applicant_id"],
-        loan_amount=app_data["loan_amount"],
-        loan_purpose=app_data["loan_purpose"],
-        term_months=app_data["term_months"],
-        income_annual=app_data["income_annual"],
-        debt_existing=app_data["debt_existing"],
-        employment_type=app_data["employment_type"],
-        credit_history_length_years=app_data["credit_history_length_years"],
-        num_credit_lines=app_data["num_credit_lines"],
-        recent_delinquencies=app_data["recent_delinquencies"],
         status="PENDING",
         created_at=now,
         updated_at=now,
     )
-    
-    applications[application_id] = application
+
+
+def scoring_queue_full() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Scoring queue is full, retry later",
+        headers={"Retry-After": "1"},
+    )
+
+
+# Creates sent with an Idempotency-Key, so a retried create returns the
+# original application instead of storing and scoring a duplicate
+idempotency: IdempotencyCache[LoanApplication] = IdempotencyCache(
+    max_size=int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "100000")),
+    ttl_seconds=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")),
+)
+track_store_size("idempotency_keys", lambda: len(idempotency))
+
+
+@app.post("/api/v1/applications", response_model=LoanApplication, status_code=202)
+async def create_application(
+    req: CreateApplicationRequest,
+    response: Response,
+    idempotency_key: Annotated[str | None, Header(min_length=1, max_length=MAX_KEY_LENGTH)] = None,
+) -> LoanApplication:
+    """Create an application and queue it for scoring.
+
+    With an Idempotency-Key, a repeat of the request (same key and body)
+    gets the original application, marked `Idempotent-Replayed: true`.
+    """
+    if idempotency_key is None:
+        application = await submit_application(req)
+    else:
+        try:
+            application, replayed = await idempotency.run(
+                idempotency_key, request_fingerprint(req), lambda: submit_application(req),
+            )
+        except IdempotencyKeyReused:
+            raise HTTPException(
+                status_code=422, detail="Idempotency-Key was already used with a different request",
+            ) from None
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
+    response.headers["Location"] = f"/api/v1/applications/{application.application_id}"
     return application
 
 
+async def submit_application(req: CreateApplicationRequest) -> LoanApplication:
+    if scoring_queue.full():
+        raise scoring_queue_full()
+
+    # Generate application ID if not provided
+    application_id = req.application_id
+    if application_id is None:
+        application_id = next_application_id(applications)
+
+    application = new_application(req, application_id, utc_now())
+    store_application(application)
+    scoring_queue.submit(application_id)
+    return application
+
+
+@app.post("/api/v1/applications:batch", response_model=BatchCreateApplicationsResponse, status_code=202)
+async def create_applications_batch(req: BatchCreateApplicationsRequest) -> BatchCreateApplicationsResponse:
+    """Create many applications at once.
+
+    Valid applications are stored and queued for scoring; invalid ones, and
+    any that no longer fit in the scoring queue, are reported in `errors`
+    by position.
+    """
+    if len(req.applications) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch size exceeds {MAX_BATCH_SIZE}")
+    if scoring_queue.full():
+        raise scoring_queue_full()
+
+    errors = []
+    valid: list[tuple[int, CreateApplicationRequest]] = []
+    seen: set[str] = set()
+    for index, item in enumerate(req.applications):
+        try:
+            create = CreateApplicationRequest.model_validate(item)
+        except ValidationError as e:
+            detail = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            errors.append(BatchItemError(index=index, detail=detail))
+            continue
+        if create.application_id is not None:
+            if create.application_id in seen or create.application_id in applications:
+                errors.append(BatchItemError(index=index, detail=f"Duplicate application_id {create.application_id}"))
+                continue
+            seen.add(create.application_id)
+        valid.append((index, create))
+
+    now = utc_now()
+    # Generated IDs must not collide with IDs supplied later in the batch
+    taken = ChainMap(applications, dict.fromkeys(seen))
+    created = []
+    for index, create in valid:
+        application_id = create.application_id or next_application_id(taken)
+        try:
+            scoring_queue.submit(application_id)
+        except OutboxFull:
+            errors.append(BatchItemError(index=index, detail="Scoring queue is full, retry later"))
+            continue
+        application = new_application(create, application_id, now)
+        store_application(application)
+        created.append(application)
+    errors.sort(key=lambda e: e.index)
+    return BatchCreateApplicationsResponse(created=created, errors=errors)
+
+
 @app.post("/api/v1/applications/{application_id}/approve", response_model=LoanApplication)
-def approve_application(application_id: str) -> LoanApplication:
+async def approve_application(application_id: str) -> LoanApplication:
     app = applications.get(application_id)
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
     
-    app.status = "APPROVED"
-    app.updated_at = utc_now()
+    set_status(app, "APPROVED")
     return app
 
 
 @app.post("/api/v1/applications/{application_id}/reject", response_model=LoanApplication)
-def reject_application(application_id: str) -> LoanApplication:
+async def reject_application(application_id: str) -> LoanApplication:
     app = applications.get(application_id)
     if not app:
         raise HTTPException(status_code=404, detail="Application not found")
     
-    app.status = "REJECTED"
-    app.updated_at = utc_now()
+    set_status(app, "REJECTED")
     return app
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Literal
+from typing import Any, Literal
 
+from banking_common.readiness import ReadinessCheck
 from pydantic import BaseModel, Field
 
 
@@ -13,6 +14,14 @@ class HealthResponse(BaseModel):
     time: datetime
 
 
+class ReadinessResponse(BaseModel):
+    status: Literal["ok", "warming", "failed"]
+    service: str
+    environment: str
+    time: datetime
+    checks: list[ReadinessCheck]
+
+
 class LoanApplication(BaseModel):
     application_id: str
     applicant_id: str
@@ -30,6 +39,35 @@ class LoanApplication(BaseModel):
     updated_at: datetime
 
 
+class CreateApplicationRequest(BaseModel):
+    application_id: str | None = None
+    applicant_id: str = Field(min_length=1)
+    loan_amount: float = Field(gt=0)
+    loan_purpose: Literal["HOME_LOAN", "AUTO_LOAN", "PERSONAL", "BUSINESS"]
+    term_months: int = Field(gt=0, le=480)
+    income_annual: float = Field(ge=0)
+    debt_existing: float = Field(ge=0)
+    employment_type: Literal["FULL_TIME", "PART_TIME", "SELF_EMPLOYED", "UNEMPLOYED"]
+    credit_history_length_years: int = Field(ge=0)
+    num_credit_lines: int = Field(ge=0)
+    recent_delinquencies: int = Field(ge=0)
+
+
+class BatchCreateApplicationsRequest(BaseModel):
+    # Validated item by item so one bad application doesn't reject the batch
+    applications: list[dict[str, Any]]
+
+
+class BatchItemError(BaseModel):
+    index: int
+    detail: str
+
+
+class BatchCreateApplicationsResponse(BaseModel):
+    created: list[LoanApplication]
+    errors: list[BatchItemError]
+
+
 class CreditScoreResponse(BaseModel):
     applicant_id: str
     score: int
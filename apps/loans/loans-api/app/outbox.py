@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class OutboxFull(Exception):
+    """Raised when the outbox is at capacity and cannot accept more work."""
+
+
+class BatchOutbox(Generic[T]):
+    """Bounded in-process queue drained in batches by a pool of workers.
+
+    `submit` never blocks: when the queue is full it raises OutboxFull so the
+    caller can push back on the client instead of buffering without limit.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list[T]], Awaitable[None]],
+        max_size: int,
+        workers: int,
+        batch_size: int,
+    ) -> None:
+        self.handler = handler
+        self.workers = workers
+        self.batch_size = batch_size
+        self._queue: asyncio.Queue[T] = asyncio.Queue(maxsize=max_size)
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def __len__(self) -> int:
+        return self._queue.qsize()
+
+    def full(self) -> bool:
+        return self._queue.full()
+
+    def submit(self, item: T) -> None:
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            raise OutboxFull from None
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self._tasks = []
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            try:
+                await self.handler(batch)
+            except Exception:
+                logger.exception("outbox batch of %d failed", len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
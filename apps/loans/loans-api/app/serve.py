@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from banking_common.sharding import BODY_KEY, FANOUT, KEY, SCATTER, Route, run
+
+# Applications are partitioned by application_id. Creates carrying their own
+# application_id go to its owner; others go to the owner of their
+# Idempotency-Key if they have one (it holds the cached outcome), else
+# round-robin, and the receiving worker allocates an ID it owns. Batches are
+# split the same way per item; max_items matches MAX_BATCH_SIZE in app/main.py.
+ROUTES = [
+    Route(
+        "POST", r"/api/v1/applications:batch", SCATTER,
+        body_key="applications", item_key="application_id", max_items=1000, error_key="errors",
+    ),
+    Route(
+        "GET", r"/api/v1/applications", FANOUT,
+        sort_key=("created_at", "application_id"), timestamp_keys=("created_at",),
+    ),
+    Route("POST", r"/api/v1/applications", BODY_KEY, body_key="application_id", header_key="idempotency-key"),
+    Route(None, r"/api/v1/applications/(?P<key>[^/]+)(/.*)?", KEY),
+]
+
+if __name__ == "__main__":
+    run(ROUTES, default_port=8083)
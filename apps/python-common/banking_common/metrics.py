@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+
+from fastapi import FastAPI
+from prometheus_client import Gauge, Histogram
+from prometheus_fastapi_instrumentator import Instrumentator
+
+# Prometheus instrumentation for the Python services.
+#
+# HTTP request metrics (http_request_duration_seconds, http_requests_total)
+# come from prometheus_fastapi_instrumentator and feed the Argo Rollouts
+# analysis templates. The histograms below cover hot-path internals. Labels
+# are a small fixed set; bind children once at import time with `.labels()`
+# so the request path only pays for an observe().
+#
+# In multi-worker mode (app/serve.py sets PROMETHEUS_MULTIPROC_DIR) metrics
+# are kept in shared files and summed across workers on scrape. Gauges
+# evaluated at scrape time (set_function) are not supported there, so gauges
+# fed by a function are instead written every GAUGE_REFRESH_SECONDS by a
+# thread in each worker; see gauge_function().
+MULTIPROCESS = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+GAUGE_REFRESH_SECONDS = 1.0
+
+# 0.5ms .. 10s: in-process work sits at the low end, cross-service hops higher
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+DOWNSTREAM_LATENCY = Histogram(
+    "downstream_request_duration_seconds",
+    "Latency of calls to other services",
+    ["target", "operation"],
+    buckets=LATENCY_BUCKETS,
+)
+SCORING_LATENCY = Histogram(
+    "scoring_duration_seconds",
+    "Time spent in scoring and decision logic",
+    ["model"],
+    buckets=LATENCY_BUCKETS,
+)
+SERIALIZATION_LATENCY = Histogram(
+    "serialization_duration_seconds",
+    "Time spent encoding payloads outside of FastAPI's response handling",
+    ["payload"],
+    buckets=LATENCY_BUCKETS,
+)
+STORE_SIZE = Gauge(
+    "store_size",
+    "Number of entries held in an in-memory store",
+    ["store"],
+    multiprocess_mode="livesum",
+)
+
+
+def instrument(app: FastAPI, excluded_handlers: Sequence[str] = ()) -> None:
+    """Record request histograms and expose /metrics.
+
+    Long-lived handlers (long-polls, event streams) belong in
+    `excluded_handlers`; their durations would swamp the p95 latency gate.
+    """
+    Instrumentator(
+        excluded_handlers=["/metrics", *excluded_handlers],
+    ).instrument(app).expose(app, include_in_schema=False)
+
+
+# (gauge child, function) pairs written by the refresh thread in multi-worker mode
+_gauge_functions: list[tuple[Gauge, Callable[[], float]]] = []
+_refresh_thread: threading.Thread | None = None
+_refresh_lock = threading.Lock()
+
+
+def gauge_function(gauge: Gauge, value: Callable[[], float]) -> None:
+    """Report `value()` on a bound gauge child.
+
+    Evaluated at scrape time in a single process; in multi-worker mode,
+    written every GAUGE_REFRESH_SECONDS, so it may lag by that much.
+    """
+    global _refresh_thread
+    if not MULTIPROCESS:
+        gauge.set_function(value)
+        return
+    with _refresh_lock:
+        _gauge_functions.append((gauge, value))
+        if _refresh_thread is None:
+            _refresh_thread = threading.Thread(target=_refresh_gauges, name="gauge-refresh", daemon=True)
+            _refresh_thread.start()
+
+
+def _refresh_gauges() -> None:
+    while True:
+        with _refresh_lock:
+            pairs = list(_gauge_functions)
+        for gauge, value in pairs:
+            try:
+                gauge.set(value())
+            except Exception:
+                # A store mid-update; the next round catches up
+                pass
+        time.sleep(GAUGE_REFRESH_SECONDS)
+
+
+def track_store_size(store: str, size: Callable[[], int]) -> None:
+    """Report `size()` as store_size{store=...}; summed across workers in multi-worker mode"""
+    gauge_function(STORE_SIZE.labels(store=store), size)
+
+
+@contextmanager
+def timed(histogram: Histogram) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start)
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import asyncio
+import cProfile
+import io
+import os
+import pstats
+import random
+import time
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from functools import wraps
+from typing import Annotated, Any
+
+from fastapi import FastAPI, Query
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Opt-in slow-request sampling for the Python services.
+#
+# When neither sampling nor a slow threshold is configured, nothing is
+# installed: no middleware, no /debug/slow-requests route, and `span()`
+# costs one ContextVar lookup.
+#
+#   PROFILING_SAMPLE_RATE       fraction of requests to record (0.0 - 1.0)
+#   SLOW_REQUEST_THRESHOLD_MS   always record requests slower than this (0 = off)
+#   PROFILING_CPROFILE          "true" to attach a cProfile summary to sampled requests
+#   SLOW_REQUEST_BUFFER         number of recorded requests kept (default 200)
+
+SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+SLOW_THRESHOLD_MS = float(os.getenv("SLOW_REQUEST_THRESHOLD_MS", "0"))
+CPROFILE_ENABLED = os.getenv("PROFILING_CPROFILE", "false").lower() == "true"
+BUFFER_SIZE = int(os.getenv("SLOW_REQUEST_BUFFER", "200"))
+
+DEFAULT_EXCLUDED_PATHS = ("/metrics", "/debug/slow-requests")
+
+
+class Trace:
+    __slots__ = ("route", "call_start", "call_end", "route_end", "downstream")
+
+    def __init__(self) -> None:
+        self.route: str | None = None
+        self.call_start = 0.0
+        self.call_end = 0.0
+        self.route_end = 0.0
+        self.downstream: list[tuple[str, float]] = []
+
+
+_current: ContextVar[Trace | None] = ContextVar("profiling_trace", default=None)
+recorded: deque[dict[str, Any]] = deque(maxlen=BUFFER_SIZE)
+_profiler_active = False
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Record a downstream call in the current request's trace, if any"""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.downstream.append((name, time.perf_counter() - start))
+
+
+class ProfiledRoute(APIRoute):
+    """Marks where FastAPI hands over to the endpoint and back.
+
+    Before the endpoint runs is request parsing and validation; after it
+    returns is response validation and serialization.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any) -> None:
+        super().__init__(path, endpoint, **kwargs)
+        self.dependant.call = _wrap_endpoint(self.dependant.call)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        path = self.path
+
+        async def profiled_handler(request):
+            trace = _current.get()
+            if trace is None:
+                return await handler(request)
+            trace.route = path
+            try:
+                return await handler(request)
+            finally:
+                trace.route_end = time.perf_counter()
+
+        return profiled_handler
+
+
+def _wrap_endpoint(call: Callable[..., Any]) -> Callable[..., Any]:
+    # FastAPI picks await vs threadpool from the callable, so keep its kind
+    if asyncio.iscoroutinefunction(call):
+        @wraps(call)
+        async def async_endpoint(*args, **kwargs):
+            trace = _current.get()
+            if trace is None:
+                return await call(*args, **kwargs)
+            trace.call_start = time.perf_counter()
+            try:
+                return await call(*args, **kwargs)
+            finally:
+                trace.call_end = time.perf_counter()
+
+        return async_endpoint
+
+    @wraps(call)
+    def sync_endpoint(*args, **kwargs):
+        trace = _current.get()
+        if trace is None:
+            return call(*args, **kwargs)
+        trace.call_start = time.perf_counter()
+        try:
+            return call(*args, **kwargs)
+        finally:
+            trace.call_end = time.perf_counter()
+
+    return sync_endpoint
+
+
+class SlowRequestMiddleware:
+    def __init__(self, app: ASGIApp, excluded_paths: frozenset[str] = frozenset()) -> None:
+        self.app = app
+        self.excluded_paths = excluded_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.excluded_paths:
+            await self.app(scope, receive, send)
+            return
+
+        global _profiler_active
+        sampled = SAMPLE_RATE > 0 and random.random() < SAMPLE_RATE
+        if not sampled and SLOW_THRESHOLD_MS <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace()
+        token = _current.set(trace)
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        # cProfile sees the whole event loop, so concurrent requests show up
+        # too; only one profile runs at a time.
+        profiler = None
+        if sampled and CPROFILE_ENABLED and not _profiler_active:
+            profiler = cProfile.Profile()
+            _profiler_active = True
+            profiler.enable()
+
+        started_at = datetime.now(tz=UTC)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end = time.perf_counter()
+            if profiler is not None:
+                profiler.disable()
+                _profiler_active = False
+            _current.reset(token)
+
+            duration_ms = (end - start) * 1000
+            slow = SLOW_THRESHOLD_MS > 0 and duration_ms >= SLOW_THRESHOLD_MS
+            if sampled or slow:
+                recorded.append(_record(scope, status, started_at, start, end, trace, slow, profiler))
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def _record(
+    scope: Scope,
+    status: int,
+    started_at: datetime,
+    start: float,
+    end: float,
+    trace: Trace,
+    slow: bool,
+    profiler: cProfile.Profile | None,
+) -> dict[str, Any]:
+    spans: dict[str, Any] = {}
+    if trace.call_start:
+        spans["validation_ms"] = _ms(trace.call_start - start)
+        spans["handler_ms"] = _ms(trace.call_end - trace.call_start)
+        spans["serialization_ms"] = _ms(trace.route_end - trace.call_end)
+    spans["downstream"] = [{"name": name, "ms": _ms(secs)} for name, secs in trace.downstream]
+
+    profile = None
+    if profiler is not None:
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(25)
+        profile = out.getvalue()
+
+    return {
+        "method": scope["method"],
+        "path": scope["path"],
+        "route": trace.route,
+        "status": status,
+        "reason": "slow" if slow else "sampled",
+        "started_at": started_at.isoformat(),
+        "duration_ms": _ms(end - start),
+        "spans": spans,
+        "profile": profile,
+    }
+
+
+def install_profiling(app: FastAPI, excluded_paths: Sequence[str] = ()) -> None:
+    """If sampling or a slow threshold is set, record requests and expose them.
+
+    Must be called before routes are declared so they use ProfiledRoute.
+    Long-lived handlers (long-polls, event streams) belong in `excluded_paths`.
+    """
+    if SAMPLE_RATE <= 0 and SLOW_THRESHOLD_MS <= 0:
+        return
+
+    app.router.route_class = ProfiledRoute
+    app.add_middleware(
+        SlowRequestMiddleware,
+        excluded_paths=frozenset((*DEFAULT_EXCLUDED_PATHS, *excluded_paths)),
+    )
+
+    @app.get("/debug/slow-requests", include_in_schema=False)
+    def slow_requests(limit: Annotated[int, Query(ge=1, le=1000)] = 50) -> dict[str, Any]:
+        return {
+            "sample_rate": SAMPLE_RATE,
+            "slow_threshold_ms": SLOW_THRESHOLD_MS,
+            "requests": list(reversed(recorded))[:limit],
+        }
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Literal
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+WarmUp = Callable[[], Awaitable[None]]
+
+
+class ReadinessCheck(BaseModel):
+    name: str
+    status: Literal["pending", "running", "ok", "failed"]
+    required: bool
+    attempts: int
+    duration_ms: float | None = None
+    error: str | None = None
+
+
+class _Check:
+    __slots__ = ("name", "warm_up", "required", "status", "attempts", "error", "started", "finished")
+
+    def __init__(self, name: str, warm_up: WarmUp, required: bool) -> None:
+        self.name = name
+        self.warm_up = warm_up
+        self.required = required
+        self.status = "pending"
+        self.attempts = 0
+        self.error: str | None = None
+        self.started: float | None = None
+        self.finished: float | None = None
+
+
+class Readiness:
+    """Warm-up checks that must finish before /ready reports the service ready.
+
+    Checks are registered at import time and run concurrently once the
+    lifespan calls start(). A failing check is retried until it passes or
+    `timeout_seconds` have passed since start. A required check that gives up
+    keeps the service unready; an optional one (pre-opening connections to a
+    downstream that may itself be down) is reported as failed but no longer
+    holds readiness back.
+    """
+
+    def __init__(self, timeout_seconds: float, retry_seconds: float = 1.0) -> None:
+        self.timeout_seconds = timeout_seconds
+        self.retry_seconds = retry_seconds
+        self._checks: list[_Check] = []
+        self._task: asyncio.Task[None] | None = None
+
+    def register(self, name: str, warm_up: WarmUp, required: bool = True) -> None:
+        self._checks.append(_Check(name, warm_up, required))
+
+    def check(self, name: str, required: bool = True) -> Callable[[WarmUp], WarmUp]:
+        """Decorator form of register()"""
+
+        def decorator(warm_up: WarmUp) -> WarmUp:
+            self.register(name, warm_up, required)
+            return warm_up
+
+        return decorator
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    @property
+    def status(self) -> str:
+        """"ok" once every check has finished and the required ones passed"""
+        if self._task is None or any(c.status in ("pending", "running") for c in self._checks):
+            return "warming"
+        if any(c.required and c.status == "failed" for c in self._checks):
+            return "failed"
+        return "ok"
+
+    def report(self) -> list[ReadinessCheck]:
+        now = time.monotonic()
+        return [
+            ReadinessCheck(
+                name=c.name,
+                status=c.status,
+                required=c.required,
+                attempts=c.attempts,
+                duration_ms=None if c.started is None else round(((c.finished or now) - c.started) * 1000, 1),
+                error=c.error,
+            )
+            for c in self._checks
+        ]
+
+    async def _run(self) -> None:
+        deadline = time.monotonic() + self.timeout_seconds
+        await asyncio.gather(*(self._warm(c, deadline) for c in self._checks))
+
+    async def _warm(self, check: _Check, deadline: float) -> None:
+        check.status = "running"
+        check.started = time.monotonic()
+        while True:
+            check.attempts += 1
+            try:
+                await asyncio.wait_for(check.warm_up(), timeout=max(deadline - time.monotonic(), 0.001))
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                check.error = str(exc) or type(exc).__name__
+                if time.monotonic() + self.retry_seconds < deadline:
+                    await asyncio.sleep(self.retry_seconds)
+                    continue
+                check.status = "failed"
+                logger.warning("warm-up check %r gave up: %s", check.name, check.error)
+            else:
+                check.status = "ok"
+                check.error = None
+            check.finished = time.monotonic()
+            return
+
+
+async def warm_connections(client: httpx.AsyncClient, base_url: str, connections: int) -> None:
+    """Open `connections` keep-alive connections to a downstream in the client's pool.
+
+    Concurrent requests each need their own connection, so requesting the
+    downstream's /health that many times at once leaves that many pooled.
+    """
+    resps = await asyncio.gather(*(client.get(f"{base_url}/health") for _ in range(connections)))
+    for resp in resps:
+        resp.raise_for_status()
@@ -0,0 +1,548 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zlib
+from collections import deque
+from collections.abc import Container, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from urllib.parse import parse_qs, urlencode
+
+import httpx
+
+# Multi-worker serving with shared-nothing state partitioning, for services
+# that keep state in process-local dicts. Each such service has an
+# app/serve.py declaring how its routes map onto partitions.
+#
+# With --workers N > 1, `run()` starts N uvicorn processes of app.main:app on
+# unix sockets and serves a front router on the public port. Each worker owns
+# the keys that hash to its index; the router sends keyed requests to the
+# owner, fans list requests out to every worker and merges the results, and
+# spreads creates round-robin (the receiving worker allocates an ID it owns).
+
+WORKER_INDEX = int(os.getenv("WORKER_INDEX", "0"))
+WORKER_COUNT = int(os.getenv("WORKER_COUNT", "1"))
+
+
+def partition_of(key: str, count: int = WORKER_COUNT) -> int:
+    return zlib.crc32(key.encode()) % count
+
+
+def owns(key: str) -> bool:
+    """Whether this worker owns `key` (always true when running single-process)"""
+    return WORKER_COUNT == 1 or partition_of(key) == WORKER_INDEX
+
+
+class IdSequence:
+    """Allocates sequential IDs such as ACC-003, skipping those other workers own"""
+
+    def __init__(self, fmt: str) -> None:
+        self.fmt = fmt
+        self._next = 1
+
+    def next(self, taken: Container[str]) -> str:
+        while True:
+            candidate = self.fmt.format(self._next)
+            self._next += 1
+            if owns(candidate) and candidate not in taken:
+                return candidate
+
+    def skip_to(self, n: int) -> None:
+        """Allocate nothing numbered below `n`, e.g. IDs issued before a restart"""
+        self._next = max(self._next, n)
+
+
+def unique_id(base: str, taken: Container[str]) -> str:
+    """`base` if this worker owns it and it is free, else `base-2`, `base-3`, ..."""
+    candidate = base
+    for n in itertools.count(2):
+        if owns(candidate) and candidate not in taken:
+            return candidate
+        candidate = f"{base}-{n}"
+    raise AssertionError("unreachable")
+
+
+# Route kinds
+KEY = "key"            # path group `key` picks the owning worker
+BODY_KEY = "body_key"  # JSON body field picks the owner; round-robin if absent
+FANOUT = "fanout"      # every worker answers; JSON arrays are concatenated, or
+                       # merged by `sort_key` for keyset-paginated lists
+SCATTER = "scatter"    # the JSON body list `body_key` is split by owner and each
+                       # owner gets its share; list fields of the responses are
+                       # concatenated, with per-item "index" fields mapped back
+                       # to positions in the original list
+ALL = "all"            # every worker must succeed (health/readiness)
+STREAM = "stream"      # server-sent events merged from every worker
+FEED = "feed"          # long-poll change feed, re-sequenced by the router;
+                       # the pattern must be a literal path
+ANY = "any"            # round-robin
+# BODY_KEY and ANY routes with a `header_key` send requests carrying that
+# header to its value's owner when the body key doesn't decide, so e.g.
+# retries with the same Idempotency-Key reach the same worker.
+
+
+@dataclass(frozen=True)
+class Route:
+    method: str | None
+    pattern: str
+    kind: str
+    body_key: str | None = None
+    # SCATTER lists of objects: the field holding each item's key; items
+    # without one go to any worker
+    item_key: str | None = None
+    # SCATTER: the most items one request may carry. The router checks the
+    # whole list; each worker only sees its share.
+    max_items: int | None = None
+    # SCATTER routes that apply items one by one: the response list of
+    # {"index", "detail"} item errors. Once some shares have been applied, a
+    # share that fails is reported there item by item rather than failing the
+    # request, so a client retrying the failed items doesn't repeat the rest.
+    error_key: str | None = None
+    # FANOUT lists ordered by these fields take `limit`/`cursor` and answer
+    # with X-Next-Cursor; the router merges the workers' pages into one. The
+    # cursor is the last item's sort fields joined with "|".
+    sort_key: tuple[str, ...] | None = None
+    # sort_key fields holding ISO 8601 timestamps, compared as datetimes:
+    # serialized ones drop a zero fraction, which breaks string order
+    timestamp_keys: tuple[str, ...] = ()
+    # Lower-case request header that picks the owner (see above)
+    header_key: str | None = None
+
+    def match(self, method: str, path: str) -> re.Match[str] | None:
+        if self.method is not None and self.method != method:
+            return None
+        return re.fullmatch(self.pattern, path)
+
+
+COMMON_ROUTES = [
+    Route("GET", r"/health", ALL),
+    Route("GET", r"/ready", ALL),
+]
+
+_HOP_BY_HOP = {b"host", b"connection", b"content-length", b"transfer-encoding", b"keep-alive"}
+
+
+def _forward_headers(scope: dict, drop: Container[bytes] = ()) -> list[tuple[bytes, bytes]]:
+    return [(k, v) for k, v in scope["headers"] if k not in _HOP_BY_HOP and k not in drop]
+
+
+def _header(scope: dict, name: str) -> str | None:
+    raw = name.encode()
+    return next((v.decode("latin-1") for k, v in scope["headers"] if k == raw), None)
+
+
+def _target(scope: dict, query: bytes | None = None) -> str:
+    qs = scope["query_string"] if query is None else query
+    return scope["path"] + (f"?{qs.decode()}" if qs else "")
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _send_response(send, status: int, body: bytes, content_type: bytes = b"application/json",
+                         headers: Sequence[tuple[bytes, bytes]] = ()) -> None:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode()), *headers],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _forward(send, resp: httpx.Response) -> None:
+    headers = [
+        (k.encode(), v.encode()) for k, v in resp.headers.items()
+        if k.encode() not in (b"connection", b"transfer-encoding")
+    ]
+    await send({"type": "http.response.start", "status": resp.status_code, "headers": headers})
+    await send({"type": "http.response.body", "body": resp.content})
+
+
+def _error_detail(resp: httpx.Response | Exception) -> str:
+    if isinstance(resp, Exception):
+        return f"Worker unavailable: {type(resp).__name__}"
+    with contextlib.suppress(ValueError, AttributeError):
+        detail = resp.json().get("detail")
+        if isinstance(detail, str):
+            return detail
+    return f"Worker returned {resp.status_code}"
+
+
+class FeedMerger:
+    """Follows each worker's long-poll change feed and re-sequences it.
+
+    Serves the same {changes, next_seq, reset} shape as a single worker's
+    feed, so followers cannot tell how many workers sit behind the router.
+    """
+
+    def __init__(self, path: str, clients: Sequence[httpx.AsyncClient], size: int = 10000) -> None:
+        self.path = path
+        self.clients = clients
+        self._seq = 0
+        self._changes: deque[dict] = deque(maxlen=size)
+        self._event = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._follow(c)) for c in self.clients]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def _follow(self, client: httpx.AsyncClient) -> None:
+        since = 0
+        while True:
+            try:
+                resp = await client.get(self.path, params={"since": since, "timeout": 25})
+                resp.raise_for_status()
+                feed = resp.json()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                await asyncio.sleep(1.0)
+                continue
+            # A worker reset only replays what it still has; re-appending it
+            # is harmless because followers upsert by key.
+            for change in feed["changes"]:
+                self._seq += 1
+                self._changes.append({**change, "seq": self._seq})
+            since = feed["next_seq"]
+            if feed["changes"]:
+                event, self._event = self._event, asyncio.Event()
+                event.set()
+
+    async def read(self, since: int, timeout: float) -> dict:
+        if since == self._seq and timeout > 0:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._event.wait(), timeout)
+        oldest = self._changes[0]["seq"] if self._changes else self._seq + 1
+        if since > self._seq or since + 1 < oldest:
+            return {"changes": list(self._changes), "next_seq": self._seq, "reset": True}
+        return {
+            "changes": [c for c in self._changes if c["seq"] > since],
+            "next_seq": self._seq,
+            "reset": False,
+        }
+
+
+class PartitionRouter:
+    """ASGI front end that routes requests to the worker owning their key"""
+
+    def __init__(self, routes: Sequence[Route], sockets: Sequence[str]) -> None:
+        self.routes = [*COMMON_ROUTES, *routes]
+        self.clients = [
+            httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(uds=sock),
+                base_url="http://worker",
+                timeout=None,
+            )
+            for sock in sockets
+        ]
+        self.count = len(self.clients)
+        self._round_robin = itertools.cycle(range(self.count))
+        self.feeds = {
+            r.pattern: FeedMerger(r.pattern, self.clients) for r in self.routes if r.kind == FEED
+        }
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        method, path = scope["method"], scope["path"]
+        route, match = None, None
+        for candidate in self.routes:
+            match = candidate.match(method, path)
+            if match:
+                route = candidate
+                break
+        kind = route.kind if route else ANY
+        body = await _read_body(receive)
+
+        if kind == KEY:
+            await self._proxy(partition_of(match.group("key"), self.count), scope, body, send)
+        elif kind in (BODY_KEY, ANY):
+            key = None
+            if kind == BODY_KEY:
+                with contextlib.suppress(ValueError, AttributeError):
+                    key = json.loads(body or b"null").get(route.body_key)
+            if not isinstance(key, str) and route is not None and route.header_key:
+                key = _header(scope, route.header_key)
+            worker = partition_of(key, self.count) if isinstance(key, str) else next(self._round_robin)
+            await self._proxy(worker, scope, body, send)
+        elif kind == FANOUT:
+            await self._fanout(route, scope, body, send)
+        elif kind == SCATTER:
+            await self._scatter(route, scope, body, send)
+        elif kind == ALL:
+            await self._all(scope, body, send)
+        elif kind == STREAM:
+            await self._stream(scope, receive, send)
+        elif kind == FEED:
+            await self._feed(self.feeds[route.pattern], scope, send)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                for feed in self.feeds.values():
+                    feed.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for feed in self.feeds.values():
+                    await feed.stop()
+                for client in self.clients:
+                    await client.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _request(self, worker: int, scope: dict, body: bytes, query: bytes | None = None,
+                 drop: Container[bytes] = ()) -> httpx.Request:
+        return self.clients[worker].build_request(
+            scope["method"], _target(scope, query), headers=_forward_headers(scope, drop), content=body,
+        )
+
+    async def _proxy(self, worker: int, scope: dict, body: bytes, send) -> None:
+        resp = await self.clients[worker].send(self._request(worker, scope, body))
+        await _forward(send, resp)
+
+    async def _fanout(self, route: Route, scope: dict, body: bytes, send) -> None:
+        resps = await asyncio.gather(*(
+            self.clients[i].send(self._request(i, scope, body)) for i in range(self.count)
+        ))
+        failed = next((r for r in resps if r.status_code >= 400), None)
+        if failed is not None:
+            await _forward(send, failed)
+            return
+        merged = [item for r in resps for item in r.json()]
+        sort_key = route.sort_key
+        if sort_key is None:
+            await _send_response(send, 200, json.dumps(merged).encode())
+            return
+
+        # Each worker returned its first `limit` items after the cursor, so the
+        # first `limit` of the merge are the global page
+        merged.sort(key=lambda item: tuple(
+            datetime.fromisoformat(item[k]) if k in route.timestamp_keys else item[k] for k in sort_key
+        ))
+        headers = []
+        limit = parse_qs(scope["query_string"].decode()).get("limit")
+        if limit and limit[0].isdigit():
+            has_more = len(merged) > int(limit[0]) or any("x-next-cursor" in r.headers for r in resps)
+            merged = merged[:int(limit[0])]
+            if has_more and merged:
+                cursor = "|".join(str(merged[-1][k]) for k in sort_key)
+                headers.append((b"x-next-cursor", cursor.encode()))
+        await _send_response(send, 200, json.dumps(merged).encode(), headers=headers)
+
+    async def _scatter(self, route: Route, scope: dict, body: bytes, send) -> None:
+        # worker -> (items, their positions in the request)
+        shares: dict[int, tuple[list, list[int]]] = {}
+        try:
+            payload = json.loads(body)
+            for position, item in enumerate(payload[route.body_key]):
+                key = item.get(route.item_key) if route.item_key else item
+                worker = partition_of(key, self.count) if isinstance(key, str) else next(self._round_robin)
+                items, positions = shares.setdefault(worker, ([], []))
+                items.append(item)
+                positions.append(position)
+        except (ValueError, TypeError, KeyError, AttributeError):
+            # Let a worker produce the validation error
+            await self._proxy(next(self._round_robin), scope, body, send)
+            return
+        total = sum(len(positions) for _, positions in shares.values())
+        if route.max_items is not None and total > route.max_items:
+            detail = {"detail": f"Batch size exceeds {route.max_items}"}
+            await _send_response(send, 400, json.dumps(detail).encode())
+            return
+        if not shares:
+            shares[next(self._round_robin)] = ([], [])
+        workers = list(shares)
+        resps = await asyncio.gather(*(
+            self.clients[i].send(self._request(
+                i, scope, json.dumps({**payload, route.body_key: shares[i][0]}).encode(),
+            ))
+            for i in workers
+        ), return_exceptions=route.error_key is not None)
+        failed = [w for w, r in zip(workers, resps) if isinstance(r, Exception) or r.status_code >= 400]
+        if failed and (route.error_key is None or len(failed) == len(workers)):
+            # Nothing was applied (or the route has no per-item errors)
+            first = resps[workers.index(failed[0])]
+            if isinstance(first, Exception):
+                raise first
+            await _forward(send, first)
+            return
+        merged: dict = {}
+        for worker, resp in zip(workers, resps):
+            if worker in failed:
+                detail = _error_detail(resp)
+                merged.setdefault(route.error_key, []).extend(
+                    {"index": position, "detail": detail} for position in shares[worker][1]
+                )
+                continue
+            positions = shares[worker][1]
+            for field, value in resp.json().items():
+                if not isinstance(value, list):
+                    merged.setdefault(field, value)
+                    continue
+                for entry in value:
+                    if isinstance(entry, dict) and isinstance(entry.get("index"), int):
+                        entry["index"] = positions[entry["index"]]
+                merged.setdefault(field, []).extend(value)
+        for value in merged.values():
+            if isinstance(value, list) and value and all(isinstance(e, dict) and "index" in e for e in value):
+                value.sort(key=lambda e: e["index"])
+        status = next(r.status_code for w, r in zip(workers, resps) if w not in failed)
+        await _send_response(send, status, json.dumps(merged).encode())
+
+    async def _all(self, scope: dict, body: bytes, send) -> None:
+        resps = await asyncio.gather(*(
+            self.clients[i].send(self._request(i, scope, body)) for i in range(self.count)
+        ))
+        failed = next((r for r in resps if r.status_code >= 400), None)
+        await _forward(send, failed or resps[0])
+
+    async def _feed(self, feed: FeedMerger, scope: dict, send) -> None:
+        params = parse_qs(scope["query_string"].decode())
+        try:
+            since = int(params.get("since", ["0"])[0])
+            timeout = min(max(float(params.get("timeout", ["25"])[0]), 0.0), 60.0)
+        except ValueError:
+            await _send_response(send, 422, b'{"detail":"Invalid since or timeout"}')
+            return
+        result = await feed.read(since, timeout)
+        await _send_response(send, 200, json.dumps(result).encode())
+
+    async def _stream(self, scope: dict, receive, send) -> None:
+        # Sequence numbers are per worker, so resume parameters are dropped
+        # and event ids stripped; merged streams deliver live events only.
+        params = parse_qs(scope["query_string"].decode())
+        params.pop("since", None)
+        query = urlencode(params, doseq=True).encode()
+        queue: asyncio.Queue[bytes] = asyncio.Queue()
+
+        async def pump(worker: int) -> None:
+            req = self._request(worker, scope, b"", query=query, drop={b"last-event-id"})
+            resp = await self.clients[worker].send(req, stream=True)
+            try:
+                block: list[str] = []
+                async for line in resp.aiter_lines():
+                    if line:
+                        if not line.startswith("id:"):
+                            block.append(line)
+                        continue
+                    if block:
+                        await queue.put(("\n".join(block) + "\n\n").encode())
+                        block = []
+            finally:
+                await resp.aclose()
+
+        async def watch_disconnect() -> None:
+            while (await receive())["type"] != "http.disconnect":
+                pass
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/event-stream"), (b"cache-control", b"no-cache")],
+        })
+        pumps = [asyncio.create_task(pump(i)) for i in range(self.count)]
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            while not watcher.done() and not all(p.done() for p in pumps):
+                getter = asyncio.create_task(queue.get())
+                done, _ = await asyncio.wait({getter, watcher}, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    await send({"type": "http.response.body", "body": getter.result(), "more_body": True})
+                else:
+                    getter.cancel()
+            if not watcher.done():
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            for task in (*pumps, watcher):
+                task.cancel()
+
+
+def _wait_for_worker(sock: str, proc: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"worker on {sock} exited with {proc.returncode}")
+        if os.path.exists(sock):
+            with contextlib.suppress(httpx.HTTPError):
+                transport = httpx.HTTPTransport(uds=sock)
+                with httpx.Client(transport=transport, base_url="http://worker") as client:
+                    if client.get("/health").status_code == 200:
+                        return
+        time.sleep(0.1)
+    raise RuntimeError(f"worker on {sock} did not become healthy")
+
+
+def run(routes: Sequence[Route], default_port: int) -> None:
+    """Entry point for `python -m app.serve`"""
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=default_port)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_WORKERS", "1")))
+    args = parser.parse_args()
+
+    if args.workers <= 1:
+        uvicorn.run("app.main:app", host=args.host, port=args.port)
+        return
+
+    run_dir = tempfile.mkdtemp(prefix="workers-")
+    metrics_dir = os.path.join(run_dir, "metrics")
+    os.mkdir(metrics_dir)
+    sockets = [os.path.join(run_dir, f"worker-{i}.sock") for i in range(args.workers)]
+    procs = []
+    try:
+        for i, sock in enumerate(sockets):
+            env = {
+                **os.environ,
+                "WORKER_INDEX": str(i),
+                "WORKER_COUNT": str(args.workers),
+                # Workers write metrics to a shared directory and any of them
+                # can serve the aggregate on /metrics
+                "PROMETHEUS_MULTIPROC_DIR": metrics_dir,
+            }
+            procs.append(subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--uds", sock],
+                env=env,
+            ))
+        for sock, proc in zip(sockets, procs):
+            _wait_for_worker(sock, proc)
+        uvicorn.run(PartitionRouter(routes, sockets), host=args.host, port=args.port)
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        shutil.rmtree(run_dir, ignore_errors=True)
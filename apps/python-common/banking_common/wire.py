@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Collection
+from typing import Any
+
+import httpx
+import msgpack
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from starlette.routing import request_response
+
+logger = logging.getLogger(__name__)
+
+# msgpack alongside JSON for internal service-to-service calls, used by the
+# services on both ends of such a call.
+#
+# Server side, install_msgpack() lets chosen routes take a msgpack body
+# (Content-Type: application/msgpack) and return one (Accept:
+# application/msgpack). FastAPI still validates the decoded body against the
+# route's model, so only the parsing and encoding change; requests without
+# those headers get plain JSON as before.
+#
+# The app's other routes answer a msgpack body with 415, the one signal
+# WireClient takes to repeat a call in JSON.
+#
+# Client side, WireClient asks for msgpack replies and, once the server has
+# sent one, sends msgpack bodies too. Servers deployed before this module
+# ignore the Accept header, so they keep getting JSON.
+
+MSGPACK = "application/msgpack"
+ACCEPT = f"{MSGPACK}, application/json"
+
+
+class MsgpackResponse(Response):
+    media_type = MSGPACK
+
+    def render(self, content: Any) -> bytes:
+        return msgpack.packb(content)
+
+
+class MsgpackRequest(Request):
+    """A request whose msgpack body FastAPI reads as if it were parsed JSON"""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = msgpack.unpackb(await self.body())
+        return self._json
+
+
+def _msgpack_request(request: Request) -> MsgpackRequest:
+    # FastAPI parses the body with request.json() when there is no content type
+    headers = [(k, v) for k, v in request.scope["headers"] if k != b"content-type"]
+    return MsgpackRequest({**request.scope, "headers": headers}, request.receive)
+
+
+def _negotiated_handler(route: APIRoute) -> Callable:
+    json_handler = route.get_route_handler()
+    response_class = route.response_class
+    route.response_class = MsgpackResponse
+    try:
+        msgpack_handler = route.get_route_handler()
+    finally:
+        route.response_class = response_class
+
+    async def handler(request: Request) -> Response:
+        if request.headers.get("content-type", "").startswith(MSGPACK):
+            request = _msgpack_request(request)
+        if MSGPACK in request.headers.get("accept", ""):
+            return await msgpack_handler(request)
+        return await json_handler(request)
+
+    return handler
+
+
+def _json_only_handler(route: APIRoute) -> Callable:
+    json_handler = route.get_route_handler()
+
+    async def handler(request: Request) -> Response:
+        if request.headers.get("content-type", "").startswith(MSGPACK):
+            return JSONResponse({"detail": "msgpack bodies are not accepted here"}, status_code=415)
+        return await json_handler(request)
+
+    return handler
+
+
+def install_msgpack(app: FastAPI, paths: Collection[str]) -> None:
+    """Let the routes at `paths` take and return msgpack as well as JSON.
+
+    Must be called after the app's routes are declared; the others answer a
+    msgpack body with 415. Errors (4xx from validation or HTTPException) are
+    still JSON, and a msgpack body that does not decode is a 400.
+    """
+    for route in app.routes:
+        if isinstance(route, APIRoute):
+            handler = _negotiated_handler(route) if route.path in paths else _json_only_handler(route)
+            route.app = request_response(handler)
+
+
+def decode(resp: httpx.Response) -> Any:
+    """Body of a successful response in either format; raises on error statuses"""
+    resp.raise_for_status()
+    if resp.headers.get("content-type", "").startswith(MSGPACK):
+        return msgpack.unpackb(resp.content)
+    return resp.json()
+
+
+class WireClient:
+    """POSTs to one internal service, in msgpack once it has shown it speaks it.
+
+    The first call goes out as JSON asking for a msgpack reply; a msgpack
+    reply switches later calls to msgpack bodies. A msgpack body turned down
+    with 415 is repeated in JSON, and that reply decides again. Any other
+    error is raised as is, without a retry, and the next call goes back to
+    JSON to find out again; a server rolled back to a version without
+    msgpack (which answers msgpack with a 422 or 500) costs one failed call.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, enabled: bool = True) -> None:
+        self.client = client
+        self.enabled = enabled
+        self.send_msgpack = False
+
+    async def post(self, url: str, payload: Any) -> Any:
+        """Decoded response body; raises httpx errors like the client does"""
+        if not self.enabled:
+            return decode(await self.client.post(url, json=payload))
+        if self.send_msgpack:
+            resp = await self.client.post(
+                url, content=msgpack.packb(payload), headers={"content-type": MSGPACK, "accept": ACCEPT},
+            )
+            if resp.is_success:
+                return decode(resp)
+            if resp.status_code != 415:
+                self.send_msgpack = False
+                return decode(resp)
+        resp = await self.client.post(url, json=payload, headers={"accept": ACCEPT})
+        speaks_msgpack = resp.headers.get("content-type", "").startswith(MSGPACK)
+        if resp.is_success and speaks_msgpack != self.send_msgpack:
+            logger.info("%s %s msgpack", url, "speaks" if speaks_msgpack else "no longer speaks")
+            self.send_msgpack = speaks_msgpack
+        return decode(resp)
@@ -0,0 +1,111 @@
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException
+
+from banking_common.sharding import FANOUT, SCATTER, PartitionRouter, Route, partition_of
+
+pytestmark = pytest.mark.anyio
+
+BATCH = Route("POST", r"/batch", SCATTER, body_key="items", item_key="id", max_items=6, error_key="errors")
+LOOKUP = Route("POST", r"/lookup", SCATTER, body_key="ids")
+LISTING = Route("GET", r"/items", FANOUT, sort_key=("created_at", "id"), timestamp_keys=("created_at",))
+
+
+def build_worker(fail: bool = False, listing: list[dict] | None = None) -> FastAPI:
+    app = FastAPI()
+    app.state.applied = []
+
+    @app.get("/items")
+    def items(limit: int | None = None) -> list[dict]:
+        return (listing or [])[:limit]
+
+    @app.post("/batch", status_code=202)
+    def batch(body: dict) -> dict:
+        if fail:
+            raise HTTPException(status_code=503, detail="Queue is full")
+        created, errors = [], []
+        for index, item in enumerate(body["items"]):
+            if item.get("bad"):
+                errors.append({"index": index, "detail": "bad item"})
+            else:
+                app.state.applied.append(item["id"])
+                created.append(item)
+        return {"created": created, "errors": errors}
+
+    @app.post("/lookup")
+    def lookup(body: dict) -> dict:
+        if fail:
+            raise HTTPException(status_code=503, detail="Unavailable")
+        return {"found": body["ids"]}
+
+    return app
+
+
+def router_for(workers: list[FastAPI]) -> httpx.AsyncClient:
+    router = PartitionRouter([BATCH, LOOKUP, LISTING], [f"worker-{i}.sock" for i in range(len(workers))])
+    router.clients = [
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=w, raise_app_exceptions=False), base_url="http://worker")
+        for w in workers
+    ]
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=router), base_url="http://test")
+
+
+def ids_on(worker: int, n: int) -> list[str]:
+    return [key for key in (f"K-{i}" for i in range(100)) if partition_of(key, 2) == worker][:n]
+
+
+async def test_batch_size_applies_to_whole_batch():
+    workers = [build_worker(), build_worker()]
+    items = [{"id": key} for key in ids_on(0, 4) + ids_on(1, 3)]
+    async with router_for(workers) as client:
+        resp = await client.post("/batch", json={"items": items})
+    assert resp.status_code == 400
+    assert resp.json() == {"detail": "Batch size exceeds 6"}
+    assert workers[0].state.applied == workers[1].state.applied == []
+
+
+async def test_failed_share_is_reported_per_item():
+    workers = [build_worker(), build_worker(fail=True)]
+    ok, failing = ids_on(0, 2), ids_on(1, 2)
+    items = [{"id": ok[0]}, {"id": failing[0]}, {"id": ok[1], "bad": True}, {"id": failing[1]}]
+    async with router_for(workers) as client:
+        resp = await client.post("/batch", json={"items": items})
+    assert resp.status_code == 202
+    body = resp.json()
+    assert [item["id"] for item in body["created"]] == [ok[0]]
+    assert body["errors"] == [
+        {"index": 1, "detail": "Queue is full"},
+        {"index": 2, "detail": "bad item"},
+        {"index": 3, "detail": "Queue is full"},
+    ]
+    assert workers[0].state.applied == [ok[0]]
+
+
+async def test_failure_forwarded_when_nothing_applied():
+    workers = [build_worker(fail=True), build_worker(fail=True)]
+    items = [{"id": key} for key in ids_on(0, 1) + ids_on(1, 1)]
+    async with router_for(workers) as client:
+        resp = await client.post("/batch", json={"items": items})
+    assert resp.status_code == 503
+
+
+async def test_failure_forwarded_without_error_key():
+    workers = [build_worker(), build_worker(fail=True)]
+    async with router_for(workers) as client:
+        resp = await client.post("/lookup", json={"ids": ids_on(0, 1) + ids_on(1, 1)})
+    assert resp.status_code == 503
+
+
+async def test_fanout_orders_timestamps_by_time():
+    # Serialized datetimes drop a zero fraction: "...00Z" sorts after "...00.5Z" as text
+    workers = [
+        build_worker(listing=[{"id": "A", "created_at": "2026-01-01T00:00:00Z"}]),
+        build_worker(listing=[
+            {"id": "B", "created_at": "2026-01-01T00:00:00.500000Z"},
+            {"id": "C", "created_at": "2026-01-01T00:00:01Z"},
+        ]),
+    ]
+    async with router_for(workers) as client:
+        resp = await client.get("/items", params={"limit": 2})
+    assert [item["id"] for item in resp.json()] == ["A", "B"]
+    assert resp.headers["x-next-cursor"] == "2026-01-01T00:00:00.500000Z|B"
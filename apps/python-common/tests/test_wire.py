@@ -0,0 +1,137 @@
+import httpx
+import msgpack
+import pytest
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+from banking_common.wire import ACCEPT, MSGPACK, WireClient, install_msgpack
+
+pytestmark = pytest.mark.anyio
+
+
+class Echo(BaseModel):
+    value: int
+
+
+def build_app(speaks_msgpack: bool = True) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/echo")
+    def echo(body: Echo) -> Echo:
+        if body.value < 0:
+            raise HTTPException(status_code=409, detail="negative")
+        return body
+
+    @app.post("/json-only")
+    def json_only(body: Echo) -> Echo:
+        return body
+
+    if speaks_msgpack:
+        install_msgpack(app, ["/echo"])
+    return app
+
+
+def client_for(app: FastAPI, sent: list[str]) -> httpx.AsyncClient:
+    async def record(request: httpx.Request) -> None:
+        sent.append(request.headers.get("content-type", ""))
+
+    # Unhandled server errors come back as 500s, as they would over the network
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    return httpx.AsyncClient(transport=transport, base_url="http://test", event_hooks={"request": [record]})
+
+
+async def test_server_negotiates_per_request():
+    async with client_for(build_app(), []) as client:
+        resp = await client.post("/echo", json={"value": 1})
+        assert resp.headers["content-type"].startswith("application/json")
+
+        resp = await client.post("/echo", json={"value": 1}, headers={"accept": ACCEPT})
+        assert resp.headers["content-type"].startswith(MSGPACK)
+        assert msgpack.unpackb(resp.content) == {"value": 1}
+
+        resp = await client.post(
+            "/echo", content=msgpack.packb({"value": 2}), headers={"content-type": MSGPACK},
+        )
+        assert resp.json() == {"value": 2}
+
+
+async def test_server_errors_stay_json():
+    async with client_for(build_app(), []) as client:
+        headers = {"content-type": MSGPACK, "accept": ACCEPT}
+        resp = await client.post("/echo", content=msgpack.packb({"value": "x"}), headers=headers)
+        assert resp.status_code == 422
+        assert resp.headers["content-type"].startswith("application/json")
+
+        resp = await client.post("/echo", content=b"\xc1", headers=headers)
+        assert resp.status_code == 400
+
+
+async def test_server_turns_down_msgpack_on_json_only_routes():
+    async with client_for(build_app(), []) as client:
+        resp = await client.post(
+            "/json-only", content=msgpack.packb({"value": 1}), headers={"content-type": MSGPACK},
+        )
+        assert resp.status_code == 415
+
+
+async def test_client_switches_to_msgpack_after_msgpack_reply():
+    sent: list[str] = []
+    async with client_for(build_app(), sent) as client:
+        wire = WireClient(client)
+        assert await wire.post("/echo", {"value": 1}) == {"value": 1}
+        assert await wire.post("/echo", {"value": 2}) == {"value": 2}
+    assert sent == ["application/json", MSGPACK]
+
+
+async def test_client_stays_on_json_with_servers_without_msgpack():
+    sent: list[str] = []
+    async with client_for(build_app(speaks_msgpack=False), sent) as client:
+        wire = WireClient(client)
+        for value in range(3):
+            assert await wire.post("/echo", {"value": value}) == {"value": value}
+    assert sent == ["application/json"] * 3
+
+
+async def test_client_repeats_in_json_only_on_415():
+    sent: list[str] = []
+    async with client_for(build_app(), sent) as client:
+        wire = WireClient(client)
+        wire.send_msgpack = True
+        assert await wire.post("/json-only", {"value": 1}) == {"value": 1}
+        assert not wire.send_msgpack
+    assert sent == [MSGPACK, "application/json"]
+
+
+async def test_client_raises_other_errors_without_retrying():
+    sent: list[str] = []
+    async with client_for(build_app(), sent) as client:
+        wire = WireClient(client)
+        await wire.post("/echo", {"value": 1})
+        with pytest.raises(httpx.HTTPStatusError) as error:
+            await wire.post("/echo", {"value": -1})
+        assert error.value.response.status_code == 409
+        # The next call finds out again in JSON, then goes back to msgpack
+        await wire.post("/echo", {"value": 2})
+        await wire.post("/echo", {"value": 3})
+    assert sent == ["application/json", MSGPACK, "application/json", MSGPACK]
+
+
+async def test_client_recovers_from_rollback_to_server_without_msgpack():
+    sent: list[str] = []
+    async with client_for(build_app(speaks_msgpack=False), sent) as client:
+        wire = WireClient(client)
+        wire.send_msgpack = True
+        with pytest.raises(httpx.HTTPStatusError) as error:
+            await wire.post("/echo", {"value": 1})
+        assert error.value.response.status_code == 500
+        assert await wire.post("/echo", {"value": 2}) == {"value": 2}
+    assert sent == [MSGPACK, "application/json"]
+
+
+async def test_disabled_client_only_sends_json():
+    sent: list[str] = []
+    async with client_for(build_app(), sent) as client:
+        wire = WireClient(client, enabled=False)
+        await wire.post("/echo", {"value": 1})
+        await wire.post("/echo", {"value": 2})
+    assert sent == ["application/json"] * 2
@@ -1,21 +1,166 @@
 from __future__ import annotations
 
+import asyncio
+import bisect
+import itertools
+import os
+from collections import deque
+from collections.abc import Iterable
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
-from typing import Annotated
+from typing import Annotated, Literal
 
-from fastapi import FastAPI, Header, HTTPException
+from banking_common.metrics import instrument, track_store_size
+from banking_common.profiling import install_profiling
+from banking_common.readiness import Readiness
+from banking_common.sharding import WORKER_COUNT, WORKER_INDEX, IdSequence, owns
+from fastapi import FastAPI, Header, HTTPException, Query, Response
+from pydantic import TypeAdapter, ValidationError
 
-from .models import Account, CreateAccountRequest, HealthResponse
+from .models import (
+    Account,
+    AccountChange,
+    AccountChangeFeed,
+    BatchGetAccountsRequest,
+    BatchGetAccountsResponse,
+    BulkCreateAccountsRequest,
+    BulkCreateAccountsResponse,
+    BulkItemError,
+    CreateAccountRequest,
+    HealthResponse,
+    ReadinessResponse,
+)
+from .snapshot import AccountRecord, SnapshotPublisher
 
 
 def utc_now() -> datetime:
     return datetime.now(tz=UTC)
 
 
-app = FastAPI(title="Account Service", version="1.0.0")
+# Optional memory-mapped snapshot of account status and balance for
+# co-located readers (see app/snapshot.py). Off unless a path is configured.
+ACCOUNT_SNAPSHOT_PATH = os.getenv("ACCOUNT_SNAPSHOT_PATH", "")
+ACCOUNT_SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("ACCOUNT_SNAPSHOT_INTERVAL_SECONDS", "0.5"))
 
-# In-memory store for demo
+
+def snapshot_records() -> list[AccountRecord]:
+    return [
+        AccountRecord(a.account_id, a.status, a.balance, a.updated_at.timestamp())
+        for a in accounts.values()
+    ]
+
+
+snapshot: SnapshotPublisher | None = None
+if ACCOUNT_SNAPSHOT_PATH:
+    snapshot = SnapshotPublisher(
+        ACCOUNT_SNAPSHOT_PATH,
+        snapshot_records,
+        ACCOUNT_SNAPSHOT_INTERVAL_SECONDS,
+        partition=WORKER_INDEX,
+        partitions=WORKER_COUNT,
+    )
+
+# Warm-up before /ready reports ready. With a snapshot configured, readers
+# in the pod need the first one written before traffic arrives.
+readiness = Readiness(timeout_seconds=float(os.getenv("READINESS_TIMEOUT_SECONDS", "60")))
+if snapshot is not None:
+    readiness.register("account snapshot", snapshot.published.wait)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    if snapshot is not None:
+        snapshot.start()
+    readiness.start()
+    yield
+    await readiness.stop()
+    if snapshot is not None:
+        await snapshot.stop()
+
+
+app = FastAPI(title="Account Service", version="1.0.0", lifespan=lifespan)
+
+# Add Prometheus metrics instrumentation
+instrument(app, excluded_handlers=["/api/v1/accounts/changes"])
+install_profiling(app, excluded_paths=["/api/v1/accounts/changes"])
+
+# In-memory store for demo. In multi-worker mode (app/serve.py) each worker
+# holds only the accounts it owns.
 accounts: dict[str, Account] = {}
+account_ids = IdSequence("ACC-{:03d}")
+
+# Sorted account IDs, overall and per customer, for keyset pagination of
+# list_accounts. Accounts are never deleted and never change customer, so
+# inserting in store_account() is all the maintenance they need.
+account_order: list[str] = []
+customer_accounts: dict[str, list[str]] = {}
+
+# account_number -> account_id, so creates can refuse a number already in use
+# without a scan. In multi-worker mode creates are routed by account_number,
+# so the worker owning a number sees every create that uses it.
+accounts_by_number: dict[str, str] = {}
+
+
+def store_account(account: Account) -> None:
+    accounts[account.account_id] = account
+    bisect.insort(account_order, account.account_id)
+    bisect.insort(customer_accounts.setdefault(account.customer_id, []), account.account_id)
+    accounts_by_number[account.account_number] = account.account_id
+
+# Change feed of account status updates. transaction-service long-polls it to
+# keep its local account cache fresh instead of calling us per transaction.
+CHANGE_FEED_SIZE = int(os.getenv("ACCOUNT_CHANGE_FEED_SIZE", "10000"))
+change_feed: deque[AccountChange] = deque(maxlen=CHANGE_FEED_SIZE)
+change_seq = 0
+change_event = asyncio.Event()
+
+
+def publish_changes(changed: Iterable[Account]) -> None:
+    """Append account changes to the feed and wake up waiting followers once.
+
+    Must be called from the event loop (the mutating handlers are async).
+    """
+    global change_seq, change_event
+    for account in changed:
+        change_seq += 1
+        change_feed.append(
+            AccountChange(
+                seq=change_seq,
+                account_id=account.account_id,
+                status=account.status,
+                updated_at=account.updated_at,
+            )
+        )
+    event, change_event = change_event, asyncio.Event()
+    event.set()
+    if snapshot is not None:
+        snapshot.mark_dirty()
+
+
+def publish_change(account: Account) -> None:
+    publish_changes([account])
+
+
+def read_changes(since: int) -> AccountChangeFeed:
+    oldest = change_feed[0].seq if change_feed else change_seq + 1
+    if since > change_seq or since + 1 < oldest:
+        # Follower is ahead of us (we restarted) or fell behind the retained
+        # window; hand back everything we still have and ask it to resync.
+        return AccountChangeFeed(changes=list(change_feed), next_seq=change_seq, reset=True)
+    changes = [c for c in change_feed if c.seq > since]
+    return AccountChangeFeed(changes=changes, next_seq=change_seq)
+
+
+# Upper bounds on a single bulk request
+MAX_BULK_CREATE_SIZE = 1000
+MAX_BATCH_GET_SIZE = 5000
+MAX_PAGE_SIZE = 1000
+
+# Pre-built serializer for list pages (skips FastAPI's response validation)
+ACCOUNT_LIST = TypeAdapter(list[Account])
+
+track_store_size("accounts", lambda: len(accounts))
+track_store_size("account_change_feed", lambda: len(change_feed))
 
 # Initialize with mock data
 mock_accounts = [
@@ -38,10 +183,16 @@ mock_accounts = [
 ]
 
 for acc in mock_accounts:
-    accounts[acc["account_id"]] = Account(
-        **acc,
-        created_at=utc_now(),
-        updated_at=utc_now(),
+    if owns(acc["account_number"]):
+        accounts_by_number[acc["account_number"]] = acc["account_id"]
+    if not owns(acc["account_id"]):
+        continue
+    store_account(
+        Account(
+            **acc,
+            created_at=utc_now(),
+            updated_at=utc_now(),
+        )
     )
 
 
@@ -55,24 +206,140 @@ def health() -> HealthResponse:
     )
 
 
-@app.get("/ready", response_model=HealthResponse)
-def ready() -> HealthResponse:
-    return HealthResponse(
-        status="ok",
+@app.get("/ready", response_model=ReadinessResponse)
+async def ready(response: Response) -> ReadinessResponse:
+    """503 until every warm-up check has finished; lists each check's progress"""
+    status = readiness.status
+    if status != "ok":
+        response.status_code = 503
+    return ReadinessResponse(
+        status=status,
         service="account-service",
         environment="local",
         time=utc_now(),
+        checks=readiness.report(),
     )
 
 
 @app.get("/api/v1/accounts", response_model=list[Account])
-def list_accounts(
+async def list_accounts(
     x_customer_id: Annotated[str | None, Header()] = None,
-) -> list[Account]:
-    accs = list(accounts.values())
-    if x_customer_id:
-        accs = [a for a in accs if a.customer_id == x_customer_id]
-    return accs
+    status: Literal["ACTIVE", "SUSPENDED", "CLOSED"] | None = None,
+    limit: Annotated[int | None, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+    cursor: str | None = None,
+    fields: str | None = None,
+) -> Response:
+    """List accounts ordered by account_id.
+
+    With `limit`, returns one page and, if more remain, sets X-Next-Cursor
+    to pass back as `cursor`. `fields` is a comma-separated subset of
+    Account fields; account_id is always included.
+    """
+    include = None
+    if fields:
+        include = {f.strip() for f in fields.split(",") if f.strip()} | {"account_id"}
+        unknown = include - Account.model_fields.keys()
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    # Runs on the event loop, where creates insert into the indexes, so the
+    # walk below never sees them shift
+    ids = customer_accounts.get(x_customer_id, []) if x_customer_id else account_order
+    start = bisect.bisect_right(ids, cursor) if cursor else 0
+    page: list[Account] = []
+    has_more = False
+    for account_id in itertools.islice(ids, start, None):
+        account = accounts[account_id]
+        if status and account.status != status:
+            continue
+        if limit is not None and len(page) == limit:
+            has_more = True
+            break
+        page.append(account)
+
+    content = ACCOUNT_LIST.dump_json(page, include={"__all__": include} if include else None)
+    response = Response(content=content, media_type="application/json")
+    if has_more:
+        response.headers["X-Next-Cursor"] = page[-1].account_id
+    return response
+
+
+@app.post("/api/v1/accounts:batchGet", response_model=BatchGetAccountsResponse)
+def batch_get_accounts(req: BatchGetAccountsRequest) -> BatchGetAccountsResponse:
+    """Fetch many accounts at once; unknown IDs are listed in `not_found`"""
+    if len(req.account_ids) > MAX_BATCH_GET_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch size exceeds {MAX_BATCH_GET_SIZE}")
+    found = []
+    not_found = []
+    for account_id in dict.fromkeys(req.account_ids):
+        account = accounts.get(account_id)
+        if account:
+            found.append(account)
+        else:
+            not_found.append(account_id)
+    return BatchGetAccountsResponse(accounts=found, not_found=not_found)
+
+
+@app.post("/api/v1/accounts:bulkCreate", response_model=BulkCreateAccountsResponse)
+async def bulk_create_accounts(req: BulkCreateAccountsRequest) -> BulkCreateAccountsResponse:
+    """Create many accounts at once.
+
+    Every item is validated before anything is stored; invalid items are
+    reported in `errors` by position and the valid ones are created together.
+    """
+    if len(req.accounts) > MAX_BULK_CREATE_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch size exceeds {MAX_BULK_CREATE_SIZE}")
+
+    errors = []
+    valid: list[CreateAccountRequest] = []
+    # account_number must not repeat within the batch or clash with a stored
+    # account, so re-running an interrupted migration doesn't duplicate it
+    batch_numbers: set[str] = set()
+    for index, item in enumerate(req.accounts):
+        try:
+            create = CreateAccountRequest.model_validate(item)
+        except ValidationError as e:
+            detail = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            errors.append(BulkItemError(index=index, detail=detail))
+            continue
+        if create.account_number in accounts_by_number or create.account_number in batch_numbers:
+            errors.append(BulkItemError(index=index, detail=f"Duplicate account_number {create.account_number}"))
+            continue
+        batch_numbers.add(create.account_number)
+        valid.append(create)
+
+    now = utc_now()
+    created = []
+    for create in valid:
+        account_id = account_ids.next(accounts)
+        account = Account(
+            account_id=account_id,
+            customer_id=create.customer_id,
+            account_number=create.account_number,
+            balance=create.initial_balance,
+            currency=create.currency,
+            status="ACTIVE",
+            created_at=now,
+            updated_at=now,
+        )
+        store_account(account)
+        created.append(account)
+    publish_changes(created)
+    return BulkCreateAccountsResponse(created=created, errors=errors)
+
+
+@app.get("/api/v1/accounts/changes", response_model=AccountChangeFeed)
+async def account_changes(
+    since: int = 0,
+    timeout: Annotated[float, Query(ge=0, le=60)] = 25.0,
+) -> AccountChangeFeed:
+    """Long-poll for account changes after `since`"""
+    if since == change_seq and timeout > 0:
+        try:
+            await asyncio.wait_for(change_event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+    return read_changes(since)
 
 
 @app.get("/api/v1/accounts/{account_id}", response_model=Account)
@@ -84,8 +351,10 @@ def get_account(account_id: str) -> Account:
 
 
 @app.post("/api/v1/accounts", response_model=Account)
-def create_account(req: CreateAccountRequest) -> Account:
-    account_id = f"ACC-{len(accounts) + 1:03d}"
+async def create_account(req: CreateAccountRequest) -> Account:
+    if req.account_number in accounts_by_number:
+        raise HTTPException(status_code=409, detail=f"Duplicate account_number {req.account_number}")
+    account_id = account_ids.next(accounts)
     now = utc_now()
     account = Account(
         account_id=account_id,
@@ -97,27 +366,30 @@ def create_account(req: CreateAccountRequest) -> Account:
         created_at=now,
         updated_at=now,
     )
-    accounts[account_id] = account
+    store_account(account)
+    publish_change(account)
     return account
 
 
 @app.put("/api/v1/accounts/{account_id}/suspend", response_model=Account)
-def suspend_account(account_id: str) -> Account:
+async def suspend_account(account_id: str) -> Account:
     account = accounts.get(account_id)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     
     account.status = "SUSPENDED"
     account.updated_at = utc_now()
+    publish_change(account)
     return account
 
 
 @app.put("/api/v1/accounts/{account_id}/activate", response_model=Account)
-def activate_account(account_id: str) -> Account:
+async def activate_account(account_id: str) -> Account:
     account = accounts.get(account_id)
     if not account:
         raise HTTPException(status_code=404, detail="Account not found")
     
     account.status = "ACTIVE"
     account.updated_at = utc_now()
+    publish_change(account)
     return account
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Literal
+from typing import Any, Literal
 
+from banking_common.readiness import ReadinessCheck
 from pydantic import BaseModel, Field
 
 
@@ -13,6 +14,14 @@ class HealthResponse(BaseModel):
     time: datetime
 
 
+class ReadinessResponse(BaseModel):
+    status: Literal["ok", "warming", "failed"]
+    service: str
+    environment: str
+    time: datetime
+    checks: list[ReadinessCheck]
+
+
 class Account(BaseModel):
     account_id: str
     customer_id: str
@@ -29,3 +38,42 @@ class CreateAccountRequest(BaseModel):
     account_number: str
     initial_balance: float = 0.0
     currency: str = "USD"
+
+
+class BulkCreateAccountsRequest(BaseModel):
+    # Validated item by item so one bad row doesn't reject the whole batch
+    accounts: list[dict[str, Any]]
+
+
+class BulkItemError(BaseModel):
+    index: int
+    detail: str
+
+
+class BulkCreateAccountsResponse(BaseModel):
+    created: list[Account]
+    errors: list[BulkItemError]
+
+
+class BatchGetAccountsRequest(BaseModel):
+    account_ids: list[str]
+
+
+class BatchGetAccountsResponse(BaseModel):
+    accounts: list[Account]
+    not_found: list[str]
+
+
+class AccountChange(BaseModel):
+    seq: int
+    account_id: str
+    status: Literal["ACTIVE", "SUSPENDED", "CLOSED"]
+    updated_at: datetime
+
+
+class AccountChangeFeed(BaseModel):
+    changes: list[AccountChange]
+    next_seq: int
+    # True when the requested seq fell out of the retained window; followers
+    # must drop anything they cached and start over from next_seq.
+    reset: bool = False
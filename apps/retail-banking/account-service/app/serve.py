@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from banking_common.sharding import BODY_KEY, FANOUT, FEED, KEY, SCATTER, Route, run
+
+# Accounts are partitioned by account_id. Creates go to the owner of their
+# account_number, which checks that the number is unused, and the receiving
+# worker allocates an ID it owns; bulk creates are split the same way per
+# item. max_items match MAX_BATCH_GET_SIZE and MAX_BULK_CREATE_SIZE in
+# app/main.py.
+ROUTES = [
+    Route("POST", r"/api/v1/accounts:batchGet", SCATTER, body_key="account_ids", max_items=5000),
+    Route(
+        "POST", r"/api/v1/accounts:bulkCreate", SCATTER,
+        body_key="accounts", item_key="account_number", max_items=1000, error_key="errors",
+    ),
+    Route("GET", r"/api/v1/accounts/changes", FEED),
+    Route("GET", r"/api/v1/accounts", FANOUT, sort_key=("account_id",)),
+    Route("POST", r"/api/v1/accounts", BODY_KEY, body_key="account_number"),
+    Route(None, r"/api/v1/accounts/(?P<key>[^/]+)(/.*)?", KEY),
+]
+
+if __name__ == "__main__":
+    run(ROUTES, default_port=8091)
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import glob
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+from collections.abc import Callable, Iterable
+from typing import NamedTuple
+
+from banking_common.sharding import partition_of
+
+logger = logging.getLogger(__name__)
+
+# Memory-mapped snapshot of account status and balance for readers in the
+# same pod (co-located worker processes, a sidecar sharing an emptyDir).
+# Lookups read straight out of the page cache: no HTTP call, no JSON.
+#
+# File layout, little-endian:
+#
+#   header   magic "ACSN", format, record size, snapshot version,
+#            published_at (unix seconds), record count, partition, partitions
+#   records  fixed width, sorted by account_id:
+#            account_id (NUL padded), status code, balance, updated_at
+#
+# A snapshot file is never modified once written. The writer builds the next
+# version in a temp file and os.replace()s it over the old one; readers that
+# still have the old file mapped keep a consistent view until they remap.
+# In multi-worker mode each worker publishes its own partition to
+# `<path>.<index>` and readers pick the file with partition_of().
+
+MAGIC = b"ACSN"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHQdIHH")
+RECORD = struct.Struct("<24sB7xdd")
+ID_WIDTH = 24
+
+STATUS_CODES = {"ACTIVE": 1, "SUSPENDED": 2, "CLOSED": 3}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+
+class AccountRecord(NamedTuple):
+    account_id: str
+    status: str
+    balance: float
+    updated_at: float
+
+
+def snapshot_path(base: str, partition: int, partitions: int) -> str:
+    return base if partitions == 1 else f"{base}.{partition}"
+
+
+def encode_snapshot(
+    records: Iterable[AccountRecord],
+    version: int,
+    partition: int = 0,
+    partitions: int = 1,
+) -> bytes:
+    """Pack records into the snapshot format; IDs wider than ID_WIDTH are left out"""
+    rows = sorted(
+        (r.account_id.encode(), r) for r in records if len(r.account_id.encode()) <= ID_WIDTH
+    )
+    buf = bytearray(HEADER.size + RECORD.size * len(rows))
+    HEADER.pack_into(
+        buf, 0, MAGIC, FORMAT_VERSION, RECORD.size, version, time.time(), len(rows), partition, partitions,
+    )
+    offset = HEADER.size
+    for key, r in rows:
+        RECORD.pack_into(buf, offset, key, STATUS_CODES[r.status], r.balance, r.updated_at)
+        offset += RECORD.size
+    return bytes(buf)
+
+
+def write_snapshot(path: str, data: bytes) -> None:
+    # The temp file must sit next to the target for the rename to be atomic
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class SnapshotPublisher:
+    """Republishes the snapshot after account changes, at most once per interval.
+
+    `collect` runs on the event loop and must return plain records (it is the
+    only place the live store is read); packing and writing happen in a thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        collect: Callable[[], list[AccountRecord]],
+        interval_seconds: float,
+        partition: int = 0,
+        partitions: int = 1,
+    ) -> None:
+        self.path = snapshot_path(path, partition, partitions)
+        self.collect = collect
+        self.interval_seconds = interval_seconds
+        self.partition = partition
+        self.partitions = partitions
+        self.version = _existing_version(self.path)
+        self._dirty = asyncio.Event()
+        # Set once the first snapshot of this run has been written
+        self.published = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    def mark_dirty(self) -> None:
+        self._dirty.set()
+
+    async def publish(self) -> None:
+        self._dirty.clear()
+        records = self.collect()
+        self.version += 1
+        data = encode_snapshot(records, self.version, self.partition, self.partitions)
+        await asyncio.to_thread(write_snapshot, self.path, data)
+        self.published.set()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        # The first snapshot goes out straight away; a failed attempt is
+        # retried like any other, an interval later
+        delay = 0.0
+        self._dirty.set()
+        while True:
+            await self._dirty.wait()
+            # Coalesce bursts of changes into one rewrite
+            await asyncio.sleep(delay)
+            delay = self.interval_seconds
+            try:
+                await self.publish()
+            except OSError as e:
+                logger.warning("account snapshot publish failed: %s", e)
+                self._dirty.set()
+
+
+def _existing_version(path: str) -> int:
+    # Continue numbering across restarts so readers never see it go backwards
+    try:
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+        magic, fmt, _, version, *_ = HEADER.unpack(header)
+    except (OSError, struct.error):
+        return 0
+    return version if magic == MAGIC and fmt == FORMAT_VERSION else 0
+
+
+class _Keys:
+    """Sequence view over the record keys for bisect, without decoding records"""
+
+    def __init__(self, mm: mmap.mmap, count: int) -> None:
+        self.mm = mm
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i: int) -> bytes:
+        offset = HEADER.size + i * RECORD.size
+        return self.mm[offset:offset + ID_WIDTH]
+
+
+class _MappedFile:
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as f:
+            self.inode = os.fstat(f.fileno()).st_ino
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, fmt, record_size, version, published_at, count, partition, partitions = HEADER.unpack_from(self.mm)
+        if magic != MAGIC or fmt != FORMAT_VERSION or record_size != RECORD.size:
+            self.mm.close()
+            raise ValueError(f"{path} is not an account snapshot (format {FORMAT_VERSION})")
+        self.version = version
+        self.published_at = published_at
+        self.count = count
+        self.partition = partition
+        self.partitions = partitions
+        self.keys = _Keys(self.mm, count)
+
+    def lookup(self, account_id: str) -> AccountRecord | None:
+        key = account_id.encode()
+        if len(key) > ID_WIDTH:
+            return None
+        key = key.ljust(ID_WIDTH, b"\0")
+        i = bisect.bisect_left(self.keys, key)
+        if i == self.count or self.keys[i] != key:
+            return None
+        _, status, balance, updated_at = RECORD.unpack_from(self.mm, HEADER.size + i * RECORD.size)
+        return AccountRecord(account_id, STATUS_NAMES[status], balance, updated_at)
+
+
+class AccountSnapshotReader:
+    """Looks accounts up in the published snapshot.
+
+    Checks for a newer snapshot at most every `refresh_seconds`; lookups in
+    between cost a binary search over the mapped file. Returns None for
+    accounts not in the snapshot, which includes ones created since it was
+    published, so callers should fall back to the HTTP API.
+    """
+
+    def __init__(self, path: str, refresh_seconds: float = 0.1) -> None:
+        self.path = path
+        self.refresh_seconds = refresh_seconds
+        self._files: list[_MappedFile] = []
+        self._checked_at = 0.0
+        self.refresh()
+
+    @property
+    def versions(self) -> list[int]:
+        return [f.version for f in self._files]
+
+    def refresh(self) -> None:
+        self._checked_at = time.monotonic()
+        paths = [self.path] if os.path.exists(self.path) else _partition_paths(self.path)
+        current = {f.inode: f for f in self._files}
+        files = []
+        for path in paths:
+            try:
+                inode = os.stat(path).st_ino
+            except FileNotFoundError:
+                continue
+            files.append(current.pop(inode, None) or _MappedFile(path))
+        # Retired mappings are dropped rather than closed; lookups still
+        # running against them keep their reference until they finish.
+        files.sort(key=lambda f: f.partition)
+        self._files = files
+
+    def get(self, account_id: str) -> AccountRecord | None:
+        if time.monotonic() - self._checked_at >= self.refresh_seconds:
+            self.refresh()
+        files = self._files
+        if not files:
+            return None
+        if len(files) == 1:
+            file = files[0]
+        else:
+            index = partition_of(account_id, files[0].partitions)
+            if index >= len(files) or files[index].partition != index:
+                return None
+            file = files[index]
+        return file.lookup(account_id)
+
+
+def _partition_paths(base: str) -> list[str]:
+    return sorted(p for p in glob.glob(f"{glob.escape(base)}.*") if p.rsplit(".", 1)[1].isdigit())
+
+
+if __name__ == "__main__":
+    # python -m app.snapshot <path> <account_id>...
+    reader = AccountSnapshotReader(sys.argv[1])
+    print(f"versions: {reader.versions}")
+    for account_id in sys.argv[2:]:
+        print(reader.get(account_id))
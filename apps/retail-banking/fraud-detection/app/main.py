@@ -1,17 +1,31 @@
 from __future__ import annotations
 
+import os
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 import random
 
-from fastapi import FastAPI
+from banking_common.metrics import SCORING_LATENCY, instrument, timed, track_store_size
+from banking_common.profiling import install_profiling
+from banking_common.readiness import Readiness
+from banking_common.wire import install_msgpack
+from fastapi import FastAPI, HTTPException, Response
 
-from .models import FraudCheckRequest, FraudCheckResponse, HealthResponse
+from .models import FraudCheckRequest, FraudCheckResponse, HealthResponse, ReadinessResponse
+from .watchlist import WatchlistSource
 
 
 def utc_now() -> datetime:
     return datetime.now(tz=UTC)
 
 
+# Account and description watchlists (see app/watchlist.py). Without a file,
+# the built-in list flags account IDs containing "test".
+WATCHLIST_PATH = os.getenv("WATCHLIST_PATH", "")
+watchlists = WatchlistSource(WATCHLIST_PATH, float(os.getenv("WATCHLIST_RELOAD_SECONDS", "5")))
+track_store_size("watchlist_entries", lambda: len(watchlists.current))
+
+
 def calculate_fraud_score(req: FraudCheckRequest) -> tuple[bool, float, list[str]]:
     """Hardcoded ML logic for demo purposes"""
     score = 0.0
@@ -35,10 +49,10 @@ def calculate_fraud_score(req: FraudCheckRequest) -> tuple[bool, float, list[str
     if req.transaction_type == "DEBIT":
         score += 0.1
     
-    # Account-based risk (simplified pattern matching)
-    if "test" in req.account_id.lower():
-        score += 0.5
-        reasons.append("Suspicious account pattern")
+    # Account and description watchlists
+    for match in watchlists.current.screen(req.account_id, req.description):
+        score += match.weight
+        reasons.append(match.reason)
     
     # Add some randomness to simulate ML model
     score += random.uniform(-0.1, 0.1)
@@ -57,7 +71,58 @@ def get_risk_level(score: float) -> str:
         return "HIGH"
 
 
-app = FastAPI(title="Fraud Detection Service", version="1.0.0")
+# Warm-up before /ready reports ready: a batch of synthetic checks through
+# the scorer and response serialization, so the first real checks don't pay
+# for cold code paths.
+readiness = Readiness(timeout_seconds=float(os.getenv("READINESS_TIMEOUT_SECONDS", "60")))
+WARMUP_BATCH_SIZE = int(os.getenv("READINESS_WARMUP_BATCH", "200"))
+
+
+@readiness.check("fraud scorer")
+async def warm_scorer() -> None:
+    for i in range(WARMUP_BATCH_SIZE):
+        req = FraudCheckRequest(
+            transaction_id=f"WARMUP-{i}",
+            account_id=f"WARMUP-{i % 10}",
+            amount=float(i * 100),
+            transaction_type="DEBIT" if i % 2 else "CREDIT",
+            description="warm-up",
+        )
+        is_fraud, score, reasons = calculate_fraud_score(req)
+        FraudCheckResponse(
+            transaction_id=req.transaction_id,
+            is_fraud=is_fraud,
+            fraud_score=round(score, 3),
+            risk_level=get_risk_level(score),
+            reasons=reasons,
+            checked_at=utc_now(),
+        ).model_dump_json()
+
+
+# With a watchlist file configured, checks must not run on the built-in list
+if WATCHLIST_PATH:
+    readiness.register("watchlist", watchlists.reload)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    readiness.start()
+    if WATCHLIST_PATH:
+        watchlists.start()
+    yield
+    await watchlists.stop()
+    await readiness.stop()
+
+
+app = FastAPI(title="Fraud Detection Service", version="1.0.0", lifespan=lifespan)
+
+# Add Prometheus metrics instrumentation
+instrument(app)
+install_profiling(app)
+FRAUD_SCORING_LATENCY = SCORING_LATENCY.labels("fraud")
+
+# Upper bound on a single batch check request
+MAX_BATCH_SIZE = 1000
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -70,19 +135,25 @@ def health() -> HealthResponse:
     )
 
 
-@app.get("/ready", response_model=HealthResponse)
-def ready() -> HealthResponse:
-    return HealthResponse(
-        status="ok",
+@app.get("/ready", response_model=ReadinessResponse)
+async def ready(response: Response) -> ReadinessResponse:
+    """503 until every warm-up check has finished; lists each check's progress"""
+    status = readiness.status
+    if status != "ok":
+        response.status_code = 503
+    return ReadinessResponse(
+        status=status,
         service="fraud-detection",
         environment="local",
         time=utc_now(),
+        checks=readiness.report(),
     )
 
 
 @app.post("/api/v1/check", response_model=FraudCheckResponse)
 def check_fraud(req: FraudCheckRequest) -> FraudCheckResponse:
-    is_fraud, score, reasons = calculate_fraud_score(req)
+    with timed(FRAUD_SCORING_LATENCY):
+        is_fraud, score, reasons = calculate_fraud_score(req)
     risk_level = get_risk_level(score)
     
     return FraudCheckResponse(
@@ -95,6 +166,13 @@ def check_fraud(req: FraudCheckRequest) -> FraudCheckResponse:
     )
 
 
+@app.post("/api/v1/check/batch", response_model=list[FraudCheckResponse])
+def check_fraud_batch(reqs: list[FraudCheckRequest]) -> list[FraudCheckResponse]:
+    if len(reqs) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch size exceeds {MAX_BATCH_SIZE}")
+    return [check_fraud(req) for req in reqs]
+
+
 @app.get("/api/v1/model/info")
 def get_model_info():
     return {
@@ -104,8 +182,14 @@ def get_model_info():
             "transaction_amount",
             "transaction_type",
             "transaction_time",
-            "account_pattern"
+            "account_pattern",
+            "watchlists"
         ],
         "threshold": 0.7,
         "last_trained": "2024-01-01T00:00:00Z"
     }
+
+
+# transaction-service calls these in msgpack (see banking_common.wire);
+# stays after every route so the others get the 415 wrapper too
+install_msgpack(app, ["/api/v1/check", "/api/v1/check/batch"])
@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Literal
 
+from banking_common.readiness import ReadinessCheck
 from pydantic import BaseModel, Field
 
 
@@ -13,6 +14,14 @@ class HealthResponse(BaseModel):
     time: datetime
 
 
+class ReadinessResponse(BaseModel):
+    status: Literal["ok", "warming", "failed"]
+    service: str
+    environment: str
+    time: datetime
+    checks: list[ReadinessCheck]
+
+
 class FraudCheckRequest(BaseModel):
     transaction_id: str
     account_id: str
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from collections.abc import Iterable
+from typing import NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# Watchlists screened by every fraud check, compiled so a check costs the
+# same however long the lists get: exact account IDs in a hash table,
+# account prefixes in a trie (one step per character of the ID), and
+# substrings in an Aho-Corasick automaton (one pass over the text for all
+# patterns at once).
+#
+# File format (JSON; every section optional):
+#
+#   {
+#     "account_ids":          {"weight": 0.6, "reason": "Watchlisted account",
+#                              "entries": ["ACC-900001", ...]},
+#     "account_prefixes":     {..., "entries": ["TMP-", ...]},
+#     "account_substrings":   {..., "entries": ["test", ...]},
+#     "description_keywords": {..., "entries": ["gift card", ...]}
+#   }
+#
+# An entry is a pattern, or {"pattern": ..., "weight": ..., "reason": ...}
+# to override its section's weight and reason. Substrings and keywords match
+# case-insensitively; account IDs and prefixes match exactly.
+
+SECTIONS = ("account_ids", "account_prefixes", "account_substrings", "description_keywords")
+
+
+class WatchlistEntry(NamedTuple):
+    pattern: str
+    weight: float
+    reason: str
+
+
+def _heavier(a: WatchlistEntry | None, b: WatchlistEntry | None) -> WatchlistEntry | None:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a if a.weight >= b.weight else b
+
+
+class PrefixTrie:
+    """Finds the heaviest entry whose pattern is a prefix of a key"""
+
+    def __init__(self, entries: Iterable[WatchlistEntry]) -> None:
+        # Node i: children by character, and the entry ending there
+        self._children: list[dict[str, int]] = [{}]
+        self._entries: list[WatchlistEntry | None] = [None]
+        for entry in entries:
+            node = 0
+            for char in entry.pattern:
+                child = self._children[node].get(char)
+                if child is None:
+                    child = self._children[node][char] = len(self._children)
+                    self._children.append({})
+                    self._entries.append(None)
+                node = child
+            self._entries[node] = _heavier(self._entries[node], entry)
+
+    def best_match(self, key: str) -> WatchlistEntry | None:
+        best = self._entries[0]
+        node = 0
+        for char in key:
+            node = self._children[node].get(char, -1)
+            if node < 0:
+                break
+            best = _heavier(best, self._entries[node])
+        return best
+
+
+class AhoCorasick:
+    """Finds the heaviest entry whose pattern occurs anywhere in a text"""
+
+    def __init__(self, entries: Iterable[WatchlistEntry]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._entries: list[WatchlistEntry | None] = [None]
+        for entry in entries:
+            node = 0
+            for char in entry.pattern:
+                child = self._goto[node].get(char)
+                if child is None:
+                    child = self._goto[node][char] = len(self._goto)
+                    self._goto.append({})
+                    self._entries.append(None)
+                node = child
+            self._entries[node] = _heavier(self._entries[node], entry)
+
+        # Failure links, breadth first: the longest proper suffix of a node's
+        # string that is also in the trie. A node's entry becomes the heaviest
+        # of its own and its failure node's, so a match never needs to walk
+        # the failure chain to report suffixes.
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._entries[child] = _heavier(self._entries[child], self._entries[self._fail[child]])
+                queue.append(child)
+
+    def best_match(self, text: str) -> WatchlistEntry | None:
+        goto, fail, entries = self._goto, self._fail, self._entries
+        best = None
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if entries[node] is not None:
+                best = _heavier(best, entries[node])
+        return best
+
+
+class Watchlist:
+    """All four watchlists, compiled"""
+
+    def __init__(self, sections: dict[str, list[WatchlistEntry]]) -> None:
+        self.size = sum(len(entries) for entries in sections.values())
+        self._account_ids: dict[str, WatchlistEntry] = {}
+        for entry in sections.get("account_ids", ()):
+            self._account_ids[entry.pattern] = _heavier(self._account_ids.get(entry.pattern), entry)
+        self._account_prefixes = PrefixTrie(sections.get("account_prefixes", ()))
+        self._account_substrings = AhoCorasick(
+            e._replace(pattern=e.pattern.lower()) for e in sections.get("account_substrings", ())
+        )
+        self._description_keywords = AhoCorasick(
+            e._replace(pattern=e.pattern.lower()) for e in sections.get("description_keywords", ())
+        )
+
+    def __len__(self) -> int:
+        return self.size
+
+    def screen(self, account_id: str, description: str) -> list[WatchlistEntry]:
+        """The heaviest match from each list that has one"""
+        matches = (
+            self._account_ids.get(account_id),
+            self._account_prefixes.best_match(account_id),
+            self._account_substrings.best_match(account_id.lower()),
+            self._description_keywords.best_match(description.lower()),
+        )
+        return [m for m in matches if m is not None]
+
+
+def parse_watchlist(doc: dict) -> Watchlist:
+    """Watchlist from the JSON file format; raises ValueError if malformed"""
+    sections: dict[str, list[WatchlistEntry]] = {}
+    for name, section in doc.items():
+        if name not in SECTIONS:
+            raise ValueError(f"unknown watchlist section {name!r}")
+        if not isinstance(section, dict):
+            raise ValueError(f"{name}: expected an object")
+        weight = float(section.get("weight", 0.5))
+        reason = str(section.get("reason", "Watchlist match"))
+        entries = []
+        for item in section.get("entries", []):
+            if isinstance(item, str):
+                item = {"pattern": item}
+            if not isinstance(item, dict):
+                raise ValueError(f"{name}: entries must be strings or objects: {item!r}")
+            pattern = item.get("pattern")
+            if not isinstance(pattern, str) or not pattern:
+                raise ValueError(f"{name}: entry without a pattern: {item!r}")
+            entries.append(WatchlistEntry(
+                pattern, float(item.get("weight", weight)), str(item.get("reason", reason)),
+            ))
+        sections[name] = entries
+    return Watchlist(sections)
+
+
+def load_watchlist(path: str) -> Watchlist:
+    with open(path) as f:
+        doc = json.load(f)
+    if not isinstance(doc, dict):
+        raise ValueError(f"{path}: expected a JSON object")
+    return parse_watchlist(doc)
+
+
+# Used when no file is configured: the original demo rule
+DEFAULT_WATCHLIST = {
+    "account_substrings": {"weight": 0.5, "reason": "Suspicious account pattern", "entries": ["test"]},
+}
+
+
+class WatchlistSource:
+    """The current watchlist, reloaded from `path` when the file changes.
+
+    Checks the file every `interval_seconds` and compiles a changed one in a
+    thread; checks keep using the previous watchlist until the new one is
+    complete, then switch to it in one assignment. Replace the file
+    atomically (write elsewhere, then rename over it). A file that fails to
+    load is logged and the previous watchlist stays in use.
+    """
+
+    def __init__(self, path: str, interval_seconds: float) -> None:
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.current = parse_watchlist(DEFAULT_WATCHLIST)
+        self.loaded_from: tuple[int, int, int] | None = None
+        # File version that failed to load, and why; not retried until it changes
+        self._rejected: tuple[tuple[int, int, int], Exception] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def reload(self) -> bool:
+        """Load the file if it changed since the last load; returns whether it did"""
+        st = os.stat(self.path)
+        version = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if version == self.loaded_from:
+            return False
+        if self._rejected is not None and self._rejected[0] == version:
+            raise self._rejected[1]
+        try:
+            self.current = await asyncio.to_thread(load_watchlist, self.path)
+        except Exception as exc:
+            self._rejected = (version, exc)
+            raise
+        self.loaded_from = version
+        logger.info("loaded watchlist %s: %d entries", self.path, len(self.current))
+        return True
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run(self) -> None:
+        reported = None
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.reload()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                # Once per distinct failure, not every interval
+                if str(exc) != reported:
+                    logger.warning("watchlist reload failed, keeping the previous one: %s", exc)
+                reported = str(exc)
+            else:
+                reported = None
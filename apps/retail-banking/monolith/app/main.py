@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import bisect
+import importlib
+import importlib.util
+import os
+import sys
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from types import ModuleType
+
+from fastapi import FastAPI, Response
+
+from .models import HealthResponse, MonolithReadinessResponse
+
+# account-service, transaction-service and fraud-detection in one process,
+# mounted under their service names. transaction-service calls the other two
+# through an in-process transport (below) instead of HTTP; everything else
+# about the services is unchanged, and each still serves its full API.
+#
+# The services are loaded from their own source trees, each `app` package
+# under a distinct name. Their metrics come from the shared banking_common
+# package, so all three register on the one Prometheus registry.
+
+SERVICES_ROOT = Path(os.getenv("RETAIL_SERVICES_ROOT", Path(__file__).resolve().parents[2]))
+
+
+def load_service(package: str, directory: str) -> ModuleType:
+    """Import `<directory>/app` as `package` and return its main module"""
+    app_dir = SERVICES_ROOT / directory / "app"
+    spec = importlib.util.spec_from_file_location(
+        package, app_dir / "__init__.py", submodule_search_locations=[str(app_dir)],
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[package] = module
+    spec.loader.exec_module(module)
+    return importlib.import_module(f"{package}.main")
+
+
+account_service = load_service("account_service", "account-service")
+fraud_detection = load_service("fraud_detection", "fraud-detection")
+transaction_service = load_service("transaction_service", "transaction-service")
+
+
+class InProcessTransport:
+    """transaction-service's transport (app/transport.py), calling the other
+    services' handler functions directly.
+
+    The handlers are the ones behind the HTTP routes, so validation and
+    limits are the same; what goes away is JSON on both sides and the
+    loopback hop. The sync handlers are short and CPU-only, so they run on
+    the event loop rather than in a thread.
+    """
+
+    async def batch_get_accounts(self, account_ids: list[str]) -> dict[str, str | None]:
+        result = account_service.batch_get_accounts(
+            account_service.BatchGetAccountsRequest(account_ids=account_ids),
+        )
+        statuses: dict[str, str | None] = {a.account_id: a.status for a in result.accounts}
+        statuses.update(dict.fromkeys(result.not_found))
+        return statuses
+
+    async def list_accounts(self, limit: int, cursor: str | None) -> tuple[dict[str, str], str | None]:
+        ids = account_service.account_order
+        start = bisect.bisect_right(ids, cursor) if cursor else 0
+        page = ids[start:start + limit]
+        statuses = {account_id: account_service.accounts[account_id].status for account_id in page}
+        more = start + limit < len(ids)
+        return statuses, page[-1] if more and page else None
+
+    async def account_changes(self, since: int, timeout: float) -> dict:
+        return (await account_service.account_changes(since, timeout)).model_dump()
+
+    async def check_fraud(self, payload: dict) -> bool:
+        return fraud_detection.check_fraud(fraud_detection.FraudCheckRequest(**payload)).is_fraud
+
+    async def check_fraud_batch(self, payloads: list[dict]) -> dict[str, bool]:
+        results = fraud_detection.check_fraud_batch([fraud_detection.FraudCheckRequest(**p) for p in payloads])
+        return {r.transaction_id: r.is_fraud for r in results}
+
+    async def warm_up(self, service: str, connections: int) -> None:
+        """No connections to warm"""
+
+
+transaction_service.transport = InProcessTransport()
+
+SERVICES = {
+    "account-service": account_service,
+    "transaction-service": transaction_service,
+    "fraud-detection": fraud_detection,
+}
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Mounted apps' lifespans don't run on their own
+    async with AsyncExitStack() as stack:
+        for service in SERVICES.values():
+            await stack.enter_async_context(service.app.router.lifespan_context(service.app))
+        yield
+
+
+app = FastAPI(title="Retail Banking Monolith", version="1.0.0", lifespan=lifespan)
+for name, service in SERVICES.items():
+    app.mount(f"/{name}", service.app)
+
+
+def utc_now() -> datetime:
+    return datetime.now(tz=UTC)
+
+
+@app.get("/health", response_model=HealthResponse)
+def health() -> HealthResponse:
+    return HealthResponse(
+        status="ok",
+        service="retail-monolith",
+        environment="local",
+        time=utc_now(),
+    )
+
+
+@app.get("/ready", response_model=MonolithReadinessResponse)
+async def ready(response: Response) -> MonolithReadinessResponse:
+    """503 until every service is ready; each service's own /ready lists its checks"""
+    services = {name: service.readiness.status for name, service in SERVICES.items()}
+    status = "ok"
+    if "failed" in services.values():
+        status = "failed"
+    elif any(s != "ok" for s in services.values()):
+        status = "warming"
+    if status != "ok":
+        response.status_code = 503
+    return MonolithReadinessResponse(
+        status=status,
+        service="retail-monolith",
+        environment="local",
+        time=utc_now(),
+        services=services,
+    )
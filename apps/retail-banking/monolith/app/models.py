@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class HealthResponse(BaseModel):
+    status: Literal["ok"]
+    service: str
+    environment: str
+    time: datetime
+
+
+class MonolithReadinessResponse(BaseModel):
+    status: Literal["ok", "warming", "failed"]
+    service: str
+    environment: str
+    time: datetime
+    # Readiness status of each mounted service
+    services: dict[str, Literal["ok", "warming", "failed"]]
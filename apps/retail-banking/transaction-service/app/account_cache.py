@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class AccountCache:
+    """Bounded LRU of account_id -> account status.
+
+    A status of None records that the account does not exist (negative entry).
+    Negative entries get a short TTL so newly created accounts show up quickly
+    even if the change feed is lagging; positive entries are kept fresh by the
+    change feed and only fall back to their TTL when the feed is unavailable.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, negative_ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._entries: OrderedDict[str, tuple[str | None, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, account_id: str) -> tuple[bool, str | None]:
+        """Return (found, status); found is False on a miss or expired entry."""
+        entry = self._entries.get(account_id)
+        if entry is None or entry[1] < time.monotonic():
+            if entry is not None:
+                del self._entries[account_id]
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(account_id)
+        self.hits += 1
+        return True, entry[0]
+
+    def put(self, account_id: str, status: str | None) -> None:
+        ttl = self.ttl_seconds if status is not None else self.negative_ttl_seconds
+        self._entries[account_id] = (status, time.monotonic() + ttl)
+        self._entries.move_to_end(account_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+async def follow_account_changes(
+    cache: AccountCache,
+    changes: Callable[[int, float], Awaitable[dict]],
+    poll_timeout: float = 25.0,
+) -> None:
+    """Long-poll account-service's change feed and apply updates to the cache.
+
+    `changes(since, timeout)` fetches the feed (a transport's
+    account_changes). Runs until cancelled. On errors it backs off and
+    retries; the cache's TTLs keep serving correct-enough answers in the
+    meantime.
+    """
+    since = 0
+    backoff = 1.0
+    while True:
+        try:
+            feed = await changes(since, poll_timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("account change feed unavailable: %s", exc)
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+            continue
+
+        backoff = 1.0
+        if feed["reset"]:
+            cache.clear()
+        for change in feed["changes"]:
+            cache.put(change["account_id"], change["status"])
+        since = feed["next_seq"]
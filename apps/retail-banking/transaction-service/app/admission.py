@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from banking_common.metrics import LATENCY_BUCKETS
+from prometheus_client import Counter, Gauge, Histogram
+
+HIGH = "high"
+NORMAL = "normal"
+PRIORITIES = (HIGH, NORMAL)
+
+ADMISSION_REQUESTS = Counter(
+    "admission_requests_total",
+    "Requests seen by admission control, by outcome (admitted or why they were shed)",
+    ["priority", "outcome"],
+)
+ADMISSION_QUEUE_DELAY = Histogram(
+    "admission_queue_delay_seconds",
+    "Time requests waited for an admission slot, whether or not they got one",
+    ["priority"],
+    buckets=LATENCY_BUCKETS,
+)
+ADMISSION_LOAD = Gauge(
+    "admission_load",
+    "Requests holding (in_flight) or waiting for (queued) an admission slot",
+    ["state"],
+    multiprocess_mode="livesum",
+)
+
+# Metric children, bound once per priority
+_OUTCOMES = ("admitted", "account_rate", "rate", "queue_full", "queue_timeout")
+_REQUESTS = {(p, o): ADMISSION_REQUESTS.labels(p, o) for p in PRIORITIES for o in _OUTCOMES}
+_QUEUE_DELAY = {p: ADMISSION_QUEUE_DELAY.labels(p) for p in PRIORITIES}
+
+
+class Shed(Exception):
+    """Raised when admission control turns a request away."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: float) -> None:
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        # Whole seconds, at least 1, as Retry-After wants
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `burst`"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def take(self, now: float, floor: float = 0.0) -> float:
+        """Take a token if that leaves at least `floor`; else seconds until it would"""
+        # `now` may predate a bucket created for this very request
+        self.tokens = min(self.burst, self.tokens + max(now - self.updated, 0.0) * self.rate)
+        self.updated = max(self.updated, now)
+        if self.tokens - 1 >= floor:
+            self.tokens -= 1
+            return 0.0
+        return (floor + 1 - self.tokens) / self.rate
+
+    def refund(self) -> None:
+        """Give back a token taken for a request that was then turned away"""
+        self.tokens = min(self.burst, self.tokens + 1)
+
+
+class AdmissionControl:
+    """Decides up front whether a request gets to do work, queue, or be shed.
+
+    In order, a request must get a token from its account's bucket (else
+    429), a token from the global bucket (else 503), and one of
+    `max_in_flight` slots. Without a free slot it queues for up to
+    `max_queue_delay` seconds, high priority ahead of normal, and is shed
+    with 503 if none frees up in time or `max_queue` requests are already
+    waiting. A request shed by any of the later steps gets its account token
+    back: load shedding doesn't count against the account. Normal priority may not use the last `reserve` share of the
+    global bucket or the queue, so under overload it is shed first. Rates of
+    0 turn a bucket off.
+
+    Per-account buckets are kept for the `max_accounts` most recently seen
+    accounts; an idle bucket refills to full, so dropping one loses nothing.
+
+    Only the event loop touches it (the create handler is async), so no
+    locking is needed.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        max_queue: int,
+        max_queue_delay: float,
+        rate: float = 0.0,
+        burst: float = 0.0,
+        account_rate: float = 0.0,
+        account_burst: float = 0.0,
+        max_accounts: int = 100000,
+        reserve: float = 0.2,
+    ) -> None:
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_queue_delay = max_queue_delay
+        self.account_rate = account_rate
+        self.account_burst = max(account_burst, 1.0)
+        self.max_accounts = max_accounts
+        self.reserve = reserve
+        self.bucket = TokenBucket(rate, max(burst, 1.0)) if rate > 0 else None
+        self.in_flight = 0
+        self._accounts: OrderedDict[str, TokenBucket] = OrderedDict()
+        self._waiters: dict[str, deque[asyncio.Future[None]]] = {p: deque() for p in PRIORITIES}
+
+    @property
+    def queued(self) -> int:
+        return sum(len(w) for w in self._waiters.values())
+
+    @asynccontextmanager
+    async def admit(self, account_id: str, priority: str = NORMAL) -> AsyncIterator[None]:
+        """Hold a slot for the body of the `async with`; raises Shed instead if there is none"""
+        now = time.monotonic()
+        account = self._account_bucket(account_id) if self.account_rate > 0 else None
+        if account is not None:
+            wait = account.take(now)
+            if wait:
+                self._shed(priority, "account_rate", 429, "Too many requests for this account", wait)
+        try:
+            if self.bucket is not None:
+                floor = 0.0 if priority == HIGH else self.reserve * self.bucket.burst
+                wait = self.bucket.take(now, floor)
+                if wait:
+                    self._shed(priority, "rate", 503, "Service is over its request rate", wait)
+
+            if self.in_flight < self.max_in_flight and not self.queued:
+                self.in_flight += 1
+            else:
+                # A slot freed while queued is handed straight to the waiter
+                await self._queue(priority, now)
+        except Shed:
+            if account is not None:
+                account.refund()
+            raise
+        _REQUESTS[priority, "admitted"].inc()
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _account_bucket(self, account_id: str) -> TokenBucket:
+        bucket = self._accounts.get(account_id)
+        if bucket is None:
+            bucket = self._accounts[account_id] = TokenBucket(self.account_rate, self.account_burst)
+            if len(self._accounts) > self.max_accounts:
+                self._accounts.popitem(last=False)
+        else:
+            self._accounts.move_to_end(account_id)
+        return bucket
+
+    async def _queue(self, priority: str, now: float) -> None:
+        limit = self.max_queue if priority == HIGH else int(self.max_queue * (1 - self.reserve))
+        if self.queued >= limit:
+            self._shed(priority, "queue_full", 503, "Service is overloaded", self.max_queue_delay)
+
+        waiters = self._waiters[priority]
+        waiter = asyncio.get_running_loop().create_future()
+        waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.max_queue_delay)
+        except TimeoutError:
+            self._shed(priority, "queue_timeout", 503, "Service is overloaded", self.max_queue_delay)
+        except asyncio.CancelledError:
+            # The client went away: give back the slot if it had just been handed over
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+        finally:
+            if waiter in waiters:
+                waiters.remove(waiter)
+            _QUEUE_DELAY[priority].observe(time.monotonic() - now)
+
+    def _release(self) -> None:
+        for priority in PRIORITIES:
+            waiters = self._waiters[priority]
+            while waiters:
+                waiter = waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+        self.in_flight -= 1
+
+    def _shed(self, priority: str, outcome: str, status_code: int, detail: str, retry_after: float) -> None:
+        _REQUESTS[priority, outcome].inc()
+        raise Shed(status_code, detail, retry_after)
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import asyncio
+import glob
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from datetime import UTC, datetime, timedelta
+
+from .models import Transaction
+
+logger = logging.getLogger(__name__)
+
+# Cold tier of the transaction store: settled transactions past the hot
+# window are moved out of memory into append-only segment files, which
+# reads fall through to.
+#
+# Segment file layout, little-endian:
+#
+#   header   magic "TXSG", format, meta length
+#   meta     zlib JSON: row count, min/max created_at, min/max
+#            transaction_id, and the (offset, length) of every block
+#   blocks   one zlib-compressed block per column, plus an account index
+#            ({account_id: [row, ...]})
+#
+# Columns are stored as arrays (amount, times in microseconds, type and
+# status as codes) or JSON string lists. A segment is never modified once
+# written: it is built in a temp file and os.replace()d into place, and
+# files are mapped read-only. Only the meta of each segment stays in
+# memory; blocks are inflated on demand, a few segments' worth at a time.
+
+MAGIC = b"TXSG"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHI")
+SUFFIX = ".txseg"
+
+TYPE_CODES = {"DEBIT": 1, "CREDIT": 2}
+STATUS_CODES = {"PENDING": 1, "COMPLETED": 2, "FAILED": 3}
+TYPE_NAMES = {code: name for name, code in TYPE_CODES.items()}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+# completed_at of a transaction that has none
+NO_TIME = -(2**63)
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def archive_path(base: str, partition: int, partitions: int) -> str:
+    return base if partitions == 1 else os.path.join(base, str(partition))
+
+
+def id_order(transaction_id: str) -> tuple[int, str]:
+    # Sequential IDs (TXN-000999, TXN-1000000) compare by length first
+    return len(transaction_id), transaction_id
+
+
+def _micros(t: datetime) -> int:
+    return (t - EPOCH) // MICROSECOND
+
+
+def _from_micros(us: int) -> datetime:
+    return EPOCH + us * MICROSECOND
+
+
+def encode_segment(txns: list[Transaction]) -> bytes:
+    created = [_micros(t.created_at) for t in txns]
+    columns = {
+        "transaction_id": json.dumps([t.transaction_id for t in txns]).encode(),
+        "account_id": json.dumps([t.account_id for t in txns]).encode(),
+        "amount": array("d", [t.amount for t in txns]).tobytes(),
+        "transaction_type": array("B", [TYPE_CODES[t.transaction_type] for t in txns]).tobytes(),
+        "description": json.dumps([t.description for t in txns]).encode(),
+        "status": array("B", [STATUS_CODES[t.status] for t in txns]).tobytes(),
+        "created_at": array("q", created).tobytes(),
+        "completed_at": array(
+            "q", [NO_TIME if t.completed_at is None else _micros(t.completed_at) for t in txns],
+        ).tobytes(),
+    }
+    accounts: dict[str, list[int]] = {}
+    for row, t in enumerate(txns):
+        accounts.setdefault(t.account_id, []).append(row)
+    columns["accounts"] = json.dumps(accounts).encode()
+
+    blocks = {name: zlib.compress(data) for name, data in columns.items()}
+    # Offsets are relative to the end of the meta, so the meta can describe
+    # them before its own length is known
+    layout = {}
+    offset = 0
+    for name, block in blocks.items():
+        layout[name] = [offset, len(block)]
+        offset += len(block)
+    ids = sorted((t.transaction_id for t in txns), key=id_order)
+    meta = zlib.compress(json.dumps({
+        "rows": len(txns),
+        "created_min": min(created),
+        "created_max": max(created),
+        "id_min": ids[0],
+        "id_max": ids[-1],
+        "blocks": layout,
+    }).encode())
+    return b"".join([HEADER.pack(MAGIC, FORMAT_VERSION, len(meta)), meta, *blocks.values()])
+
+
+def write_segment(path: str, data: bytes) -> None:
+    # The temp file must sit next to the target for the rename to be atomic
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class _Segment:
+    """A mapped segment file and its meta"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, fmt, meta_length = HEADER.unpack_from(self.mm)
+        if magic != MAGIC or fmt != FORMAT_VERSION:
+            self.mm.close()
+            raise ValueError(f"{path} is not a transaction segment (format {FORMAT_VERSION})")
+        meta = json.loads(zlib.decompress(self.mm[HEADER.size:HEADER.size + meta_length]))
+        self.rows: int = meta["rows"]
+        self.created_min: int = meta["created_min"]
+        self.created_max: int = meta["created_max"]
+        self.id_min = id_order(meta["id_min"])
+        self.id_max = id_order(meta["id_max"])
+        self._base = HEADER.size + meta_length
+        self._blocks: dict[str, list[int]] = meta["blocks"]
+
+    def block(self, name: str) -> bytes:
+        offset, length = self._blocks[name]
+        start = self._base + offset
+        return zlib.decompress(self.mm[start:start + length])
+
+
+class _Decoded:
+    """A segment's columns, inflated"""
+
+    def __init__(self, segment: _Segment) -> None:
+        self.transaction_id: list[str] = json.loads(segment.block("transaction_id"))
+        self.account_id: list[str] = json.loads(segment.block("account_id"))
+        self.amount = array("d", segment.block("amount"))
+        self.transaction_type = array("B", segment.block("transaction_type"))
+        self.description: list[str] = json.loads(segment.block("description"))
+        self.status = array("B", segment.block("status"))
+        self.created_at = array("q", segment.block("created_at"))
+        self.completed_at = array("q", segment.block("completed_at"))
+        self.accounts: dict[str, list[int]] = json.loads(segment.block("accounts"))
+        self.rows = {txn_id: row for row, txn_id in enumerate(self.transaction_id)}
+
+    def transaction(self, row: int) -> Transaction:
+        completed_at = self.completed_at[row]
+        # Trusted data written from valid Transactions; skip re-validation
+        return Transaction.model_construct(
+            transaction_id=self.transaction_id[row],
+            account_id=self.account_id[row],
+            amount=self.amount[row],
+            transaction_type=TYPE_NAMES[self.transaction_type[row]],
+            description=self.description[row],
+            status=STATUS_NAMES[self.status[row]],
+            created_at=_from_micros(self.created_at[row]),
+            completed_at=None if completed_at == NO_TIME else _from_micros(completed_at),
+        )
+
+
+class TransactionArchive:
+    """Transactions moved out of memory, kept in segment files under `path`.
+
+    Lookups by ID only open segments whose ID range covers it, listings by
+    time only those whose time range overlaps, and listings by account
+    visit just the rows in each segment's account index. Inflated segments
+    are cached, the `cache_segments` most recently read.
+
+    Segments are added on the event loop once their file is complete, and
+    never change; reads may come from handler threads, so the cache of
+    inflated segments is behind a lock.
+    """
+
+    def __init__(self, path: str, cache_segments: int = 4) -> None:
+        self.path = path
+        self.cache_segments = cache_segments
+        os.makedirs(path, exist_ok=True)
+        self.segments = [_Segment(p) for p in _segment_paths(path)]
+        # Segment files are numbered in the order they were written
+        self._next = 1
+        if self.segments:
+            self._next = int(os.path.basename(self.segments[-1].path).removesuffix(SUFFIX)) + 1
+        self._cache: OrderedDict[str, _Decoded] = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(s.rows for s in self.segments)
+
+    @property
+    def max_transaction_id(self) -> str | None:
+        if not self.segments:
+            return None
+        return max(s.id_max for s in self.segments)[1]
+
+    async def append(self, txns: list[Transaction], segment_rows: int) -> None:
+        """Write `txns` (in order) as new segments of at most `segment_rows` each"""
+        for start in range(0, len(txns), segment_rows):
+            path = os.path.join(self.path, f"{self._next:08d}{SUFFIX}")
+            self._next += 1
+            # Settled transactions no longer change, so the thread can read them
+            data = await asyncio.to_thread(encode_segment, txns[start:start + segment_rows])
+            await asyncio.to_thread(write_segment, path, data)
+            self.segments.append(_Segment(path))
+
+    def get(self, transaction_id: str) -> Transaction | None:
+        key = id_order(transaction_id)
+        # Newest first: recently archived transactions are the likelier reads
+        for segment in reversed(self.segments):
+            if segment.id_min <= key <= segment.id_max:
+                decoded = self._decoded(segment)
+                row = decoded.rows.get(transaction_id)
+                if row is not None:
+                    return decoded.transaction(row)
+        return None
+
+    def scan(
+        self,
+        account_id: str | None = None,
+        created_after: datetime | None = None,
+        created_before: datetime | None = None,
+        segments: list[_Segment] | None = None,
+    ) -> Iterator[Transaction]:
+        """Archived transactions in archive order, filtered like list_transactions.
+
+        Reads `segments` (a copy of self.segments taken earlier) if given,
+        so a caller can pair the archive with a matching read of the hot store.
+        """
+        after = None if created_after is None else _micros(created_after)
+        before = None if created_before is None else _micros(created_before)
+        for segment in self.segments if segments is None else segments:
+            if after is not None and segment.created_max < after:
+                continue
+            if before is not None and segment.created_min >= before:
+                continue
+            decoded = self._decoded(segment)
+            rows: Iterable[int] = range(segment.rows)
+            if account_id is not None:
+                rows = decoded.accounts.get(account_id, ())
+            for row in rows:
+                created = decoded.created_at[row]
+                if (after is None or created >= after) and (before is None or created < before):
+                    yield decoded.transaction(row)
+
+    def _decoded(self, segment: _Segment) -> _Decoded:
+        with self._cache_lock:
+            decoded = self._cache.get(segment.path)
+            if decoded is not None:
+                self._cache.move_to_end(segment.path)
+                return decoded
+        # Inflate outside the lock; two threads racing on one segment both do it
+        decoded = _Decoded(segment)
+        with self._cache_lock:
+            self._cache[segment.path] = decoded
+            while len(self._cache) > self.cache_segments:
+                self._cache.popitem(last=False)
+        return decoded
+
+
+def select_cold(
+    transactions: dict[str, Transaction],
+    cutoff: datetime,
+    max_hot: int,
+    limit: int,
+) -> list[Transaction]:
+    """Settled transactions to archive, oldest first: those created before
+    `cutoff`, then more until at most `max_hot` remain. Up to `limit`.
+
+    Relies on the store's insertion order being creation order. PENDING
+    transactions are still being settled and always stay.
+    """
+    excess = len(transactions) - max_hot
+    cold = []
+    for txn in transactions.values():
+        if len(cold) >= limit or (txn.created_at >= cutoff and excess <= 0):
+            break
+        if txn.status != "PENDING":
+            cold.append(txn)
+            excess -= 1
+    return cold
+
+
+async def archive_cold_transactions(
+    archive: TransactionArchive,
+    transactions: dict[str, Transaction],
+    hot_window: timedelta,
+    max_hot: int,
+    segment_rows: int,
+    interval_seconds: float,
+) -> None:
+    """Every `interval_seconds`, move cold transactions from the store to the archive.
+
+    Runs until cancelled. Transactions leave the store only once their
+    segment is written, so reads find them in one place or the other
+    throughout. A failed write is logged and retried next round.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            while cold := select_cold(transactions, datetime.now(tz=UTC) - hot_window, max_hot, segment_rows):
+                await archive.append(cold, segment_rows)
+                for txn in cold:
+                    del transactions[txn.transaction_id]
+        except (OSError, ValueError) as exc:
+            logger.warning("transaction archival failed: %s", exc)
+
+
+def _segment_paths(path: str) -> list[str]:
+    return sorted(glob.glob(os.path.join(glob.escape(path), f"*{SUFFIX}")))
+
+
+if __name__ == "__main__":
+    # python -m app.archive <path> [transaction_id...]
+    archive = TransactionArchive(sys.argv[1])
+    for s in archive.segments:
+        print(
+            f"{os.path.basename(s.path)}: {s.rows} rows, {s.id_min[1]}..{s.id_max[1]}, "
+            f"{_from_micros(s.created_min).isoformat()}..{_from_micros(s.created_max).isoformat()}, "
+            f"{os.path.getsize(s.path)} bytes",
+        )
+    for transaction_id in sys.argv[2:]:
+        print(archive.get(transaction_id))
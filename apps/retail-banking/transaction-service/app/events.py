@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import NamedTuple
+
+
+class TransactionEvent(NamedTuple):
+    seq: int
+    account_id: str
+    # Pre-serialized Transaction JSON, encoded once per event rather than
+    # once per subscriber
+    data: str
+
+
+class Subscription:
+    def __init__(self, account_id: str | None, buffer_size: int) -> None:
+        self.account_id = account_id
+        self.queue: asyncio.Queue[TransactionEvent] = asyncio.Queue(maxsize=buffer_size)
+        # Set when the subscriber fell too far behind and missed events; the
+        # stream ends and the client resumes from its last seen seq.
+        self.overflowed = False
+
+    def offer(self, event: TransactionEvent) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class TransactionEventBus:
+    """In-process fan-out of transaction status changes.
+
+    Keeps a bounded history so subscribers can resume from a sequence number,
+    and gives each subscriber its own bounded buffer so one slow client never
+    holds back publishers or other subscribers.
+    """
+
+    def __init__(self, history_size: int, subscriber_buffer: int) -> None:
+        self.subscriber_buffer = subscriber_buffer
+        self._seq = 0
+        self._history: deque[TransactionEvent] = deque(maxlen=history_size)
+        self._subscribers: set[Subscription] = set()
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, account_id: str, data: str) -> None:
+        self._seq += 1
+        event = TransactionEvent(self._seq, account_id, data)
+        self._history.append(event)
+        for sub in self._subscribers:
+            if sub.account_id is None or sub.account_id == account_id:
+                sub.offer(event)
+
+    def subscribe(self, account_id: str | None, since: int | None) -> tuple[Subscription, list[TransactionEvent]]:
+        """Register a subscriber; returns it with any retained events after `since`"""
+        sub = Subscription(account_id, self.subscriber_buffer)
+        replay = []
+        if since is not None:
+            replay = [
+                e for e in self._history
+                if e.seq > since and (account_id is None or e.account_id == account_id)
+            ]
+        self._subscribers.add(sub)
+        return sub, replay
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
+
+
+def format_sse(event: TransactionEvent) -> str:
+    return f"id: {event.seq}\nevent: transaction\ndata: {event.data}\n\n"
@@ -1,56 +1,311 @@
 from __future__ import annotations
 
-from datetime import UTC, datetime
+import asyncio
+import contextlib
+import os
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
 from typing import Annotated
 
 import httpx
-from fastapi import FastAPI, Header, HTTPException
+from banking_common.metrics import (
+    DOWNSTREAM_LATENCY,
+    SERIALIZATION_LATENCY,
+    gauge_function,
+    instrument,
+    timed,
+    track_store_size,
+)
+from banking_common.profiling import install_profiling, span
+from banking_common.readiness import Readiness
+from banking_common.sharding import WORKER_COUNT, WORKER_INDEX, IdSequence
+from fastapi import FastAPI, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import AwareDatetime
 
+from .account_cache import AccountCache, follow_account_changes
+from .admission import ADMISSION_LOAD, HIGH, NORMAL, AdmissionControl, Shed
+from .archive import TransactionArchive, archive_cold_transactions, archive_path
+from .events import TransactionEventBus, format_sse
+from .idempotency import MAX_KEY_LENGTH, IdempotencyCache, IdempotencyKeyReused, request_fingerprint
 from .models import (
     CreateTransactionRequest,
     HealthResponse,
+    ReadinessResponse,
     Transaction,
 )
+from .outbox import BatchOutbox, OutboxFull
+from .transport import HttpTransport
 
 
 def utc_now() -> datetime:
     return datetime.now(tz=UTC)
 
 
-app = FastAPI(title="Transaction Service", version="1.0.0")
+# External services URLs
+ACCOUNT_SERVICE_URL = os.getenv("ACCOUNT_SERVICE_URL", "http://account-service:8091")
+FRAUD_DETECTION_URL = os.getenv("FRAUD_DETECTION_URL", "http://fraud-detection:8093")
+
+# Shared connection pool for calls to account-service and fraud-detection
+http_client = httpx.AsyncClient(timeout=5.0)
+
+# How account-service and fraud-detection are reached (see app/transport.py);
+# the retail monolith replaces it with direct in-process calls. Fraud checks
+# are sent in msgpack unless INTERNAL_WIRE_FORMAT is "json".
+INTERNAL_WIRE_FORMAT = os.getenv("INTERNAL_WIRE_FORMAT", "msgpack")
+transport = HttpTransport(
+    http_client, ACCOUNT_SERVICE_URL, FRAUD_DETECTION_URL, use_msgpack=INTERNAL_WIRE_FORMAT == "msgpack",
+)
+
+# Local account status cache, kept fresh by account-service's change feed
+account_cache = AccountCache(
+    max_size=int(os.getenv("ACCOUNT_CACHE_SIZE", "100000")),
+    ttl_seconds=float(os.getenv("ACCOUNT_CACHE_TTL_SECONDS", "300")),
+    negative_ttl_seconds=float(os.getenv("ACCOUNT_CACHE_NEGATIVE_TTL_SECONDS", "5")),
+)
+
+
+# Hosts that async creates may name in callback_url. Callbacks are POSTed
+# from inside the cluster, so an open list would let any client make this
+# service call internal addresses. Empty (the default) turns callbacks off.
+CALLBACK_ALLOWED_HOSTS = frozenset(
+    host.strip().lower() for host in os.getenv("CALLBACK_ALLOWED_HOSTS", "").split(",") if host.strip()
+)
+CALLBACK_TIMEOUT_SECONDS = float(os.getenv("CALLBACK_TIMEOUT_SECONDS", "5"))
+
+# Default processing mode for new transactions: "sync" waits for the fraud
+# check before responding, "async" returns 202 and settles in the background.
+# Clients can opt into async per request with `Prefer: respond-async`.
+PROCESSING_MODE = os.getenv("TRANSACTION_PROCESSING_MODE", "sync")
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    feed_task = asyncio.create_task(follow_account_changes(account_cache, transport.account_changes))
+    fraud_outbox.start()
+    readiness.start()
+    archive_task = None
+    if archive is not None:
+        archive_task = asyncio.create_task(archive_cold_transactions(
+            archive, transactions, HOT_WINDOW, HOT_MAX, SEGMENT_ROWS, ARCHIVE_INTERVAL_SECONDS,
+        ))
+    yield
+    if archive_task is not None:
+        archive_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await archive_task
+    await readiness.stop()
+    await fraud_outbox.stop()
+    feed_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await feed_task
+    await http_client.aclose()
 
-# In-memory store for demo
+
+app = FastAPI(title="Transaction Service", version="1.0.0", lifespan=lifespan)
+
+# Add Prometheus metrics instrumentation
+instrument(app, excluded_handlers=["/api/v1/transactions/events"])
+install_profiling(app, excluded_paths=["/api/v1/transactions/events"])
+ACCOUNT_LOOKUP_LATENCY = DOWNSTREAM_LATENCY.labels("account-service", "batch_get")
+FRAUD_CHECK_LATENCY = DOWNSTREAM_LATENCY.labels("fraud-detection", "check")
+FRAUD_CHECK_BATCH_LATENCY = DOWNSTREAM_LATENCY.labels("fraud-detection", "check_batch")
+EVENT_SERIALIZATION_LATENCY = SERIALIZATION_LATENCY.labels("transaction_event")
+
+# In-memory store for demo. In multi-worker mode (app/serve.py) each worker
+# holds only the transactions it owns.
 transactions: dict[str, Transaction] = {}
+transaction_ids = IdSequence("TXN-{:06d}")
+
+# Optional cold tier (see app/archive.py). With a path configured, settled
+# transactions older than the hot window, or past the newest HOT_MAX, are
+# moved to segment files on disk and reads fall through to them. Off by
+# default, keeping every transaction in memory.
+TRANSACTION_ARCHIVE_PATH = os.getenv("TRANSACTION_ARCHIVE_PATH", "")
+HOT_WINDOW = timedelta(seconds=float(os.getenv("TRANSACTION_HOT_WINDOW_SECONDS", "3600")))
+HOT_MAX = int(os.getenv("TRANSACTION_HOT_MAX", "100000"))
+SEGMENT_ROWS = int(os.getenv("TRANSACTION_SEGMENT_ROWS", "50000"))
+ARCHIVE_INTERVAL_SECONDS = float(os.getenv("TRANSACTION_ARCHIVE_INTERVAL_SECONDS", "30"))
+
+archive: TransactionArchive | None = None
+if TRANSACTION_ARCHIVE_PATH:
+    archive = TransactionArchive(
+        archive_path(TRANSACTION_ARCHIVE_PATH, WORKER_INDEX, WORKER_COUNT),
+        cache_segments=int(os.getenv("TRANSACTION_ARCHIVE_CACHE_SEGMENTS", "4")),
+    )
+    if archive.max_transaction_id is not None:
+        # Archived IDs outlive the process; don't issue them again
+        transaction_ids.skip_to(int(archive.max_transaction_id.rsplit("-", 1)[1]) + 1)
+
+# Fan-out of transaction status changes to /api/v1/transactions/events
+event_bus = TransactionEventBus(
+    history_size=int(os.getenv("TRANSACTION_EVENT_HISTORY", "10000")),
+    subscriber_buffer=int(os.getenv("TRANSACTION_EVENT_BUFFER", "1000")),
+)
+SSE_HEARTBEAT_SECONDS = 15.0
+
+
+def publish_transaction(txn: Transaction) -> None:
+    with timed(EVENT_SERIALIZATION_LATENCY):
+        data = txn.model_dump_json()
+    event_bus.publish(txn.account_id, data)
+
+
+# account-service's batchGet limit
+ACCOUNT_BATCH_GET_SIZE = 5000
 
-# External services URLs
-ACCOUNT_SERVICE_URL = "http://account-service:8091"
-FRAUD_DETECTION_URL = "http://fraud-detection:8093"
+
+async def fetch_account_statuses(account_ids: list[str]) -> dict[str, str | None]:
+    """Look accounts up with batchGet; None marks a missing account.
+
+    IDs whose chunk failed are left out of the result.
+    """
+    statuses: dict[str, str | None] = {}
+    with timed(ACCOUNT_LOOKUP_LATENCY), span("account-service"):
+        for start in range(0, len(account_ids), ACCOUNT_BATCH_GET_SIZE):
+            chunk = account_ids[start:start + ACCOUNT_BATCH_GET_SIZE]
+            try:
+                statuses.update(await transport.batch_get_accounts(chunk))
+            except Exception:
+                continue
+    return statuses
+
+
+async def verify_accounts(account_ids: list[str]) -> dict[str, bool]:
+    """Verify many accounts exist and are active, with one lookup for all cache misses"""
+    statuses: dict[str, str | None] = {}
+    misses = []
+    for account_id in dict.fromkeys(account_ids):
+        found, status = account_cache.get(account_id)
+        if found:
+            statuses[account_id] = status
+        else:
+            misses.append(account_id)
+    if misses:
+        fetched = await fetch_account_statuses(misses)
+        for account_id, status in fetched.items():
+            account_cache.put(account_id, status)
+        statuses.update(fetched)
+    return {account_id: statuses.get(account_id) == "ACTIVE" for account_id in account_ids}
 
 
 async def verify_account(account_id: str) -> bool:
-    """Verify account exists via account service"""
+    """Verify account exists and is active, via the local cache or account service"""
+    return (await verify_accounts([account_id]))[account_id]
+
+
+def fraud_check_payload(txn: Transaction) -> dict:
+    return {
+        "transaction_id": txn.transaction_id,
+        "account_id": txn.account_id,
+        "amount": txn.amount,
+        "transaction_type": txn.transaction_type,
+        "description": txn.description,
+    }
+
+
+async def check_fraud(transaction_data: dict) -> bool:
+    """Check transaction for fraud via fraud detection service"""
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(f"{ACCOUNT_SERVICE_URL}/api/v1/accounts/{account_id}")
-            return resp.status_code == 200
+        with timed(FRAUD_CHECK_LATENCY), span("fraud-detection"):
+            return await transport.check_fraud(transaction_data)
     except Exception:
         return False
 
 
-async def check_fraud(transaction_data: dict) -> bool:
-    """Check transaction for fraud via fraud detection service"""
+async def check_fraud_batch(transactions_data: list[dict]) -> dict[str, bool]:
+    """Check many transactions in one call; returns is_fraud by transaction ID"""
     try:
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{FRAUD_DETECTION_URL}/api/v1/check",
-                json=transaction_data,
-            )
-            if resp.status_code == 200:
-                result = resp.json()
-                return result.get("is_fraud", False)
+        with timed(FRAUD_CHECK_BATCH_LATENCY), span("fraud-detection:batch"):
+            return await transport.check_fraud_batch(transactions_data)
+    except Exception:
+        return {}
+
+
+def settle_transaction(txn: Transaction, is_fraud: bool) -> None:
+    txn.status = "FAILED" if is_fraud else "COMPLETED"
+    txn.completed_at = utc_now()
+    publish_transaction(txn)
+
+
+async def notify_callback(callback_url: str, txn: Transaction) -> None:
+    """Best-effort POST of the settled transaction to the client's callback URL"""
+    try:
+        # Redirects are not followed, so the allowlisted host is the one called
+        await http_client.post(
+            callback_url,
+            content=txn.model_dump_json(),
+            headers={"content-type": "application/json"},
+            timeout=CALLBACK_TIMEOUT_SECONDS,
+        )
     except Exception:
         pass
-    return False
+
+
+async def process_fraud_checks(jobs: list[tuple[str, str | None]]) -> None:
+    """Outbox handler: fraud-check a batch of PENDING transactions and settle them"""
+    pending = [(transactions[txn_id], url) for txn_id, url in jobs if txn_id in transactions]
+    results = await check_fraud_batch([fraud_check_payload(txn) for txn, _ in pending])
+    callbacks = []
+    for txn, callback_url in pending:
+        # Same fail-open behavior as the synchronous path
+        settle_transaction(txn, results.get(txn.transaction_id, False))
+        if callback_url:
+            callbacks.append(notify_callback(callback_url, txn))
+    if callbacks:
+        await asyncio.gather(*callbacks)
+
+
+# Outbox of (transaction_id, callback_url) awaiting an asynchronous fraud check
+fraud_outbox: BatchOutbox[tuple[str, str | None]] = BatchOutbox(
+    process_fraud_checks,
+    max_size=int(os.getenv("FRAUD_OUTBOX_SIZE", "10000")),
+    workers=int(os.getenv("FRAUD_CHECK_WORKERS", "4")),
+    batch_size=int(os.getenv("FRAUD_CHECK_BATCH_SIZE", "50")),
+)
+
+# Warm-up before /ready reports ready: pooled connections to both
+# downstreams, and the account cache primed with the first accounts by ID.
+# Connection warm-ups are optional so an outage downstream does not keep
+# this service out of rotation past READINESS_TIMEOUT_SECONDS.
+readiness = Readiness(timeout_seconds=float(os.getenv("READINESS_TIMEOUT_SECONDS", "60")))
+WARM_CONNECTIONS = int(os.getenv("READINESS_WARM_CONNECTIONS", "4"))
+ACCOUNT_CACHE_PRIME_SIZE = int(os.getenv("ACCOUNT_CACHE_PRIME_SIZE", "1000"))
+# account-service's list page limit
+ACCOUNT_LIST_PAGE_SIZE = 1000
+
+
+@readiness.check("account-service connections", required=False)
+async def warm_account_service() -> None:
+    await transport.warm_up("account-service", WARM_CONNECTIONS)
+
+
+@readiness.check("fraud-detection connections", required=False)
+async def warm_fraud_detection() -> None:
+    await transport.warm_up("fraud-detection", WARM_CONNECTIONS)
+
+
+@readiness.check("account cache", required=False)
+async def prime_account_cache() -> None:
+    cursor = None
+    primed = 0
+    while primed < ACCOUNT_CACHE_PRIME_SIZE:
+        page, cursor = await transport.list_accounts(
+            min(ACCOUNT_CACHE_PRIME_SIZE - primed, ACCOUNT_LIST_PAGE_SIZE), cursor,
+        )
+        for account_id, status in page.items():
+            account_cache.put(account_id, status)
+            primed += 1
+        if not cursor:
+            break
+
+
+track_store_size("transactions", lambda: len(transactions))
+if archive is not None:
+    track_store_size("transaction_archive", lambda: len(archive))
+track_store_size("account_cache", lambda: len(account_cache))
+track_store_size("fraud_outbox", lambda: len(fraud_outbox))
+track_store_size("event_subscribers", lambda: len(event_bus))
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -63,41 +318,212 @@ def health() -> HealthResponse:
     )
 
 
-@app.get("/ready", response_model=HealthResponse)
-def ready() -> HealthResponse:
-    return HealthResponse(
-        status="ok",
+@app.get("/ready", response_model=ReadinessResponse)
+async def ready(response: Response) -> ReadinessResponse:
+    """503 until every warm-up check has finished; lists each check's progress"""
+    status = readiness.status
+    if status != "ok":
+        response.status_code = 503
+    return ReadinessResponse(
+        status=status,
         service="transaction-service",
         environment="local",
         time=utc_now(),
+        checks=readiness.report(),
     )
 
 
+def select_transactions(
+    hot: list[Transaction],
+    segments: list | None,
+    account_id: str | None,
+    created_after: datetime | None,
+    created_before: datetime | None,
+) -> list[Transaction]:
+    txns = [] if segments is None else list(archive.scan(account_id, created_after, created_before, segments))
+    # Mid-archival a transaction can be in a new segment and still in the store
+    archived = {t.transaction_id for t in txns}
+    for t in hot:
+        if account_id and t.account_id != account_id:
+            continue
+        if created_after is not None and t.created_at < created_after:
+            continue
+        if created_before is not None and t.created_at >= created_before:
+            continue
+        if t.transaction_id not in archived:
+            txns.append(t)
+    return txns
+
+
 @app.get("/api/v1/transactions", response_model=list[Transaction])
-def list_transactions(
+async def list_transactions(
     x_account_id: Annotated[str | None, Header()] = None,
+    created_after: AwareDatetime | None = None,
+    created_before: AwareDatetime | None = None,
 ) -> list[Transaction]:
-    txns = list(transactions.values())
-    if x_account_id:
-        txns = [t for t in txns if t.account_id == x_account_id]
-    return txns
+    """Transactions oldest first, archived ones included.
+
+    `created_after` is inclusive and `created_before` exclusive; archive
+    segments outside the range are not read at all.
+    """
+    # Creates and the archiver change the store and the segment list on the
+    # event loop, so take both here in one step, then filter in a thread
+    hot = list(transactions.values())
+    segments = None if archive is None else list(archive.segments)
+    return await asyncio.to_thread(
+        select_transactions, hot, segments, x_account_id or None, created_after, created_before,
+    )
+
+
+@app.get("/api/v1/transactions/events")
+async def transaction_events(
+    x_account_id: Annotated[str | None, Header()] = None,
+    account_id: str | None = None,
+    since: Annotated[int | None, Query(ge=0)] = None,
+    last_event_id: Annotated[int | None, Header()] = None,
+) -> StreamingResponse:
+    """Server-sent events for transaction creation and settlement.
+
+    Filter by account with `account_id` or `X-Account-Id`. Resume with `since`
+    or the standard `Last-Event-ID` header sent by reconnecting EventSources.
+    """
+    sub, replay = event_bus.subscribe(
+        account_id or x_account_id,
+        since if since is not None else last_event_id,
+    )
+
+    async def stream():
+        try:
+            for event in replay:
+                yield format_sse(event)
+            while not sub.overflowed:
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(event)
+            # Drain what was buffered, then tell the client to resume from it
+            while not sub.queue.empty():
+                yield format_sse(sub.queue.get_nowait())
+            yield "event: overflow\ndata: {}\n\n"
+        finally:
+            event_bus.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.get("/api/v1/transactions/{transaction_id}", response_model=Transaction)
 def get_transaction(transaction_id: str) -> Transaction:
     txn = transactions.get(transaction_id)
+    if txn is None and archive is not None:
+        txn = archive.get(transaction_id)
     if not txn:
         raise HTTPException(status_code=404, detail="Transaction not found")
     return txn
 
 
+# Admission control for creates, which are what fan out to account-service
+# and fraud-detection. The default in-flight limit matches http_client's
+# connection pool; beyond it, requests would only queue inside the client.
+# Rate limits are off unless configured.
+admission = AdmissionControl(
+    max_in_flight=int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "100")),
+    max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", "500")),
+    max_queue_delay=float(os.getenv("ADMISSION_MAX_QUEUE_MS", "500")) / 1000,
+    rate=float(os.getenv("ADMISSION_RATE", "0")),
+    burst=float(os.getenv("ADMISSION_BURST", "100")),
+    account_rate=float(os.getenv("ADMISSION_ACCOUNT_RATE", "0")),
+    account_burst=float(os.getenv("ADMISSION_ACCOUNT_BURST", "10")),
+    reserve=float(os.getenv("ADMISSION_PRIORITY_RESERVE", "0.2")),
+)
+gauge_function(ADMISSION_LOAD.labels("in_flight"), lambda: admission.in_flight)
+gauge_function(ADMISSION_LOAD.labels("queued"), lambda: admission.queued)
+
+# Credits go ahead of debits when shedding
+PRIORITY_BY_TYPE = {"CREDIT": HIGH, "DEBIT": NORMAL}
+
+
+# Outcome of a create: status code, extra response headers, transaction
+CreateOutcome = tuple[int, dict[str, str], Transaction]
+
+# Creates sent with an Idempotency-Key, so a retried create returns the
+# original transaction instead of checking and storing it again
+idempotency: IdempotencyCache[CreateOutcome] = IdempotencyCache(
+    max_size=int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "100000")),
+    ttl_seconds=float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400")),
+)
+track_store_size("idempotency_keys", lambda: len(idempotency))
+
+
 @app.post("/api/v1/transactions", response_model=Transaction)
-async def create_transaction(req: CreateTransactionRequest) -> Transaction:
+async def create_transaction(
+    req: CreateTransactionRequest,
+    response: Response,
+    prefer: Annotated[str | None, Header()] = None,
+    idempotency_key: Annotated[str | None, Header(min_length=1, max_length=MAX_KEY_LENGTH)] = None,
+) -> Transaction:
+    """Create a transaction.
+
+    With an Idempotency-Key, a repeat of the request (same key and body)
+    gets the original's response, marked `Idempotent-Replayed: true`; a
+    repeat that arrives while the original is still running waits for it.
+    """
+    if req.callback_url is not None and (req.callback_url.host or "").lower() not in CALLBACK_ALLOWED_HOSTS:
+        raise HTTPException(status_code=400, detail="callback_url host is not allowed")
+    respond_async = PROCESSING_MODE == "async" or (prefer is not None and "respond-async" in prefer)
+    if req.callback_url is not None and not respond_async:
+        # Only async creates settle later; a sync one would drop the callback
+        raise HTTPException(
+            status_code=422, detail="callback_url needs async processing (Prefer: respond-async)",
+        )
+    if idempotency_key is None:
+        status_code, headers, transaction = await process_transaction(req, respond_async)
+    else:
+        try:
+            (status_code, headers, transaction), replayed = await idempotency.run(
+                idempotency_key, request_fingerprint(req), lambda: process_transaction(req, respond_async),
+            )
+        except IdempotencyKeyReused:
+            raise HTTPException(
+                status_code=422, detail="Idempotency-Key was already used with a different request",
+            ) from None
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
+    response.status_code = status_code
+    response.headers.update(headers)
+    return transaction
+
+
+async def process_transaction(req: CreateTransactionRequest, respond_async: bool) -> CreateOutcome:
+    try:
+        async with admission.admit(req.account_id, PRIORITY_BY_TYPE[req.transaction_type]):
+            return await admitted_transaction(req, respond_async)
+    except Shed as exc:
+        raise HTTPException(
+            status_code=exc.status_code,
+            detail=exc.detail,
+            headers={"Retry-After": str(exc.retry_after)},
+        ) from None
+
+
+async def admitted_transaction(req: CreateTransactionRequest, respond_async: bool) -> CreateOutcome:
+    if respond_async and fraud_outbox.full():
+        raise HTTPException(
+            status_code=503,
+            detail="Transaction queue is full",
+            headers={"Retry-After": "1"},
+        )
+
     # Verify account exists
     if not await verify_account(req.account_id):
         raise HTTPException(status_code=400, detail="Invalid account ID")
 
-    transaction_id = f"TXN-{len(transactions) + 1:06d}"
+    transaction_id = transaction_ids.next(transactions)
     now = utc_now()
     
     transaction = Transaction(
@@ -109,26 +535,26 @@ async def create_transaction(req: CreateTransactionRequest) -> Transaction:
         status="PENDING",
         created_at=now,
     )
-    
+
+    if respond_async:
+        # Queue the fraud check; the client polls or gets a callback on settlement
+        try:
+            fraud_outbox.submit((transaction_id, None if req.callback_url is None else str(req.callback_url)))
+        except OutboxFull:
+            raise HTTPException(
+                status_code=503,
+                detail="Transaction queue is full",
+                headers={"Retry-After": "1"},
+            ) from None
+        transactions[transaction_id] = transaction
+        publish_transaction(transaction)
+        return 202, {"Location": f"/api/v1/transactions/{transaction_id}"}, transaction
+
     transactions[transaction_id] = transaction
+    publish_transaction(transaction)
     
     # Check for fraud
-    transaction_data = {
-        "transaction_id": transaction_id,
-        "account_id": req.account_id,
-        "amount": req.amount,
-        "transaction_type": req.transaction_type,
-        "description": req.description,
-    }
-    
-    is_fraud = await check_fraud(transaction_data)
+    is_fraud = await check_fraud(fraud_check_payload(transaction))
+    settle_transaction(transaction, is_fraud)
     
-    # Update transaction status
-    if is_fraud:
-        transaction.status = "FAILED"
-        transaction.completed_at = now
-    else:
-        transaction.status = "COMPLETED"
-        transaction.completed_at = now
-    
-    return transaction
+    return 200, {}, transaction
@@ -3,7 +3,8 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Literal
 
-from pydantic import BaseModel, Field
+from banking_common.readiness import ReadinessCheck
+from pydantic import BaseModel, Field, HttpUrl
 
 
 class HealthResponse(BaseModel):
@@ -13,6 +14,14 @@ class HealthResponse(BaseModel):
     time: datetime
 
 
+class ReadinessResponse(BaseModel):
+    status: Literal["ok", "warming", "failed"]
+    service: str
+    environment: str
+    time: datetime
+    checks: list[ReadinessCheck]
+
+
 class Transaction(BaseModel):
     transaction_id: str
     account_id: str
@@ -29,3 +38,6 @@ class CreateTransactionRequest(BaseModel):
     amount: float = Field(gt=0)
     transaction_type: Literal["DEBIT", "CREDIT"]
     description: str = ""
+    # Optional URL that receives the settled transaction; async mode only
+    # (else 422), and its host must be in CALLBACK_ALLOWED_HOSTS
+    callback_url: HttpUrl | None = None
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from banking_common.sharding import ANY, FANOUT, KEY, STREAM, Route, run
+
+# Transactions are partitioned by transaction_id; creates go round-robin and
+# the receiving worker allocates an ID it owns. Creates with an
+# Idempotency-Key go to the key's owner, which holds its cached outcome.
+ROUTES = [
+    Route("GET", r"/api/v1/transactions/events", STREAM),
+    Route(
+        "GET", r"/api/v1/transactions", FANOUT,
+        sort_key=("created_at", "transaction_id"), timestamp_keys=("created_at",),
+    ),
+    Route("POST", r"/api/v1/transactions", ANY, header_key="idempotency-key"),
+    Route(None, r"/api/v1/transactions/(?P<key>[^/]+)(/.*)?", KEY),
+]
+
+if __name__ == "__main__":
+    run(ROUTES, default_port=8092)
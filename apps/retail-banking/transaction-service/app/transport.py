@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import httpx
+from banking_common.readiness import warm_connections
+from banking_common.wire import WireClient
+
+# How transaction-service reaches account-service and fraud-detection. The
+# services normally run apart and talk HTTP (HttpTransport). The retail
+# monolith (apps/retail-banking/monolith) runs all three in one process and
+# swaps in a transport with the same methods that calls the other apps'
+# handler functions directly, skipping JSON and the loopback hop.
+#
+# Every method raises on failure (any exception); callers decide whether to
+# fail open, retry or skip.
+
+
+class HttpTransport:
+    """Calls the downstream services' HTTP APIs through one pooled client"""
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        account_service_url: str,
+        fraud_detection_url: str,
+        use_msgpack: bool = True,
+    ) -> None:
+        self.client = client
+        self.urls = {"account-service": account_service_url, "fraud-detection": fraud_detection_url}
+        # Fraud checks go out in msgpack where fraud-detection takes it (banking_common.wire)
+        self.fraud = WireClient(client, enabled=use_msgpack)
+
+    async def batch_get_accounts(self, account_ids: list[str]) -> dict[str, str | None]:
+        """Status of each account; None for accounts that don't exist"""
+        resp = await self.client.post(
+            f"{self.urls['account-service']}/api/v1/accounts:batchGet",
+            json={"account_ids": account_ids},
+        )
+        resp.raise_for_status()
+        result = resp.json()
+        statuses: dict[str, str | None] = {a["account_id"]: a["status"] for a in result["accounts"]}
+        statuses.update(dict.fromkeys(result["not_found"]))
+        return statuses
+
+    async def list_accounts(self, limit: int, cursor: str | None) -> tuple[dict[str, str], str | None]:
+        """One page of account statuses by account_id, and the cursor for the next page"""
+        params: dict = {"limit": limit, "fields": "status"}
+        if cursor:
+            params["cursor"] = cursor
+        resp = await self.client.get(f"{self.urls['account-service']}/api/v1/accounts", params=params)
+        resp.raise_for_status()
+        return {a["account_id"]: a["status"] for a in resp.json()}, resp.headers.get("X-Next-Cursor")
+
+    async def account_changes(self, since: int, timeout: float) -> dict:
+        """account-service's change feed after `since`, long-polling up to `timeout`"""
+        resp = await self.client.get(
+            f"{self.urls['account-service']}/api/v1/accounts/changes",
+            params={"since": since, "timeout": timeout},
+            timeout=timeout + 5,
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+    async def check_fraud(self, payload: dict) -> bool:
+        """Whether fraud-detection flags the transaction"""
+        result = await self.fraud.post(f"{self.urls['fraud-detection']}/api/v1/check", payload)
+        return result.get("is_fraud", False)
+
+    async def check_fraud_batch(self, payloads: list[dict]) -> dict[str, bool]:
+        """is_fraud by transaction ID"""
+        results = await self.fraud.post(f"{self.urls['fraud-detection']}/api/v1/check/batch", payloads)
+        return {r["transaction_id"]: r.get("is_fraud", False) for r in results}
+
+    async def warm_up(self, service: str, connections: int) -> None:
+        """Open `connections` pooled connections to a downstream ahead of traffic"""
+        await warm_connections(self.client, self.urls[service], connections)
+
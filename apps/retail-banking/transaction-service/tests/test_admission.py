@@ -0,0 +1,42 @@
+import pytest
+
+from app.admission import AdmissionControl, Shed
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_account_token_refunded_when_shed_for_rate():
+    control = AdmissionControl(
+        max_in_flight=10, max_queue=10, max_queue_delay=1.0,
+        rate=0.001, burst=1, account_rate=0.001, account_burst=2, reserve=0.0,
+    )
+    async with control.admit("ACC-001"):
+        pass
+    # The global bucket is empty now; the account still has one token
+    with pytest.raises(Shed) as shed:
+        async with control.admit("ACC-001"):
+            pass
+    assert shed.value.status_code == 503
+    assert control._accounts["ACC-001"].tokens == pytest.approx(1, abs=0.01)
+
+
+async def test_account_token_refunded_when_queue_full():
+    control = AdmissionControl(
+        max_in_flight=1, max_queue=0, max_queue_delay=1.0, account_rate=0.001, account_burst=2,
+    )
+    async with control.admit("ACC-001"):
+        with pytest.raises(Shed) as shed:
+            async with control.admit("ACC-002"):
+                pass
+    assert shed.value.status_code == 503
+    assert control._accounts["ACC-002"].tokens == pytest.approx(2, abs=0.01)
+
+
+async def test_account_rate_still_limits():
+    control = AdmissionControl(max_in_flight=10, max_queue=10, max_queue_delay=1.0, account_rate=0.001, account_burst=1)
+    async with control.admit("ACC-001"):
+        pass
+    with pytest.raises(Shed) as shed:
+        async with control.admit("ACC-001"):
+            pass
+    assert shed.value.status_code == 429
@@ -0,0 +1,130 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.archive import TransactionArchive, archive_cold_transactions, select_cold
+from app.models import Transaction
+
+pytestmark = pytest.mark.anyio
+
+START = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+def txn(n: int, account_id: str = "ACC-001", status: str = "COMPLETED") -> Transaction:
+    created_at = START + timedelta(minutes=n)
+    return Transaction(
+        transaction_id=f"TXN-{n:06d}",
+        account_id=account_id,
+        amount=n + 0.25,
+        transaction_type="DEBIT" if n % 2 else "CREDIT",
+        description=f"txn {n}",
+        status=status,
+        created_at=created_at,
+        completed_at=None if status == "PENDING" else created_at + timedelta(seconds=1),
+    )
+
+
+def store(txns: list[Transaction]) -> dict[str, Transaction]:
+    return {t.transaction_id: t for t in txns}
+
+
+async def test_append_and_get_round_trip(tmp_path):
+    archive = TransactionArchive(str(tmp_path))
+    txns = [txn(n, account_id=f"ACC-00{n % 3}") for n in range(1, 11)]
+    txns.append(txn(11, status="FAILED"))
+    await archive.append(txns, segment_rows=4)
+
+    assert len(archive.segments) == 3
+    assert len(archive) == 11
+    assert archive.max_transaction_id == "TXN-000011"
+    for t in txns:
+        assert archive.get(t.transaction_id) == t
+    assert archive.get("TXN-999999") is None
+
+
+async def test_scan_filters_by_account_and_time(tmp_path):
+    archive = TransactionArchive(str(tmp_path))
+    txns = [txn(n, account_id="ACC-001" if n % 2 else "ACC-002") for n in range(1, 21)]
+    await archive.append(txns, segment_rows=5)
+
+    assert list(archive.scan()) == txns
+    assert list(archive.scan(account_id="ACC-002")) == [t for t in txns if t.account_id == "ACC-002"]
+    after, before = START + timedelta(minutes=4), START + timedelta(minutes=12)
+    assert list(archive.scan(created_after=after, created_before=before)) == txns[3:11]
+    assert list(archive.scan(account_id="ACC-003")) == []
+
+
+async def test_scan_reads_given_segments_only(tmp_path):
+    archive = TransactionArchive(str(tmp_path))
+    await archive.append([txn(1), txn(2)], segment_rows=2)
+    segments = list(archive.segments)
+    await archive.append([txn(3)], segment_rows=2)
+    assert [t.transaction_id for t in archive.scan(segments=segments)] == ["TXN-000001", "TXN-000002"]
+
+
+async def test_reopened_archive_continues(tmp_path):
+    first = TransactionArchive(str(tmp_path))
+    await first.append([txn(1), txn(2)], segment_rows=1)
+
+    reopened = TransactionArchive(str(tmp_path), cache_segments=1)
+    assert len(reopened) == 2
+    assert reopened.get("TXN-000001") == txn(1)
+    await reopened.append([txn(3)], segment_rows=1)
+    assert [s.path.rsplit("/", 1)[1] for s in reopened.segments] == [
+        "00000001.txseg", "00000002.txseg", "00000003.txseg",
+    ]
+    assert [t.transaction_id for t in reopened.scan()] == ["TXN-000001", "TXN-000002", "TXN-000003"]
+
+
+async def test_ids_compare_by_length_first(tmp_path):
+    archive = TransactionArchive(str(tmp_path))
+    await archive.append([txn(999), txn(1000000)], segment_rows=10)
+    assert archive.max_transaction_id == "TXN-1000000"
+    assert archive.get("TXN-1000000") == txn(1000000)
+
+
+def test_select_cold_keeps_pending_and_recent():
+    txns = [txn(1), txn(2, status="PENDING"), txn(3), txn(4), txn(5)]
+    cutoff = START + timedelta(minutes=4)
+    cold = select_cold(store(txns), cutoff, max_hot=10, limit=10)
+    assert [t.transaction_id for t in cold] == ["TXN-000001", "TXN-000003"]
+
+
+def test_select_cold_trims_to_max_hot_and_limit():
+    txns = [txn(n) for n in range(1, 11)]
+    assert len(select_cold(store(txns), START, max_hot=6, limit=10)) == 4
+    assert len(select_cold(store(txns), START, max_hot=0, limit=3)) == 3
+
+
+async def test_archiver_moves_cold_transactions_out_of_store(tmp_path):
+    archive = TransactionArchive(str(tmp_path))
+    txns = [txn(1), txn(2, status="PENDING"), txn(3)]
+    transactions = store(txns)
+    task = asyncio.create_task(archive_cold_transactions(
+        archive, transactions, timedelta(0), max_hot=100, segment_rows=10, interval_seconds=0.01,
+    ))
+    try:
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            if len(transactions) == 1:
+                break
+    finally:
+        task.cancel()
+    assert list(transactions) == ["TXN-000002"]
+    assert [t.transaction_id for t in archive.scan()] == ["TXN-000001", "TXN-000003"]
+
+
+async def test_listing_counts_transactions_mid_archival_once(tmp_path, monkeypatch):
+    from app import main
+
+    archive = TransactionArchive(str(tmp_path))
+    monkeypatch.setattr(main, "archive", archive)
+    txns = [txn(1), txn(2), txn(3, account_id="ACC-002")]
+    # Segment written, store not yet trimmed
+    await archive.append(txns[:2], segment_rows=10)
+    listed = main.select_transactions(txns, list(archive.segments), None, None, None)
+    assert [t.transaction_id for t in listed] == ["TXN-000001", "TXN-000002", "TXN-000003"]
+
+    listed = main.select_transactions(txns, list(archive.segments), "ACC-002", None, None)
+    assert [t.transaction_id for t in listed] == ["TXN-000003"]
@@ -0,0 +1,196 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from app.idempotency import IdempotencyCache, IdempotencyKeyReused, request_fingerprint
+
+pytestmark = pytest.mark.anyio
+
+
+class Body(BaseModel):
+    amount: float
+
+
+class Calls:
+    """A create that counts how often it actually ran"""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self) -> str:
+        self.count += 1
+        await self.release.wait()
+        return f"created-{self.count}"
+
+
+FINGERPRINT = request_fingerprint(Body(amount=10))
+
+
+def test_fingerprint_follows_body():
+    assert request_fingerprint(Body(amount=10)) == FINGERPRINT
+    assert request_fingerprint(Body(amount=11)) != FINGERPRINT
+
+
+async def test_retry_replays_outcome():
+    cache: IdempotencyCache[str] = IdempotencyCache(max_size=10, ttl_seconds=60)
+    create = Calls()
+    assert await cache.run("k", FINGERPRINT, create) == ("created-1", False)
+    assert await cache.run("k", FINGERPRINT, create) == ("created-1", True)
+    assert create.count == 1
+    assert cache.replays == 1
+
+
+async def test_concurrent_retries_wait_for_original():
+    cache: IdempotencyCache[str] = IdempotencyCache(max_size=10, ttl_seconds=60)
+    create = Calls()
+    create.release.clear()
+    original = asyncio.create_task(cache.run("k", FINGERPRINT, create))
+    await asyncio.sleep(0)
+    retries = [asyncio.create_task(cache.run("k", FINGERPRINT, create)) for _ in range(3)]
+    await asyncio.sleep(0)
+    create.release.set()
+    assert await original == ("created-1", False)
+    assert [await r for r in retries] == [("created-1", True)] * 3
+    assert create.count == 1
+
+
+async def test_key_reused_with_different_body():
+    cache: IdempotencyCache[str] = IdempotencyCache(max_size=10, ttl_seconds=60)
+    await cache.run("k", FINGERPRINT, Calls())
+    with pytest.raises(IdempotencyKeyReused):
+        await cache.run("k", request_fingerprint(Body(amount=11)), Calls())
+
+
+async def test_failed_original_is_not_kept():
+    cache: IdempotencyCache[str] = IdempotencyCache(max_size=10, ttl_seconds=60)
+
+    async def fail() -> str:
+        raise RuntimeError("downstream unavailable")
+
+    with pytest.raises(RuntimeError):
+        await cache.run("k", FINGERPRINT, fail)
+    assert len(cache) == 0
+    assert await cache.run("k", FINGERPRINT, Calls()) == ("created-1", False)
+
+
+async def test_waiters_see_original_failure():
+    cache: IdempotencyCache[str] = IdempotencyCache(max_size=10, ttl_seconds=60)
+    release = asyncio.Event()
+
+    async def fail() -> str:
+        await release.wait()
+        raise RuntimeError("downstream unavailable")
+
+    original = asyncio.create_task(cache.run("k", FINGERPRINT, fail))
+    await asyncio.sleep(0)
+    retry = asyncio.create_task(cache.run("k", FINGERPRINT, Calls()))
+    await asyncio.sleep(0)
+    release.set()
+    for task in (original, retry):
+        with pytest.raises(RuntimeError):
+            await task
+
+
+async def test_cancelled_waiter_does_not_cancel_original():
+    cache: IdempotencyCache[str] = IdempotencyCache(max_size=10, ttl_seconds=60)
+    create = Calls()
+    create.release.clear()
+    original = asyncio.create_task(cache.run("k", FINGERPRINT, create))
+    await asyncio.sleep(0)
+    retry = asyncio.create_task(cache.run("k", FINGERPRINT, create))
+    await asyncio.sleep(0)
+    retry.cancel()
+    create.release.set()
+    assert await original == ("created-1", False)
+
+
+async def test_expired_outcome_runs_again():
+    cache: IdempotencyCache[str] = IdempotencyCache(max_size=10, ttl_seconds=0)
+    create = Calls()
+    await cache.run("k", FINGERPRINT, create)
+    await asyncio.sleep(0.01)
+    assert await cache.run("k", FINGERPRINT, create) == ("created-2", False)
+
+
+async def test_least_recently_used_keys_evicted():
+    cache: IdempotencyCache[str] = IdempotencyCache(max_size=2, ttl_seconds=60)
+    create = Calls()
+    await cache.run("a", FINGERPRINT, create)
+    await cache.run("b", FINGERPRINT, create)
+    await cache.run("a", FINGERPRINT, create)
+    await cache.run("c", FINGERPRINT, create)
+    assert len(cache) == 2
+    assert (await cache.run("a", FINGERPRINT, create))[1]
+    assert not (await cache.run("b", FINGERPRINT, create))[1]
+
+
+async def test_in_flight_key_not_evicted():
+    cache: IdempotencyCache[str] = IdempotencyCache(max_size=1, ttl_seconds=60)
+    slow = Calls()
+    slow.release.clear()
+    original = asyncio.create_task(cache.run("a", FINGERPRINT, slow))
+    await asyncio.sleep(0)
+    await cache.run("b", FINGERPRINT, Calls())
+    await cache.run("c", FINGERPRINT, Calls())
+    retry = asyncio.create_task(cache.run("a", FINGERPRINT, slow))
+    await asyncio.sleep(0)
+    slow.release.set()
+    assert await original == ("created-1", False)
+    assert await retry == ("created-1", True)
+    assert slow.count == 1
+    # Finished keys make room again
+    await cache.run("d", FINGERPRINT, Calls())
+    assert len(cache) == 1
+
+
+class StubTransport:
+    """Every account active, nothing flagged, nothing to warm"""
+
+    async def batch_get_accounts(self, account_ids: list[str]) -> dict[str, str | None]:
+        return dict.fromkeys(account_ids, "ACTIVE")
+
+    async def list_accounts(self, limit: int, cursor: str | None) -> tuple[dict[str, str], str | None]:
+        return {}, None
+
+    async def account_changes(self, since: int, timeout: float) -> dict:
+        await asyncio.sleep(timeout)
+        return {"changes": [], "next_seq": since, "reset": False}
+
+    async def check_fraud(self, payload: dict) -> bool:
+        return False
+
+    async def check_fraud_batch(self, payloads: list[dict]) -> dict[str, bool]:
+        return {p["transaction_id"]: False for p in payloads}
+
+    async def warm_up(self, service: str, connections: int) -> None:
+        pass
+
+
+@pytest.fixture
+def api(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app import main
+
+    monkeypatch.setattr(main, "transport", StubTransport())
+    with TestClient(main.app) as client:
+        yield client
+
+
+BODY = {"account_id": "ACC-001", "amount": 25.0, "transaction_type": "DEBIT", "description": "test"}
+
+
+def test_create_replays_by_key(api):
+    headers = {"Idempotency-Key": "create-1"}
+    first = api.post("/api/v1/transactions", json=BODY, headers=headers)
+    retry = api.post("/api/v1/transactions", json=BODY, headers=headers)
+    assert first.status_code == retry.status_code
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+
+    other = api.post("/api/v1/transactions", json={**BODY, "amount": 26.0}, headers=headers)
+    assert other.status_code == 422
@@ -0,0 +1,817 @@
+#!/usr/bin/env python3
+"""
+Local load-test and benchmark harness for the Python banking services.
+
+Starts account-service, transaction-service, fraud-detection, credit-scoring,
+loans-api and corp-banking-api with uvicorn on localhost, wires their
+inter-service URLs to each other, drives a mixed workload per service and
+prints per-endpoint throughput and p50/p95/p99 latency as JSON.
+
+The summary gates mirror the Argo Rollouts analysis templates so a canary's
+chances can be checked before pushing:
+- latency-threshold: p95 < 500 ms
+- throughput:        > 10 req/s
+- success-rate:      >= 99% 2xx
+
+Usage:
+    python scripts/benchmark_services.py                      # all workloads
+    python scripts/benchmark_services.py --workload loans-api --duration 20
+    python scripts/benchmark_services.py --compare scripts/benchmark-baseline.json
+    python scripts/benchmark_services.py --update-baseline
+    python scripts/benchmark_services.py --workload account-service --scaling 1,2,4
+    python scripts/benchmark_services.py --bulk
+    python scripts/benchmark_services.py --watchlist-sizes 0,1000,10000,100000
+    python scripts/benchmark_services.py --composition
+    python scripts/benchmark_services.py --wire-formats
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+import msgpack
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "benchmark-baseline.json"
+
+# Same thresholds as argocd/argo-rollouts/analysis-templates/*.yaml
+LATENCY_P95_MS_GATE = 500.0
+THROUGHPUT_RPS_GATE = 10.0
+SUCCESS_RATE_GATE = 0.99
+
+
+@dataclass
+class Service:
+    name: str
+    path: str
+    port: int
+    env: dict[str, str] = field(default_factory=dict)
+    # Has app/serve.py and can run partitioned across worker processes
+    multi_worker: bool = False
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+
+def build_services(port_offset: int) -> dict[str, Service]:
+    def port(p: int) -> int:
+        return p + port_offset
+
+    account = f"http://127.0.0.1:{port(8091)}"
+    fraud = f"http://127.0.0.1:{port(8093)}"
+    credit = f"http://127.0.0.1:{port(8085)}"
+    services = [
+        Service("account-service", "apps/retail-banking/account-service", port(8091),
+                multi_worker=True),
+        Service("fraud-detection", "apps/retail-banking/fraud-detection", port(8093)),
+        Service(
+            "transaction-service",
+            "apps/retail-banking/transaction-service",
+            port(8092),
+            {"ACCOUNT_SERVICE_URL": account, "FRAUD_DETECTION_URL": fraud},
+            multi_worker=True,
+        ),
+        Service("credit-scoring", "apps/loans/credit-scoring", port(8085)),
+        Service(
+            "loans-api",
+            "apps/loans/loans-api",
+            port(8083),
+            # Room for bulk intake runs; scoring drains slower than intake here
+            {"CREDIT_SCORING_URL": credit, "LOAN_SCORING_QUEUE_SIZE": "100000"},
+            multi_worker=True,
+        ),
+        Service("corp-banking-api", "apps/corporate-banking/corp-banking-api", port(8080)),
+    ]
+    return {s.name: s for s in services}
+
+
+def build_monolith(port_offset: int) -> Service:
+    """account-service, transaction-service and fraud-detection in one process"""
+    return Service("retail-monolith", "apps/retail-banking/monolith", 8095 + port_offset)
+
+
+# A request is (method, endpoint label, path, json body). The label is the
+# route template so results aggregate per endpoint rather than per URL.
+Request = tuple[str, str, str, "dict | list | None"]
+RequestFactory = Callable[[random.Random], Request]
+
+
+@dataclass
+class Workload:
+    service: str
+    # (weight, factory) pairs; factories are picked proportionally to weight
+    mix: list[tuple[int, RequestFactory]]
+
+    def next_request(self, rng: random.Random) -> Request:
+        total = sum(w for w, _ in self.mix)
+        pick = rng.uniform(0, total)
+        for weight, factory in self.mix:
+            pick -= weight
+            if pick <= 0:
+                return factory(rng)
+        return self.mix[-1][1](rng)
+
+
+RETAIL_ACCOUNTS = ["ACC-001", "ACC-002"]
+RETAIL_CUSTOMERS = ["CUST-001", "CUST-002"]
+CORP_ACCOUNTS = ["ACCT-10001", "ACCT-10002", "ACCT-20001"]
+
+
+def _transaction_body(rng: random.Random) -> dict:
+    return {
+        "account_id": rng.choice(RETAIL_ACCOUNTS),
+        "amount": round(rng.uniform(5, 12000), 2),
+        "transaction_type": rng.choice(["DEBIT", "CREDIT"]),
+        "description": "benchmark",
+    }
+
+
+def _score_body(rng: random.Random) -> dict:
+    return {
+        "applicant_id": f"APPL-{rng.randint(1, 500):04d}",
+        "income_annual": rng.choice([25000.0, 55000.0, 85000.0, 150000.0]),
+        "debt_existing": rng.choice([0.0, 5000.0, 20000.0, 60000.0]),
+        "credit_history_length_years": rng.randint(0, 20),
+        "num_credit_lines": rng.randint(1, 10),
+        "recent_delinquencies": rng.choice([0, 0, 0, 1, 2]),
+        "employment_type": rng.choice(["FULL_TIME", "PART_TIME", "SELF_EMPLOYED", "UNEMPLOYED"]),
+        "loan_amount": rng.choice([5000.0, 25000.0, 250000.0]),
+        "loan_purpose": rng.choice(["HOME_LOAN", "AUTO_LOAN", "PERSONAL", "BUSINESS"]),
+    }
+
+
+def _application_body(rng: random.Random) -> dict:
+    body = _score_body(rng)
+    body["term_months"] = rng.choice([12, 36, 60, 240])
+    return body
+
+
+_application_seq = iter(range(1, 10**9))
+
+
+# Applicants the credit-scoring workload has scored, so lookups ask for
+# scores that exist rather than counting 404s against the success rate
+_scored_applicants: list[str] = []
+
+
+def _score_applicant(rng: random.Random) -> Request:
+    body = _score_body(rng)
+    _scored_applicants.append(body["applicant_id"])
+    return ("POST", "POST /api/v1/score", "/api/v1/score", body)
+
+
+def _get_score(rng: random.Random) -> Request:
+    if not _scored_applicants:
+        return _score_applicant(rng)
+    applicant_id = rng.choice(_scored_applicants)
+    return ("GET", "GET /api/v1/score/{applicant_id}", f"/api/v1/score/{applicant_id}", None)
+
+
+def _create_application(rng: random.Random) -> Request:
+    body = _application_body(rng)
+    body["application_id"] = f"APP-BENCH-{next(_application_seq):08d}"
+    return ("POST", "POST /api/v1/applications", "/api/v1/applications", body)
+
+
+WORKLOADS: dict[str, Workload] = {
+    "account-service": Workload("account-service", [
+        (80, lambda r: ("GET", "GET /api/v1/accounts/{account_id}",
+                        f"/api/v1/accounts/{r.choice(RETAIL_ACCOUNTS)}", None)),
+        (15, lambda r: ("GET", "GET /api/v1/accounts", "/api/v1/accounts", None)),
+        (5, lambda r: ("POST", "POST /api/v1/accounts", "/api/v1/accounts", {
+            "customer_id": r.choice(RETAIL_CUSTOMERS),
+            "account_number": str(r.randrange(10**12)),
+            "initial_balance": 100.0,
+        })),
+    ]),
+    "fraud-detection": Workload("fraud-detection", [
+        (100, lambda r: ("POST", "POST /api/v1/check", "/api/v1/check", {
+            "transaction_id": f"TXN-{r.randint(1, 999999):06d}",
+            **_transaction_body(r),
+        })),
+    ]),
+    "transaction-service": Workload("transaction-service", [
+        (60, lambda r: ("POST", "POST /api/v1/transactions", "/api/v1/transactions",
+                        _transaction_body(r))),
+        (30, lambda r: ("GET", "GET /api/v1/transactions/{transaction_id}",
+                        f"/api/v1/transactions/TXN-{r.randint(1, 50):06d}", None)),
+        (10, lambda r: ("GET", "GET /api/v1/transactions", "/api/v1/transactions", None)),
+    ]),
+    "credit-scoring": Workload("credit-scoring", [
+        (70, _score_applicant),
+        (30, _get_score),
+    ]),
+    "loans-api": Workload("loans-api", [
+        (40, _create_application),
+        (40, lambda r: ("GET", "GET /api/v1/applications", "/api/v1/applications", None)),
+        (20, lambda r: ("GET", "GET /api/v1/applications/{application_id}",
+                        f"/api/v1/applications/APP-BENCH-{r.randint(1, 50):08d}", None)),
+    ]),
+    "corp-banking-api": Workload("corp-banking-api", [
+        (35, lambda r: ("GET", "GET /api/v1/accounts", "/api/v1/accounts", None)),
+        (25, lambda r: ("GET", "GET /api/v1/accounts/{account_id}",
+                        f"/api/v1/accounts/{r.choice(CORP_ACCOUNTS)}", None)),
+        (20, lambda r: ("GET", "GET /api/v1/approvals/pending", "/api/v1/approvals/pending", None)),
+        (20, lambda r: ("GET", "GET /api/v1/treasury/positions", "/api/v1/treasury/positions", None)),
+    ]),
+}
+
+
+@dataclass
+class BulkComparison:
+    """The same items submitted one per request and through a bulk endpoint"""
+    service: str
+    # Formatted with the item, e.g. "/api/v1/things/{thing_id}/approve"
+    single_path: str
+    bulk_path: str
+    # Bulk body is {bulk_key: [item, ...]}
+    bulk_key: str
+    item: Callable[[random.Random], dict]
+    # Runs untimed before each phase with the items about to be sent, to
+    # create the records they act on and fill in their IDs
+    prepare: Callable[[httpx.AsyncClient, list[dict]], Awaitable[None]] | None = None
+
+
+async def _create_approvals(client: httpx.AsyncClient, items: list[dict]) -> None:
+    for item in items:
+        resp = await client.post("/api/v1/approvals", json={
+            "type": "PAYMENT", "requested_by": "benchmark", "amount": 1000.0, "currency": "USD",
+        })
+        resp.raise_for_status()
+        item["approval_id"] = resp.json()["approval_id"]
+
+
+BULK_COMPARISONS: dict[str, BulkComparison] = {
+    "loans-api:applications": BulkComparison(
+        "loans-api", "/api/v1/applications", "/api/v1/applications:batch", "applications",
+        _application_body,
+    ),
+    "account-service:accounts": BulkComparison(
+        "account-service", "/api/v1/accounts", "/api/v1/accounts:bulkCreate", "accounts",
+        lambda r: {"customer_id": r.choice(RETAIL_CUSTOMERS), "account_number": str(r.randrange(10**12))},
+    ),
+    "corp-banking-api:approvals": BulkComparison(
+        "corp-banking-api", "/api/v1/approvals/{approval_id}/approve", "/api/v1/approvals:bulkDecide",
+        "decisions", lambda r: {"approval_id": None, "decision": "APPROVE"}, _create_approvals,
+    ),
+}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(latencies_ms: list[float], errors: int, elapsed: float) -> dict:
+    values = sorted(latencies_ms)
+    count = len(values)
+    return {
+        "requests": count,
+        "errors": errors,
+        "success_rate": round((count - errors) / count, 4) if count else 0.0,
+        "throughput_rps": round(count / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(values, 50), 2),
+        "p95_ms": round(percentile(values, 95), 2),
+        "p99_ms": round(percentile(values, 99), 2),
+    }
+
+
+async def run_workload(workload: Workload, base_url: str, duration: float,
+                       concurrency: int, seed: int) -> dict:
+    """Closed-loop load: `concurrency` clients issue requests back to back"""
+    samples: dict[str, list[float]] = {}
+    errors: dict[str, int] = {}
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        async def worker(worker_id: int) -> None:
+            rng = random.Random(seed + worker_id)
+            while time.perf_counter() < deadline:
+                method, label, path, body = workload.next_request(rng)
+                start = time.perf_counter()
+                try:
+                    resp = await client.request(method, path, json=body)
+                    failed = not resp.is_success
+                except httpx.HTTPError:
+                    failed = True
+                samples.setdefault(label, []).append((time.perf_counter() - start) * 1000)
+                if failed:
+                    errors[label] = errors.get(label, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    all_latencies = [v for values in samples.values() for v in values]
+    result = summarize(all_latencies, sum(errors.values()), elapsed)
+    result["endpoints"] = {
+        label: summarize(values, errors.get(label, 0), elapsed)
+        for label, values in sorted(samples.items())
+    }
+    result["gates"] = {
+        "latency-threshold": result["p95_ms"] < LATENCY_P95_MS_GATE,
+        "throughput": result["throughput_rps"] > THROUGHPUT_RPS_GATE,
+        "success-rate": result["success_rate"] >= SUCCESS_RATE_GATE,
+    }
+    return result
+
+
+def start_service(service: Service, workers: int = 1) -> subprocess.Popen:
+    env = {**os.environ, "ENVIRONMENT": "benchmark", **service.env}
+    if service.multi_worker and workers > 1:
+        cmd = ["-m", "app.serve", "--host", "127.0.0.1", "--port", str(service.port),
+               "--workers", str(workers)]
+    else:
+        cmd = ["-m", "uvicorn", "app.main:app",
+               "--host", "127.0.0.1", "--port", str(service.port), "--log-level", "warning"]
+    return subprocess.Popen(
+        [sys.executable, *cmd],
+        cwd=REPO_ROOT / service.path,
+        env=env,
+        stdout=subprocess.DEVNULL if workers > 1 else None,
+    )
+
+
+def wait_healthy(service: Service, timeout: float = 30.0, path: str = "/health") -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{service.url}{path}", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{service.name} did not answer {path} on {service.url}")
+
+
+@contextmanager
+def running_services(args: argparse.Namespace, workers: int = 1) -> Iterator[dict[str, Service]]:
+    """Start every service, yield them once healthy, stop them afterwards"""
+    services = build_services(args.port_offset)
+    procs = [start_service(s, workers) for s in services.values()]
+    try:
+        for service in services.values():
+            wait_healthy(service)
+        yield services
+    finally:
+        # Stop dependents first so e.g. transaction-service's long-poll on
+        # account-service's change feed doesn't hold up its shutdown
+        for proc in reversed(procs):
+            stop_service(proc)
+
+
+def stop_service(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def run_suite(args: argparse.Namespace, selected: list[str], workers: int = 1) -> dict:
+    """Start every service, run the selected workloads, stop the services"""
+    results: dict = {}
+    with running_services(args, workers) as services:
+        for name in selected:
+            workload = WORKLOADS[name]
+            base_url = services[workload.service].url
+            if args.warmup > 0:
+                asyncio.run(run_workload(workload, base_url, args.warmup, args.concurrency, args.seed))
+            print(f"running {name} for {args.duration}s (workers={workers}) ...", file=sys.stderr)
+            results[name] = asyncio.run(
+                run_workload(workload, base_url, args.duration, args.concurrency, args.seed)
+            )
+    return results
+
+
+async def run_bulk_comparison(comparison: BulkComparison, base_url: str, items: int,
+                              batch_size: int, concurrency: int, seed: int) -> dict:
+    """Time `items` single calls (with `concurrency` clients) against bulk calls of `batch_size`"""
+    rng = random.Random(seed)
+    bodies = [comparison.item(rng) for _ in range(items)]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        if comparison.prepare is not None:
+            await comparison.prepare(client, bodies)
+        pending = iter(bodies)
+        single_errors = 0
+
+        async def single_worker() -> None:
+            nonlocal single_errors
+            for body in pending:
+                resp = await client.post(comparison.single_path.format_map(body), json=body)
+                single_errors += resp.status_code >= 400
+
+        started = time.perf_counter()
+        await asyncio.gather(*(single_worker() for _ in range(concurrency)))
+        single_elapsed = time.perf_counter() - started
+
+        chunks = [
+            [comparison.item(rng) for _ in range(min(batch_size, items - start))]
+            for start in range(0, items, batch_size)
+        ]
+        if comparison.prepare is not None:
+            await comparison.prepare(client, [item for chunk in chunks for item in chunk])
+        batch_latencies = []
+        bulk_errors = 0
+        started = time.perf_counter()
+        for chunk in chunks:
+            call_started = time.perf_counter()
+            resp = await client.post(comparison.bulk_path, json={comparison.bulk_key: chunk})
+            batch_latencies.append((time.perf_counter() - call_started) * 1000)
+            if resp.status_code >= 400:
+                bulk_errors += len(chunk)
+            else:
+                bulk_errors += len(resp.json().get("errors", []))
+        bulk_elapsed = time.perf_counter() - started
+
+    return {
+        "items": items,
+        "single": {
+            "requests": items,
+            "errors": single_errors,
+            "elapsed_s": round(single_elapsed, 3),
+            "items_per_s": round(items / single_elapsed, 1),
+        },
+        "bulk": {
+            "requests": len(batch_latencies),
+            "batch_size": batch_size,
+            "errors": bulk_errors,
+            "elapsed_s": round(bulk_elapsed, 3),
+            "items_per_s": round(items / bulk_elapsed, 1),
+            "p50_batch_ms": round(percentile(sorted(batch_latencies), 50), 2),
+        },
+        "speedup": round(single_elapsed / bulk_elapsed, 2),
+    }
+
+
+def run_bulk(args: argparse.Namespace) -> dict:
+    results = {}
+    with running_services(args) as services:
+        for name, comparison in BULK_COMPARISONS.items():
+            print(f"comparing {name}: {args.bulk_items} single vs bulk ...", file=sys.stderr)
+            results[name] = asyncio.run(run_bulk_comparison(
+                comparison, services[comparison.service].url, args.bulk_items,
+                args.batch_size, args.concurrency, args.seed,
+            ))
+    return {"concurrency": args.concurrency, "bulk": results}
+
+
+def run_scaling(args: argparse.Namespace, selected: list[str]) -> dict:
+    """Throughput and latency per workload as worker processes go from 1 to N"""
+    scaling: dict = {}
+    for workers in args.scaling:
+        for name, result in run_suite(args, selected, workers).items():
+            scaling.setdefault(name, {})[str(workers)] = {
+                k: result[k] for k in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "errors")
+            }
+    for points in scaling.values():
+        base = points[str(args.scaling[0])]["throughput_rps"] or 1.0
+        for point in points.values():
+            point["speedup"] = round(point["throughput_rps"] / base, 2)
+    return {"duration_s": args.duration, "concurrency": args.concurrency, "scaling": scaling}
+
+
+def write_watchlist(path: Path, size: int, rng: random.Random) -> None:
+    """`size` random entries per fraud-detection watchlist, plus one per list
+    that the fraud-detection workload's requests hit, so every check takes
+    the matching path through all four lists"""
+    def word(n: int) -> str:
+        return "".join(rng.choice(string.ascii_lowercase) for _ in range(n))
+
+    path.write_text(json.dumps({
+        "account_ids": {"entries": ["ACC-001", *(f"ACC-{i:08d}" for i in range(size))]},
+        "account_prefixes": {"entries": ["ACC-00", *(f"{word(3).upper()}-{word(2)}" for _ in range(size))]},
+        "account_substrings": {"entries": ["c-0", *(word(6) for _ in range(size))]},
+        "description_keywords": {"entries": ["bench", *(word(rng.randint(4, 10)) for _ in range(size))]},
+    }))
+
+
+async def time_batch_checks(base_url: str, batches: int, batch_size: int, seed: int) -> dict:
+    """p50 of `batches` calls to /api/v1/check/batch, and the implied cost per check"""
+    rng = random.Random(seed)
+    latencies = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+        for _ in range(batches):
+            body = [
+                {"transaction_id": f"TXN-{rng.randint(1, 999999):06d}", **_transaction_body(rng)}
+                for _ in range(batch_size)
+            ]
+            started = time.perf_counter()
+            resp = await client.post("/api/v1/check/batch", json=body)
+            latencies.append((time.perf_counter() - started) * 1000)
+            resp.raise_for_status()
+    p50 = percentile(sorted(latencies), 50)
+    return {"p50_batch_ms": round(p50, 2), "per_check_us": round(p50 * 1000 / batch_size, 1)}
+
+
+def run_watchlist_scaling(args: argparse.Namespace) -> dict:
+    """fraud-detection check cost as its watchlists grow"""
+    sizes: dict = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.watchlist_sizes:
+            path = Path(tmp) / f"watchlist-{size}.json"
+            write_watchlist(path, size, random.Random(args.seed))
+            service = build_services(args.port_offset)["fraud-detection"]
+            service.env["WATCHLIST_PATH"] = str(path)
+            print(f"fraud-detection with {size} entries per watchlist ...", file=sys.stderr)
+            proc = start_service(service)
+            try:
+                # /ready turns 200 once the watchlist is compiled
+                wait_healthy(service, timeout=120.0, path="/ready")
+                workload = WORKLOADS["fraud-detection"]
+                if args.warmup > 0:
+                    asyncio.run(run_workload(workload, service.url, args.warmup, args.concurrency, args.seed))
+                result = asyncio.run(
+                    run_workload(workload, service.url, args.duration, args.concurrency, args.seed)
+                )
+                point = {k: result[k] for k in ("throughput_rps", "p50_ms", "p95_ms", "errors")}
+                point.update(asyncio.run(time_batch_checks(service.url, 20, args.batch_size, args.seed)))
+                sizes[str(size)] = point
+            finally:
+                stop_service(proc)
+    base = sizes[str(args.watchlist_sizes[0])]["per_check_us"] or 1.0
+    for point in sizes.values():
+        point["per_check_vs_smallest"] = round(point["per_check_us"] / base, 2)
+    return {"duration_s": args.duration, "concurrency": args.concurrency, "watchlist_sizes": sizes}
+
+
+# End-to-end creates only: each one looks up the account and runs the fraud
+# check, so it exercises every inter-service call
+CREATE_TRANSACTIONS = Workload("transaction-service", [
+    (1, lambda r: ("POST", "POST /api/v1/transactions", "/api/v1/transactions", _transaction_body(r))),
+])
+
+
+def run_composition(args: argparse.Namespace) -> dict:
+    """create_transaction throughput with the retail services as separate
+    processes talking HTTP, and as the monolith calling each other in process"""
+    def measure(base_url: str) -> dict:
+        if args.warmup > 0:
+            asyncio.run(run_workload(CREATE_TRANSACTIONS, base_url, args.warmup, args.concurrency, args.seed))
+        result = asyncio.run(
+            run_workload(CREATE_TRANSACTIONS, base_url, args.duration, args.concurrency, args.seed)
+        )
+        return {k: result[k] for k in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms", "errors")}
+
+    modes = {}
+    services = build_services(args.port_offset)
+    retail = [services[name] for name in ("account-service", "fraud-detection", "transaction-service")]
+    print(f"create_transaction over HTTP for {args.duration}s ...", file=sys.stderr)
+    procs = [start_service(s) for s in retail]
+    try:
+        for service in retail:
+            wait_healthy(service, path="/ready")
+        modes["http"] = measure(services["transaction-service"].url)
+    finally:
+        for proc in reversed(procs):
+            stop_service(proc)
+
+    monolith = build_monolith(args.port_offset)
+    print(f"create_transaction in process for {args.duration}s ...", file=sys.stderr)
+    proc = start_service(monolith)
+    try:
+        wait_healthy(monolith, path="/ready")
+        modes["in_process"] = measure(f"{monolith.url}/transaction-service")
+    finally:
+        stop_service(proc)
+
+    return {
+        "duration_s": args.duration,
+        "concurrency": args.concurrency,
+        "composition": modes,
+        "speedup": round(modes["in_process"]["throughput_rps"] / (modes["http"]["throughput_rps"] or 1.0), 2),
+    }
+
+
+@dataclass
+class InternalCall:
+    """A service-to-service endpoint that negotiates msgpack (app/wire.py)"""
+    service: str
+    path: str
+    body: Callable[[random.Random], "dict | list"]
+
+
+INTERNAL_CALLS: dict[str, InternalCall] = {
+    "fraud-detection:check": InternalCall(
+        "fraud-detection", "/api/v1/check",
+        lambda r: {"transaction_id": f"TXN-{r.randint(1, 999999):06d}", **_transaction_body(r)},
+    ),
+    # transaction-service's default FRAUD_CHECK_BATCH_SIZE
+    "fraud-detection:check_batch": InternalCall(
+        "fraud-detection", "/api/v1/check/batch",
+        lambda r: [{"transaction_id": f"TXN-{r.randint(1, 999999):06d}", **_transaction_body(r)}
+                   for _ in range(50)],
+    ),
+    "credit-scoring:score": InternalCall("credit-scoring", "/api/v1/score", _score_body),
+}
+
+# Encoders and decoders as each side uses them: httpx and FastAPI's
+# JSONResponse write compact JSON; app/wire.py uses msgpack's defaults
+WIRE_FORMATS: dict[str, tuple[str, Callable[[object], bytes], Callable[[bytes], object]]] = {
+    "json": (
+        "application/json",
+        lambda o: json.dumps(o, separators=(",", ":")).encode(),
+        json.loads,
+    ),
+    "msgpack": ("application/msgpack", msgpack.packb, msgpack.unpackb),
+}
+
+
+def codec_cost(obj: object, encode: Callable[[object], bytes], decode: Callable[[bytes], object],
+               rounds: int = 2000) -> tuple[int, float, float]:
+    """Encoded size, and microseconds per encode and per decode"""
+    data = encode(obj)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        encode(obj)
+    encode_us = (time.perf_counter() - started) * 1e6 / rounds
+    started = time.perf_counter()
+    for _ in range(rounds):
+        decode(data)
+    decode_us = (time.perf_counter() - started) * 1e6 / rounds
+    return len(data), encode_us, decode_us
+
+
+async def time_wire_format(base_url: str, call: InternalCall, wire_format: str,
+                           requests: int, seed: int) -> tuple[float, object]:
+    """p50 ms of `requests` sequential calls in one format, and the last reply"""
+    media_type, encode, decode = WIRE_FORMATS[wire_format]
+    headers = {"content-type": media_type, "accept": media_type}
+    rng = random.Random(seed)
+    latencies = []
+    async with httpx.AsyncClient(base_url=base_url, timeout=30.0) as client:
+        for _ in range(requests):
+            body = call.body(rng)
+            started = time.perf_counter()
+            resp = await client.post(call.path, content=encode(body), headers=headers)
+            reply = decode(resp.content)
+            latencies.append((time.perf_counter() - started) * 1000)
+            resp.raise_for_status()
+    return percentile(sorted(latencies), 50), reply
+
+
+def run_wire_formats(args: argparse.Namespace) -> dict:
+    """Payload bytes, encode/decode CPU and latency per internal call, JSON vs msgpack"""
+    services = build_services(args.port_offset)
+    targets = [services[name] for name in dict.fromkeys(c.service for c in INTERNAL_CALLS.values())]
+    procs = [start_service(s) for s in targets]
+    calls: dict = {}
+    try:
+        for service in targets:
+            wait_healthy(service, path="/ready")
+        for name, call in INTERNAL_CALLS.items():
+            print(f"comparing wire formats for {name} ...", file=sys.stderr)
+            request = call.body(random.Random(args.seed))
+            url = services[call.service].url
+            # Unmeasured warm-up of the server's negotiated path
+            for wire_format in WIRE_FORMATS:
+                asyncio.run(time_wire_format(url, call, wire_format, 20, args.seed))
+            formats = {}
+            for wire_format, (_, encode, decode) in WIRE_FORMATS.items():
+                p50, response = asyncio.run(time_wire_format(url, call, wire_format, args.wire_requests, args.seed))
+                request_bytes, request_encode, request_decode = codec_cost(request, encode, decode)
+                response_bytes, response_encode, response_decode = codec_cost(response, encode, decode)
+                formats[wire_format] = {
+                    "request_bytes": request_bytes,
+                    "response_bytes": response_bytes,
+                    # Both sides of one call: encode and decode of request and response
+                    "codec_us_per_call": round(request_encode + request_decode + response_encode + response_decode, 1),
+                    "p50_ms": round(p50, 3),
+                }
+            json_point, msgpack_point = formats["json"], formats["msgpack"]
+            formats["bytes_vs_json"] = round(
+                (msgpack_point["request_bytes"] + msgpack_point["response_bytes"])
+                / (json_point["request_bytes"] + json_point["response_bytes"]), 2,
+            )
+            formats["codec_cpu_vs_json"] = round(msgpack_point["codec_us_per_call"] / json_point["codec_us_per_call"], 2)
+            calls[name] = formats
+    finally:
+        for proc in reversed(procs):
+            stop_service(proc)
+    return {"requests": args.wire_requests, "wire_formats": calls}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return regressions beyond `threshold` (fractional) against the baseline"""
+    regressions = []
+    for name, current in results["workloads"].items():
+        base = baseline.get("workloads", {}).get(name)
+        if not base:
+            continue
+        if current["p95_ms"] > base["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {current['p95_ms']}ms vs baseline {base['p95_ms']}ms")
+        if current["throughput_rps"] < base["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {current['throughput_rps']} rps "
+                f"vs baseline {base['throughput_rps']} rps"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workload", action="append", choices=sorted(WORKLOADS),
+                        help="workload to run (repeatable; default: all)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per workload")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients per workload")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured warm-up seconds per workload")
+    parser.add_argument("--port-offset", type=int, default=10000,
+                        help="added to each service's default port to avoid clashes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="write JSON results to this file")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="allowed fractional regression vs baseline (default: 0.2)")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help=f"overwrite {BASELINE_PATH.name} with these results")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes for services that support multi-worker mode")
+    parser.add_argument("--scaling", type=lambda v: [int(n) for n in v.split(",")],
+                        help="comma-separated worker counts, e.g. 1,2,4; reports speedup per workload")
+    parser.add_argument("--bulk", action="store_true",
+                        help="compare bulk endpoints with the same items sent one request each")
+    parser.add_argument("--bulk-items", type=int, default=2000, help="items per bulk comparison")
+    parser.add_argument("--batch-size", type=int, default=500, help="items per bulk request")
+    parser.add_argument("--watchlist-sizes", type=lambda v: [int(n) for n in v.split(",")],
+                        help="comma-separated entries per fraud-detection watchlist, e.g. 0,1000,100000; "
+                             "reports check latency and per-check cost at each size")
+    parser.add_argument("--composition", action="store_true",
+                        help="compare create_transaction throughput with the retail services over HTTP "
+                             "and in one process (apps/retail-banking/monolith)")
+    parser.add_argument("--wire-formats", action="store_true",
+                        help="compare JSON and msgpack on the internal endpoints: payload bytes, "
+                             "encode/decode CPU per call and p50 latency")
+    parser.add_argument("--wire-requests", type=int, default=500, help="calls per format per endpoint")
+    args = parser.parse_args()
+
+    selected = args.workload or list(WORKLOADS)
+    if args.scaling or args.bulk or args.watchlist_sizes or args.composition or args.wire_formats:
+        if args.scaling:
+            report = run_scaling(args, selected)
+        elif args.bulk:
+            report = run_bulk(args)
+        elif args.composition:
+            report = run_composition(args)
+        elif args.wire_formats:
+            report = run_wire_formats(args)
+        else:
+            report = run_watchlist_scaling(args)
+        output = json.dumps(report, indent=2)
+        print(output)
+        if args.output:
+            args.output.write_text(output + "\n")
+        return 0
+
+    results: dict = {
+        "duration_s": args.duration,
+        "concurrency": args.concurrency,
+        "workers": args.workers,
+        "workloads": run_suite(args, selected, args.workers),
+    }
+
+    failed_gates = [
+        f"{name}: {gate}"
+        for name, result in results["workloads"].items()
+        for gate, passed in result["gates"].items()
+        if not passed
+    ]
+    regressions = []
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.threshold)
+    results["failed_gates"] = failed_gates
+    results["regressions"] = regressions
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        args.output.write_text(output + "\n")
+    if args.update_baseline:
+        BASELINE_PATH.write_text(output + "\n")
+
+    return 1 if failed_gates or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -47,7 +47,7 @@ build_and_push() {
 
 # Corporate Banking Services
 echo -e "${YELLOW}🏢 Building Corporate Banking Services...${NC}"
-build_and_push "corp-banking-api" "./apps/corporate-banking/corp-banking-api/Dockerfile" "./apps/corporate-banking/corp-banking-api"
+build_and_push "corp-banking-api" "./apps/corporate-banking/corp-banking-api/Dockerfile" "./apps"
 build_and_push "treasury-service" "./apps/corporate-banking/treasury-service/Dockerfile" "./apps/corporate-banking/treasury-service"
 build_and_push "compliance-service" "./apps/corporate-banking/compliance-service/Dockerfile" "./apps/corporate-banking/compliance-service"
 build_and_push "corp-banking-ui" "./apps/corporate-banking/corp-banking-ui/Dockerfile" "./apps/corporate-banking/corp-banking-ui"
@@ -55,16 +55,16 @@ build_and_push "corp-banking-ui" "./apps/corporate-banking/corp-banking-ui/Docke
 # Loans Services
 echo -e "${YELLOW}💰 Building Loans Services...${NC}"
 build_and_push "document-processing" "./apps/loans/document-processing/Dockerfile" "./apps/loans/document-processing"
-build_and_push "credit-scoring" "./apps/loans/credit-scoring/Dockerfile" "./apps/loans/credit-scoring"
-build_and_push "loans-api" "./apps/loans/loans-api/Dockerfile" "./apps/loans/loans-api"
+build_and_push "credit-scoring" "./apps/loans/credit-scoring/Dockerfile" "./apps"
+build_and_push "loans-api" "./apps/loans/loans-api/Dockerfile" "./apps"
 build_and_push "loans-ui" "./apps/loans/loans-ui/Dockerfile" "./apps/loans/loans-ui"
 
 # Retail Banking Services
 echo -e "${YELLOW}🏪 Building Retail Banking Services...${NC}"
 build_and_push "retail-banking-api" "./apps/retail-banking/retail-banking-api/Dockerfile" "./apps/retail-banking/retail-banking-api"
-build_and_push "account-service" "./apps/retail-banking/account-service/Dockerfile" "./apps/retail-banking/account-service"
-build_and_push "transaction-service" "./apps/retail-banking/transaction-service/Dockerfile" "./apps/retail-banking/transaction-service"
-build_and_push "fraud-detection" "./apps/retail-banking/fraud-detection/Dockerfile" "./apps/retail-banking/fraud-detection"
+build_and_push "account-service" "./apps/retail-banking/account-service/Dockerfile" "./apps"
+build_and_push "transaction-service" "./apps/retail-banking/transaction-service/Dockerfile" "./apps"
+build_and_push "fraud-detection" "./apps/retail-banking/fraud-detection/Dockerfile" "./apps"
 build_and_push "retail-logging-service" "./apps/retail-banking/logging-service/Dockerfile" "./apps/retail-banking/logging-service"
 build_and_push "retail-banking-ui" "./apps/retail-banking/retail-banking-ui/Dockerfile" "./apps/retail-banking/retail-banking-ui"
 